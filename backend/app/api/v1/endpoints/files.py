@@ -1,11 +1,13 @@
 """File API endpoints."""
+import asyncio
 import os
 from pathlib import Path
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query
 from fastapi.responses import FileResponse
 from typing import List
-from app.schemas.file import UploadResponse, ErrorResponse
+from app.schemas.file import UploadResponse, ErrorResponse, SearchResponse
 from app.services.file_service import file_service
+from app.services.search_service import search_service
 from app.core.config import settings
 
 router = APIRouter()
@@ -51,6 +53,10 @@ async def upload_files(
             detail=f'Total size exceeds limit'
         )
 
+    # Index page text in the background so the upload can be searched
+    if settings.SEARCH_INDEX_ENABLED:
+        search_service.schedule_index(upload_id, file_service.get_uploaded_files(upload_id))
+
     return UploadResponse(
         success=True,
         data={
@@ -62,6 +68,48 @@ async def upload_files(
     )
 
 
+@router.get('/{upload_id}/search', response_model=SearchResponse)
+async def search_upload(
+    upload_id: str,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(50, ge=1, le=500)
+):
+    """Find pages of an upload's files that contain the query terms.
+
+    Args:
+        upload_id: Upload identifier
+        q: Search terms (all must match, case-insensitive substrings)
+        limit: Maximum number of results
+
+    Returns:
+        Matching pages with snippets, most relevant first
+
+    Raises:
+        HTTPException: Invalid query or upload not found
+    """
+    try:
+        if search_service.get_status(upload_id) == "building":
+            await search_service.wait_for_index(upload_id)
+        try:
+            files = file_service.get_uploaded_files(upload_id)
+        except ValueError:
+            # The upload expired or was deleted: its index goes with it
+            search_service.delete_index(upload_id)
+            raise HTTPException(status_code=404, detail='Upload not found or expired')
+        if search_service.get_status(upload_id) != "ready":
+            # Indexing disabled or failed at upload time: build it now
+            await asyncio.to_thread(search_service.build_index, upload_id, files)
+
+        result = search_service.search(upload_id, q, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if result is None:
+        raise HTTPException(status_code=404, detail='Upload not found or expired')
+
+    return SearchResponse(data=result)
+
+
 @router.get('/download/{file_id}')
 async def download_file(file_id: str):
     """Download processed file.
@@ -116,6 +164,8 @@ async def download_file(file_id: str):
                 media_type = 'text/plain'
             elif file.suffix == '.json':
                 media_type = 'application/json'
+            elif file.suffix == '.ndjson':
+                media_type = 'application/x-ndjson'
 
             print(f"[DEBUG] Returning file: {file}, type: {media_type}")
             return FileResponse(
@@ -1,6 +1,13 @@
 from fastapi import APIRouter, HTTPException
-from app.schemas.tool import ToolResponse, ToolDetailResponse
+from app.schemas.tool import (
+    ToolResponse, ToolDetailResponse,
+    WatermarkPreviewRequest, WatermarkPreviewResponse,
+    WatermarkTemplateListResponse
+)
 from app.models.tools import TOOLS_DB
+from app.services.file_service import file_service
+from app.services.job_service import job_service
+from app.services.template_service import template_service
 from typing import Any
 
 router = APIRouter()
@@ -19,3 +26,47 @@ async def get_tool(tool_id: str):
     if not tool:
         raise HTTPException(status_code=404, detail='Tool not found')
     return ToolDetailResponse(data=tool)
+
+
+@router.post('/remove_watermark_image/preview', response_model=WatermarkPreviewResponse)
+def preview_remove_watermark_image(request: WatermarkPreviewRequest):
+    """Preview watermark removal on a single page at low DPI.
+
+    Runs synchronously (in the threadpool) and returns the cleaned page
+    plus the mask overlay, so parameters can be tuned without a full job.
+    """
+    from app.processors.remove_watermark_image import RemoveWatermarkImageProcessor
+
+    try:
+        file_path = file_service.get_uploaded_files(request.upload_id)[0]
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    processor = RemoveWatermarkImageProcessor(job_service)
+    try:
+        data = processor.preview(file_path, request.options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        processor.close_session()
+
+    return WatermarkPreviewResponse(data=data)
+
+
+@router.get('/remove_watermark/templates', response_model=WatermarkTemplateListResponse)
+async def list_watermark_templates():
+    """List saved watermark templates for remove_watermark."""
+    return WatermarkTemplateListResponse(data=template_service.list_templates())
+
+
+@router.delete('/remove_watermark/templates/{name}')
+async def delete_watermark_template(name: str):
+    """Delete a saved watermark template."""
+    try:
+        deleted = template_service.delete_template(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not deleted:
+        raise HTTPException(status_code=404, detail='Template not found')
+
+    return {'success': True, 'message': 'Template deleted'}
@@ -20,11 +20,18 @@ class Settings(BaseSettings):
     STORAGE_DIR: str = 'storage'
     UPLOAD_DIR: str = 'storage/uploads'
     RESULT_DIR: str = 'storage/results'
+    TEMPLATE_DIR: str = 'storage/templates'
+    TEXT_CACHE_DIR: str = 'storage/cache/text'
+    TEXT_CACHE_MAX_MB: int = 512
+    SEARCH_INDEX_DIR: str = 'storage/search'
+    SEARCH_INDEX_ENABLED: bool = True  # build a search index after each upload
     FILE_EXPIRE_HOURS: int = 2
 
     # Processing settings
     MAX_WORKERS: int = 4
     TASK_TIMEOUT: int = 300  # 5 minutes
+    DEFAULT_SAVE_PROFILE: str = 'balanced'  # fast | balanced | smallest
+    MERGE_MEMORY_BUDGET_MB: int = 256  # merge larger inputs in batches
 
     @property
     def CORS_ORIGINS(self) -> list[str]:
@@ -1,3 +1,74 @@
+# Output options shared by every tool that writes PDF files
+SAVE_PROFILE_OPTION = {
+    "name": "save_profile",
+    "type": "select",
+    "label": "Output Optimization",
+    "description": "Trade processing time for output size (server default: balanced)",
+    "options": [
+        {"value": "fast", "label": "Fast (no compression)"},
+        {"value": "balanced", "label": "Balanced"},
+        {"value": "smallest", "label": "Smallest File"},
+    ],
+    "required": False,
+}
+
+# Watermark removers only: incremental output keeps the original revision,
+# including the removed watermark, so it is never chosen automatically
+SAVE_MODE_OPTION = {
+    "name": "save_mode",
+    "type": "select",
+    "label": "Save Mode",
+    "description": (
+        "Incremental appends only the changes, but the file keeps the previous "
+        "revision, watermark included; auto always rewrites"
+    ),
+    "options": [
+        {"value": "auto", "label": "Auto (Rewrite)"},
+        {"value": "rewrite", "label": "Rewrite"},
+        {"value": "incremental", "label": "Incremental (keeps prior revision)"},
+    ],
+    "default": "auto",
+}
+
+PAGE_MODE_OPTIONS = [
+    {
+        "name": "mode",
+        "type": "select",
+        "label": "Page Selection",
+        "options": [
+            {"value": "all", "label": "All Pages"},
+            {"value": "range", "label": "Page Range"},
+            {"value": "every", "label": "Every N Pages"},
+            {"value": "single", "label": "Single Page"},
+        ],
+        "default": "all",
+    },
+    {
+        "name": "ranges",
+        "type": "string",
+        "label": "Page Ranges",
+        "placeholder": "1-3, 5, 9-",
+        "depends_on": {"mode": "range"},
+        "required_when": {"mode": "range"},
+    },
+    {
+        "name": "every_n",
+        "type": "number",
+        "label": "Every N Pages",
+        "min": 1,
+        "default": 2,
+        "depends_on": {"mode": "every"},
+    },
+    {
+        "name": "page",
+        "type": "number",
+        "label": "Page",
+        "min": 1,
+        "default": 1,
+        "depends_on": {"mode": "single"},
+    },
+]
+
 TOOLS_DB = [
     {
         "id": "merge",
@@ -16,7 +87,8 @@ TOOLS_DB = [
                 "label": "Output Filename",
                 "default": "merged.pdf",
                 "required": False,
-            }
+            },
+            SAVE_PROFILE_OPTION,
         ],
     },
     {
@@ -61,6 +133,7 @@ TOOLS_DB = [
                 "depends_on": {"mode": "every"},
                 "required_when": {"mode": "every"},
             },
+            SAVE_PROFILE_OPTION,
         ],
     },
     {
@@ -81,7 +154,8 @@ TOOLS_DB = [
                 "description": "e.g., 1,3,5-7,9",
                 "placeholder": "1,3,5-7,9",
                 "required": True,
-            }
+            },
+            SAVE_PROFILE_OPTION,
         ],
     },
     {
@@ -102,9 +176,46 @@ TOOLS_DB = [
                 "options": [
                     {"value": "txt", "label": "Plain Text (.txt)"},
                     {"value": "json", "label": "JSON (.json)"},
+                    {"value": "ndjson", "label": "JSON Lines, one page per line (.ndjson)"},
                 ],
                 "default": "txt",
-            }
+            },
+            {
+                "name": "detail",
+                "type": "select",
+                "label": "Detail",
+                "description": "JSON outputs only; blocks and words include bounding boxes",
+                "options": [
+                    {"value": "text", "label": "Plain Text"},
+                    {"value": "blocks", "label": "Text Blocks"},
+                    {"value": "words", "label": "Words"},
+                ],
+                "default": "text",
+            },
+        ],
+    },
+    {
+        "id": "extract_images",
+        "name": "Extract Images",
+        "description": "Extract all images from PDF files",
+        "icon": "image",
+        "route": "/tools/extract-images",
+        "category": "Extract Tools",
+        "max_files": 1,
+        "max_size_mb": 100,
+        "max_total_size_mb": 100,
+        "options": [
+            {
+                "name": "format",
+                "type": "select",
+                "label": "Output Format",
+                "options": [
+                    {"value": "original", "label": "Keep Original"},
+                    {"value": "png", "label": "Convert to PNG"},
+                    {"value": "jpg", "label": "Convert to JPG"},
+                ],
+                "default": "original",
+            },
         ],
     },
     {
@@ -135,6 +246,37 @@ TOOLS_DB = [
                 "placeholder": "Enter watermark text",
                 "required": False,
             },
+            {
+                "name": "font",
+                "type": "select",
+                "label": "Font",
+                "description": "Defaults to helv, or china-s when the text has CJK characters",
+                "options": [
+                    {"value": "helv", "label": "Helvetica"},
+                    {"value": "tiro", "label": "Times"},
+                    {"value": "cour", "label": "Courier"},
+                    {"value": "china-s", "label": "Chinese (Simplified)"},
+                    {"value": "china-t", "label": "Chinese (Traditional)"},
+                    {"value": "japan", "label": "Japanese"},
+                    {"value": "korea", "label": "Korean"},
+                ],
+                "required": False,
+            },
+            {
+                "name": "font_size",
+                "type": "number",
+                "label": "Font Size",
+                "min": 6,
+                "max": 200,
+                "default": 48,
+            },
+            {
+                "name": "color",
+                "type": "string",
+                "label": "Color",
+                "placeholder": "#808080",
+                "default": "#808080",
+            },
             {
                 "name": "opacity",
                 "type": "number",
@@ -152,6 +294,72 @@ TOOLS_DB = [
                 "max": 360,
                 "default": 45,
             },
+            SAVE_PROFILE_OPTION,
+        ],
+    },
+    {
+        "id": "remove_watermark",
+        "name": "Remove Watermark",
+        "description": "Try to remove watermarks from PDF (not 100% successful)",
+        "icon": "eraser",
+        "route": "/tools/remove-watermark",
+        "category": "Watermark Tools",
+        "max_files": 1,
+        "max_size_mb": 50,
+        "max_total_size_mb": 50,
+        "options": [
+            *PAGE_MODE_OPTIONS,
+            {
+                "name": "removal_method",
+                "type": "select",
+                "label": "Removal Method",
+                "description": (
+                    "Content edits watermark markup in the content stream; redact "
+                    "deletes detected regions; auto redacts only when no structural "
+                    "watermark is found or a template is used"
+                ),
+                "options": [
+                    {"value": "auto", "label": "Auto"},
+                    {"value": "content", "label": "Content Stream Only"},
+                    {"value": "redact", "label": "Redaction"},
+                ],
+                "default": "auto",
+            },
+            SAVE_MODE_OPTION,
+            SAVE_PROFILE_OPTION,
+        ],
+    },
+    {
+        "id": "remove_watermark_image",
+        "name": "Remove Watermark (Image)",
+        "description": "Remove watermarks by rendering pages and cleaning the watermark colour",
+        "icon": "eraser",
+        "route": "/tools/remove-watermark-image",
+        "category": "Watermark Tools",
+        "max_files": 1,
+        "max_size_mb": 50,
+        "max_total_size_mb": 50,
+        "options": [
+            *PAGE_MODE_OPTIONS,
+            {
+                "name": "dpi",
+                "type": "number",
+                "label": "Render DPI",
+                "min": 72,
+                "max": 300,
+                "default": 200,
+            },
+            {
+                "name": "tolerance",
+                "type": "number",
+                "label": "Colour Tolerance",
+                "description": "Estimated from the pages when watermark_color is not given",
+                "min": 0,
+                "max": 255,
+                "required": False,
+            },
+            SAVE_MODE_OPTION,
+            SAVE_PROFILE_OPTION,
         ],
     },
     {
@@ -287,6 +495,7 @@ TOOLS_DB = [
                 "default": True,
                 "depends_on": {"operation": "encrypt"},
             },
+            SAVE_PROFILE_OPTION,
         ],
     },
 ]
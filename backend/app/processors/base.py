@@ -1,14 +1,66 @@
 """Base processor for PDF operations."""
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from datetime import datetime
+import os
+import shutil
 import fitz
 
 
+class DocumentSession:
+    """Per-job cache of opened input documents.
+
+    Each input file is parsed once per job; every stage that needs it
+    gets the same handle. Handles are owned by the session and closed
+    by close(), never by the caller. Worker processes open their own
+    handles (see app.processors.parallel).
+    """
+
+    def __init__(self):
+        self._docs: Dict[Path, fitz.Document] = {}
+
+    def open(self, file_path: Path) -> fitz.Document:
+        """Get the shared handle for a file, opening it on first use.
+
+        Raises:
+            ValueError: File cannot be opened as a PDF
+        """
+        key = Path(file_path).resolve()
+        doc = self._docs.get(key)
+        if doc is None or doc.is_closed:
+            try:
+                doc = fitz.open(file_path)
+            except Exception as e:
+                raise ValueError(f"Invalid PDF file: {e}")
+            self._docs[key] = doc
+        return doc
+
+    def close(self) -> None:
+        """Close all documents opened by the session."""
+        for doc in self._docs.values():
+            if not doc.is_closed:
+                doc.close()
+        self._docs.clear()
+
+
 class BaseProcessor(ABC):
     """Base class for PDF processors."""
 
+    # doc.save() options per output profile, from fastest to smallest
+    SAVE_PROFILES: Dict[str, Dict[str, Any]] = {
+        "fast": {},
+        "balanced": {"garbage": 1, "deflate": True},
+        "smallest": {
+            "garbage": 4,
+            "deflate": True,
+            "deflate_images": True,
+            "deflate_fonts": True,
+            "clean": True,
+            "use_objstms": 1,
+        },
+    }
+
     def __init__(self, job_service):
         """Initialize processor with job service.
 
@@ -16,6 +68,7 @@ class BaseProcessor(ABC):
             job_service: Job service instance for status updates
         """
         self.job_service = job_service
+        self.session = DocumentSession()
 
     @abstractmethod
     async def process(
@@ -61,6 +114,37 @@ class BaseProcessor(ABC):
         except Exception as e:
             raise ValueError(f"Invalid PDF file: {e}")
 
+    def open_document(self, file_path: Path, password: Optional[str] = None) -> fitz.Document:
+        """Open, validate and authenticate an input once per job.
+
+        The returned document is shared by all stages of the job and must
+        not be closed by the caller (see close_session).
+
+        Args:
+            file_path: Path to PDF file
+            password: Password for encrypted files
+
+        Returns:
+            PyMuPDF document
+
+        Raises:
+            ValueError: Invalid, encrypted (without password) or empty PDF,
+                or incorrect password
+        """
+        doc = self.session.open(file_path)
+        if doc.is_encrypted:
+            if password is None:
+                raise ValueError("PDF file is encrypted and not supported")
+            if not doc.authenticate(password):
+                raise ValueError("Incorrect password")
+        if len(doc) == 0:
+            raise ValueError("PDF file has no pages")
+        return doc
+
+    def close_session(self) -> None:
+        """Close all input documents opened during the job."""
+        self.session.close()
+
     def get_page_count(self, file_path: Path) -> int:
         """Get PDF page count.
 
@@ -70,10 +154,7 @@ class BaseProcessor(ABC):
         Returns:
             Number of pages
         """
-        doc = fitz.open(file_path)
-        count = len(doc)
-        doc.close()
-        return count
+        return len(self.session.open(file_path))
 
     def get_output_path(self, job_id: str, filename: str) -> Path:
         """Get output file path.
@@ -90,6 +171,117 @@ class BaseProcessor(ABC):
         output_dir.mkdir(parents=True, exist_ok=True)
         return output_dir / f"{job_id}_{filename}"
 
+    def get_save_options(self, options: Dict[str, Any], **overrides: Any) -> Dict[str, Any]:
+        """Get doc.save() options for the requested save profile.
+
+        Args:
+            options: Processing options ("save_profile": "fast" | "balanced" | "smallest",
+                     defaults to settings.DEFAULT_SAVE_PROFILE)
+            **overrides: Extra doc.save() options (e.g. encryption)
+
+        Returns:
+            Keyword arguments for doc.save()
+
+        Raises:
+            ValueError: Unknown save profile
+        """
+        from app.core.config import settings
+        profile = options.get("save_profile") or settings.DEFAULT_SAVE_PROFILE
+        if profile not in self.SAVE_PROFILES:
+            raise ValueError(f"Invalid save_profile: {profile}")
+        save_options = {**self.SAVE_PROFILES[profile], **overrides}
+        if save_options.get("encryption", fitz.PDF_ENCRYPT_KEEP) not in (
+            fitz.PDF_ENCRYPT_KEEP, fitz.PDF_ENCRYPT_NONE
+        ):
+            # MuPDF writes unreadable object streams when encrypting
+            save_options.pop("use_objstms", None)
+        return save_options
+
+    def resolve_save_mode(self, options: Dict[str, Any]) -> str:
+        """Decide between an incremental save and a full rewrite.
+
+        "auto" (the default) and "rewrite" rewrite the file. "incremental"
+        keeps the previous revision of every changed object in the output
+        file, readable by truncating at its first %%EOF, so it is only used
+        when requested explicitly.
+
+        Args:
+            options: Processing options ("save_mode": "auto" | "incremental" | "rewrite")
+
+        Returns:
+            "incremental" or "rewrite"
+
+        Raises:
+            ValueError: Unknown save mode
+        """
+        save_mode = options.get("save_mode", "auto")
+        if save_mode not in ("auto", "incremental", "rewrite"):
+            raise ValueError(f"Invalid save_mode: {save_mode}")
+        return "incremental" if save_mode == "incremental" else "rewrite"
+
+    def open_output_document(self, file_path: Path, output_path: Path) -> fitz.Document:
+        """Copy the input to the output path and open the copy for modification.
+
+        PyMuPDF can only save incrementally into the file a document was
+        opened from, so incremental output starts from a byte copy. Like
+        the inputs, the copy is owned by the session (see close_session).
+
+        Args:
+            file_path: Input PDF path
+            output_path: Output PDF path
+
+        Returns:
+            PyMuPDF document opened from output_path
+        """
+        shutil.copyfile(file_path, output_path)
+        return self.open_document(output_path)
+
+    def save_document(
+        self,
+        doc: fitz.Document,
+        output_path: Path,
+        save_mode: str = "rewrite",
+        **save_options: Any
+    ) -> str:
+        """Save a document, incrementally when possible.
+
+        Incremental saves append only the changed objects to the file the
+        document was opened from (see open_output_document). Documents that
+        were repaired on open are rewritten instead.
+
+        The previous revision stays in the file, including anything the
+        changes removed (MuPDF's can_save_incrementally() turns false after
+        apply_redactions() for that reason). Callers must only pass
+        "incremental" when exposing the input is acceptable; see
+        resolve_save_mode.
+
+        Args:
+            doc: PyMuPDF document
+            output_path: Output PDF path
+            save_mode: "incremental" or "rewrite"
+            **save_options: Options for doc.save() when rewriting
+
+        Returns:
+            The save mode actually used
+        """
+        opened_from_output = Path(doc.name or "").resolve() == Path(output_path).resolve()
+
+        if save_mode == "incremental" and opened_from_output and not doc.is_repaired:
+            try:
+                doc.saveIncr()
+                return "incremental"
+            except Exception:
+                pass
+
+        if opened_from_output:
+            # The source file is still open: write a temp file and swap it in
+            tmp_path = Path(f"{output_path}.tmp")
+            doc.save(tmp_path, **save_options)
+            os.replace(tmp_path, output_path)
+        else:
+            doc.save(output_path, **save_options)
+        return "rewrite"
+
     def update_progress(
         self,
         job_id: str,
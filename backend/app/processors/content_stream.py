@@ -0,0 +1,214 @@
+"""Minimal PDF content stream tokenizer and operator filter.
+
+只做删除水印所需的最小解析：识别操作数/操作符边界、字符串、字典和内联图片，
+用于直接删除 marked-content 序列（如 /Artifact /Watermark）和 XObject 引用，
+而不需要重新渲染页面或使用 redaction。
+"""
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+
+
+WHITESPACE = b"\x00\t\n\x0c\r "
+DELIMITERS = b"()<>[]{}/%"
+
+# (tag, properties) -> 是否删除该 marked-content 序列
+MarkedContentPredicate = Callable[[bytes, Optional[bytes]], bool]
+
+
+def iter_tokens(data: bytes) -> Iterator[Tuple[int, int, bytes]]:
+    """Yield (start, end, token) for every token of a content stream.
+
+    Strings, dictionaries and arrays are returned as a single operand token,
+    inline image data (BI ... ID ... EI) is skipped as part of the EI token.
+    """
+    pos = 0
+    size = len(data)
+
+    while pos < size:
+        char = data[pos]
+
+        if char in WHITESPACE:
+            pos += 1
+            continue
+
+        if char == ord("%"):
+            end = data.find(b"\n", pos)
+            pos = size if end < 0 else end + 1
+            continue
+
+        start = pos
+        if char == ord("("):
+            pos = _skip_literal_string(data, pos)
+        elif data.startswith(b"<<", pos):
+            pos = _skip_dictionary(data, pos)
+        elif char == ord("<"):
+            end = data.find(b">", pos)
+            pos = size if end < 0 else end + 1
+        elif char == ord("["):
+            pos = _skip_array(data, pos)
+        elif char == ord("/"):
+            pos += 1
+            while pos < size and data[pos] not in WHITESPACE and data[pos] not in DELIMITERS:
+                pos += 1
+        elif char in DELIMITERS:
+            pos += 1
+        else:
+            while pos < size and data[pos] not in WHITESPACE and data[pos] not in DELIMITERS:
+                pos += 1
+
+        token = data[start:pos]
+        if token == b"ID":
+            # 内联图片数据：跳到 "EI" 操作符
+            pos = _skip_inline_image(data, pos)
+            yield start, pos, b"EI"
+            continue
+
+        yield start, pos, token
+
+
+def filter_content(
+    data: bytes,
+    drop_marked: Optional[MarkedContentPredicate] = None,
+    drop_xobjects: Optional[Set[bytes]] = None
+) -> Tuple[bytes, int]:
+    """Remove marked-content sequences and XObject invocations.
+
+    Args:
+        data: Decoded content stream
+        drop_marked: Predicate selecting BDC/BMC ... EMC sequences to delete
+        drop_xobjects: XObject resource names (without "/") whose Do is deleted
+
+    Returns:
+        (filtered stream, number of removed sequences/invocations);
+        the original stream is returned unchanged if nesting is unbalanced
+    """
+    drop_xobjects = drop_xobjects or set()
+    removals: List[Tuple[int, int]] = []
+    # 每个打开的 marked-content：(起始偏移, 是否删除)
+    open_sections: List[Tuple[int, bool]] = []
+    operands: List[Tuple[int, bytes]] = []
+
+    for start, end, token in iter_tokens(data):
+        if not _is_operator(token):
+            operands.append((start, token))
+            continue
+
+        section_start = operands[0][0] if operands else start
+
+        if token in (b"BDC", b"BMC"):
+            tag = operands[0][1] if operands else b""
+            props = operands[1][1] if token == b"BDC" and len(operands) > 1 else None
+            inside_dropped = any(drop for _, drop in open_sections)
+            drop = (
+                not inside_dropped and drop_marked is not None and drop_marked(tag, props)
+            )
+            open_sections.append((section_start, drop))
+        elif token == b"EMC":
+            if not open_sections:
+                return data, 0
+            section_begin, drop = open_sections.pop()
+            if drop:
+                removals.append((section_begin, end))
+        elif token == b"Do" and operands and not any(drop for _, drop in open_sections):
+            if operands[-1][1][1:] in drop_xobjects:
+                removals.append((section_start, end))
+
+        operands = []
+
+    if open_sections or not removals:
+        return data, 0
+
+    parts = []
+    last = 0
+    for start, end in removals:
+        parts.append(data[last:start])
+        parts.append(b"\n")
+        last = end
+    parts.append(data[last:])
+    return b"".join(parts), len(removals)
+
+
+def is_watermark_artifact(tag: bytes, props: Optional[bytes]) -> bool:
+    """Match `/Artifact <</Subtype /Watermark ...>> BDC` sequences."""
+    return tag == b"/Artifact" and props is not None and b"/Watermark" in props
+
+
+def _is_operator(token: bytes) -> bool:
+    """Operators are bare keywords; everything else is an operand."""
+    first = token[:1]
+    if not first or first in b"/([<" or token in (b"true", b"false", b"null"):
+        return False
+    return not (first.isdigit() or first in b"+-.")
+
+
+def _skip_literal_string(data: bytes, pos: int) -> int:
+    """Skip a (possibly nested) literal string starting at pos."""
+    depth = 0
+    size = len(data)
+    while pos < size:
+        char = data[pos]
+        if char == ord("\\"):
+            pos += 2
+            continue
+        if char == ord("("):
+            depth += 1
+        elif char == ord(")"):
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    return size
+
+
+def _skip_dictionary(data: bytes, pos: int) -> int:
+    """Skip a (possibly nested) dictionary starting at pos."""
+    depth = 0
+    size = len(data)
+    while pos < size:
+        if data.startswith(b"<<", pos):
+            depth += 1
+            pos += 2
+        elif data.startswith(b">>", pos):
+            depth -= 1
+            pos += 2
+            if depth == 0:
+                return pos
+        elif data[pos] == ord("("):
+            pos = _skip_literal_string(data, pos)
+        else:
+            pos += 1
+    return size
+
+
+def _skip_array(data: bytes, pos: int) -> int:
+    """Skip a (possibly nested) array starting at pos."""
+    depth = 0
+    size = len(data)
+    while pos < size:
+        char = data[pos]
+        if char == ord("("):
+            pos = _skip_literal_string(data, pos)
+            continue
+        if char == ord("["):
+            depth += 1
+        elif char == ord("]"):
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    return size
+
+
+def _skip_inline_image(data: bytes, pos: int) -> int:
+    """Skip inline image data after ID, returning the offset after EI."""
+    size = len(data)
+    search = pos + 1
+    while search < size:
+        found = data.find(b"EI", search)
+        if found < 0:
+            return size
+        before = data[found - 1] if found > 0 else 32
+        after = data[found + 2] if found + 2 < size else 32
+        if before in WHITESPACE and after in WHITESPACE:
+            return found + 2
+        search = found + 2
+    return size
@@ -98,17 +98,10 @@ class EncryptDecryptProcessor(BaseProcessor):
             )
 
         # Validate PDF (check if already encrypted)
-        try:
-            doc = fitz.open(file_path)
-            if doc.is_encrypted:
-                doc.close()
-                raise ValueError("PDF is already encrypted. Please decrypt it first.")
-            page_count = len(doc)
-            doc.close()
-        except Exception as e:
-            if "already encrypted" in str(e):
-                raise
-            raise ValueError(f"Invalid PDF file: {e}")
+        doc = self.session.open(file_path)
+        if doc.is_encrypted:
+            raise ValueError("PDF is already encrypted. Please decrypt it first.")
+        page_count = len(doc)
 
         # Generate output filename
         original_name = file_path.stem
@@ -117,18 +110,17 @@ class EncryptDecryptProcessor(BaseProcessor):
 
         self.update_progress(job_id, 30, "Encrypting PDF...")
 
-        # Reopen and encrypt
-        doc = fitz.open(file_path)
-
         # Save with encryption
         doc.save(
             output_path,
-            encryption=encryption_method,
-            owner_pw=password,
-            user_pw=password,
-            permissions=permissions,
+            **self.get_save_options(
+                options,
+                encryption=encryption_method,
+                owner_pw=password,
+                user_pw=password,
+                permissions=permissions,
+            ),
         )
-        doc.close()
 
         self.update_progress(job_id, 80, "Finalizing...")
 
@@ -168,26 +160,12 @@ class EncryptDecryptProcessor(BaseProcessor):
         if not password:
             raise ValueError("Password is required for decryption")
 
-        # Try to open with password
-        try:
-            doc = fitz.open(file_path)
-
-            if not doc.is_encrypted:
-                doc.close()
-                raise ValueError("PDF is not encrypted")
+        # Open once and authenticate
+        if not self.session.open(file_path).needs_pass:
+            raise ValueError("PDF is not encrypted")
 
-            # Try to authenticate
-            auth_result = doc.authenticate(password)
-            if not auth_result:
-                doc.close()
-                raise ValueError("Incorrect password")
-
-            page_count = len(doc)
-            doc.close()
-        except ValueError as e:
-            raise
-        except Exception as e:
-            raise ValueError(f"Failed to open PDF: {e}")
+        doc = self.open_document(file_path, password=password)
+        page_count = len(doc)
 
         # Generate output filename
         original_name = file_path.stem
@@ -199,13 +177,8 @@ class EncryptDecryptProcessor(BaseProcessor):
 
         self.update_progress(job_id, 30, "Decrypting PDF...")
 
-        # Reopen, decrypt and save without encryption
-        doc = fitz.open(file_path)
-        doc.authenticate(password)
-
         # Save without encryption
-        doc.save(output_path)
-        doc.close()
+        doc.save(output_path, **self.get_save_options(options))
 
         self.update_progress(job_id, 80, "Finalizing...")
 
@@ -1,12 +1,22 @@
 """PDF extract processors."""
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 from datetime import datetime, timedelta
+import json
+import zipfile
 import fitz
 from app.processors.base import BaseProcessor
+from app.processors.page_selection import PageSelection
+from app.processors.parallel import contiguous_blocks, map_blocks_ordered
 from app.processors.registry import registry
 from app.core.config import settings
 from app.services.job_service import job_service
+from app.services.text_cache_service import (
+    PAGE_TEXT_KIND,
+    pack_strings,
+    text_cache_service,
+    unpack_strings,
+)
 
 
 @registry.register("extract_pages")
@@ -38,31 +48,24 @@ class ExtractPagesProcessor(BaseProcessor):
 
         file_path = files[0]
         pages_str = options.get("pages", "")
-
-        # Parse page specification
-        page_indices = self._parse_pages(pages_str)
+        if not pages_str.strip():
+            raise ValueError("Page specification is required")
 
         # Validate PDF
-        doc = self.validate_pdf(file_path)
-        total_pages = len(doc)
+        doc = self.open_document(file_path)
 
-        # Validate page indices
-        for idx in page_indices:
-            if idx < 0 or idx >= total_pages:
-                raise ValueError(f"Page {idx + 1} does not exist (PDF has {total_pages} pages)")
-        doc.close()
+        # Parse page specification (pages outside the PDF are rejected)
+        selection = PageSelection.parse(pages_str, len(doc))
 
         # Update progress
-        self.update_progress(job_id, 50, f"Extracting {len(page_indices)} pages")
+        self.update_progress(job_id, 50, f"Extracting {len(selection)} pages")
 
-        # Create new document with selected pages
+        # Create new document with selected pages, one copy per contiguous run
         new_doc = fitz.open()
-        with fitz.open(file_path) as original:
-            for idx in page_indices:
-                new_doc.insert_pdf(original, from_page=idx, to_page=idx)
+        selection.insert_into(new_doc, doc)
 
         output_path = self.get_output_path(job_id, "extracted_pages.pdf")
-        new_doc.save(output_path)
+        new_doc.save(output_path, **self.get_save_options(options))
         new_doc.close()
 
         # Complete job
@@ -71,49 +74,61 @@ class ExtractPagesProcessor(BaseProcessor):
             "output_file_id": job_id,
             "filename": "extracted_pages.pdf",
             "size": file_size,
-            "pages": len(page_indices),
+            "pages": len(selection),
             "download_url": f"/api/v1/files/download/{job_id}",
             "expires_at": (datetime.now() + timedelta(hours=settings.FILE_EXPIRE_HOURS)).isoformat()
         })
 
         return job_id
 
-    def _parse_pages(self, pages_str: str) -> list[int]:
-        """Parse page specification string.
 
-        Args:
-            pages_str: Page spec like "1,3,5-7"
+def _page_text_record(page: fitz.Page, detail: str) -> Any:
+    """Extract one page's text at the requested level of detail.
+
+    Returns:
+        Plain text for "text"; for "blocks" and "words" a list of dicts
+        with a rounded bbox, the text and its position in the reading order
+    """
+    if detail == "blocks":
+        return [
+            {"bbox": [round(v, 2) for v in block[:4]], "text": block[4], "block": block[5]}
+            for block in page.get_text("blocks")
+            if block[6] == 0  # text blocks only
+        ]
+    if detail == "words":
+        return [
+            {
+                "bbox": [round(v, 2) for v in word[:4]],
+                "text": word[4],
+                "block": word[5],
+                "line": word[6],
+            }
+            for word in page.get_text("words")
+        ]
+    return page.get_text()
+
+
+def _extract_text_block(pages: List[int], source_path: str, detail: str) -> List[Any]:
+    """Open the source by path and extract a contiguous block of pages."""
+    with fitz.open(source_path) as source:
+        return [_page_text_record(source[i], detail) for i in pages]
 
-        Returns:
-            List of zero-based page indices
 
-        Raises:
-            ValueError: Invalid page specification
-        """
-        if not pages_str:
-            raise ValueError("Page specification is required")
+@registry.register("extract_text")
+class ExtractTextProcessor(BaseProcessor):
+    """Processor for extracting text from PDF."""
 
-        indices = []
-        parts = pages_str.split(',')
+    # Output formats (also the output file extension)
+    FORMATS = ("txt", "json", "ndjson")
 
-        for part in parts:
-            part = part.strip()
-            if '-' in part:
-                # Range like "5-7"
-                start, end = part.split('-')
-                start = int(start.strip())
-                end = int(end.strip())
-                indices.extend(range(start - 1, end))
-            else:
-                # Single page
-                indices.append(int(part) - 1)
+    # Levels of detail; "txt" output always uses plain text
+    DETAILS = ("text", "blocks", "words")
 
-        return sorted(set(indices))
+    # Minimum number of pages before extracting in worker processes
+    PARALLEL_MIN_PAGES = 32
 
-
-@registry.register("extract_text")
-class ExtractTextProcessor(BaseProcessor):
-    """Processor for extracting text from PDF."""
+    # Blocks per worker, so output can be written while later pages run
+    BLOCKS_PER_WORKER = 4
 
     async def process(
         self,
@@ -123,10 +138,16 @@ class ExtractTextProcessor(BaseProcessor):
     ) -> str:
         """Extract text content.
 
+        Pages are extracted in contiguous blocks across worker processes and
+        written to disk in page order as blocks finish. Plain text is
+        stored in the persistent text cache on first extraction, so later
+        jobs on the same document content skip parsing.
+
         Args:
             job_id: Job identifier
             files: List with single PDF file path
-            options: Processing options (format: "txt" or "json")
+            options: Processing options (format: "txt", "json" or "ndjson";
+                detail: "text", "blocks" or "words")
 
         Returns:
             Output file ID
@@ -140,44 +161,65 @@ class ExtractTextProcessor(BaseProcessor):
 
         file_path = files[0]
         output_format = options.get("format", "txt")
+        detail = options.get("detail", "text")
+        if output_format not in self.FORMATS:
+            raise ValueError(f"Invalid format: {output_format}")
+        if detail not in self.DETAILS:
+            raise ValueError(f"Invalid detail: {detail}")
+        if output_format == "txt":
+            detail = "text"
 
         # Validate PDF
-        doc = self.validate_pdf(file_path)
+        doc = self.open_document(file_path)
         total_pages = len(doc)
 
-        # Extract text
-        all_text = []
-        for i in range(total_pages):
-            # Update progress
-            progress = int((i / total_pages) * 100)
-            self.update_progress(
-                job_id,
-                progress,
-                f"Extracting text from page {i + 1}"
+        # Plain text of the same document content is parsed only once
+        cache_key = text_cache_service.document_key(file_path) if detail == "text" else None
+        cached = text_cache_service.load(cache_key, PAGE_TEXT_KIND) if cache_key else None
+        if cached is not None and len(cached["offsets"]) != total_pages + 1:
+            cached = None
+        page_texts: List[str] = []
+
+        # Small documents are not worth the process startup cost
+        workers = settings.MAX_WORKERS if total_pages >= self.PARALLEL_MIN_PAGES else 1
+        blocks = contiguous_blocks(list(range(total_pages)), workers * self.BLOCKS_PER_WORKER)
+        if cached is not None:
+            texts = unpack_strings(cached["text"], cached["offsets"])
+            block_results = ([texts[i] for i in block] for block in blocks)
+        elif workers > 1:
+            block_results = map_blocks_ordered(
+                _extract_text_block, blocks, workers, str(file_path), detail
             )
-
-            page = doc[i]
-            text = page.get_text()
-            all_text.append(text)
-
-        doc.close()
-
-        # Determine output file
-        if output_format == "json":
-            import json
-            content = json.dumps({
-                "pages": len(all_text),
-                "text": all_text
-            }, ensure_ascii=False, indent=2)
-            output_filename = "extracted_text.json"
         else:
-            content = "\n\n".join(all_text)
-            output_filename = "extracted_text.txt"
+            block_results = (
+                [_page_text_record(doc[i], detail) for i in block] for block in blocks
+            )
 
-        # Save to file
+        output_filename = f"extracted_text.{output_format}"
         output_path = self.get_output_path(job_id, output_filename)
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+            if output_format == "json":
+                f.write(f'{{"pages": {total_pages}, "{detail}": [')
+
+            done = 0
+            for records in block_results:
+                for record in records:
+                    f.write(self._format_record(output_format, detail, done, record))
+                    done += 1
+                if cache_key and cached is None:
+                    page_texts.extend(records)
+                self.update_progress(
+                    job_id,
+                    int((done / total_pages) * 100),
+                    f"Extracted text from {done} of {total_pages} pages"
+                )
+
+            if output_format == "json":
+                f.write("]}")
+
+        if cache_key and cached is None:
+            text_blob, offsets = pack_strings(page_texts)
+            text_cache_service.save(cache_key, PAGE_TEXT_KIND, {"text": text_blob, "offsets": offsets})
 
         # Complete job
         file_size = output_path.stat().st_size
@@ -185,16 +227,123 @@ class ExtractTextProcessor(BaseProcessor):
             "output_file_id": job_id,
             "filename": output_filename,
             "size": file_size,
+            "pages": total_pages,
+            "format": output_format,
+            "detail": detail,
             "download_url": f"/api/v1/files/download/{job_id}",
             "expires_at": (datetime.now() + timedelta(hours=settings.FILE_EXPIRE_HOURS)).isoformat()
         })
 
         return job_id
 
+    def _format_record(self, output_format: str, detail: str, index: int, record: Any) -> str:
+        """Serialize one page record for the output file.
+
+        txt: pages separated by a blank line.
+        ndjson: one {"page": n, <detail>: ...} object per line.
+        json: {"pages": n, <detail>: [per-page records]}, written incrementally.
+
+        Args:
+            output_format: Output format
+            detail: Level of detail (key of the record)
+            index: 0-based page index
+            record: Page record from _page_text_record
+        """
+        separator = "" if index == 0 else ("\n\n" if output_format == "txt" else ", ")
+        if output_format == "ndjson":
+            return json.dumps({"page": index + 1, detail: record}, ensure_ascii=False) + "\n"
+        if output_format == "json":
+            return separator + json.dumps(record, ensure_ascii=False)
+        return separator + record
+
+
+def _convert_image(
+    doc: fitz.Document,
+    xref: int,
+    smask: int,
+    output_format: str
+) -> Tuple[str, bytes]:
+    """Get one image's bytes, in its original encoding or converted.
+
+    Args:
+        doc: Source document
+        xref: Image xref
+        smask: Soft mask xref (0 if none); applied as alpha for PNG output
+        output_format: "original", "png" or "jpg"
+
+    Returns:
+        (file extension, image bytes)
+    """
+    if output_format == "original":
+        base_image = doc.extract_image(xref)
+        if not base_image:
+            raise ValueError(f"Cannot extract image {xref}")
+        return base_image["ext"], base_image["image"]
+
+    pix = fitz.Pixmap(doc, xref)
+    if pix.colorspace and pix.colorspace.n not in (1, 3):
+        # PNG/JPEG writers need gray or RGB
+        pix = fitz.Pixmap(fitz.csRGB, pix)
+
+    if output_format == "png":
+        if smask and not pix.alpha:
+            mask = fitz.Pixmap(doc, smask)
+            if (mask.width, mask.height) == (pix.width, pix.height):
+                pix = fitz.Pixmap(pix, mask)
+        return "png", pix.tobytes("png")
+
+    if pix.alpha:
+        pix = fitz.Pixmap(pix, 0)
+    return "jpg", pix.tobytes("jpg", jpg_quality=95)
+
+
+def _convert_image_block(
+    images: List[Tuple[int, int]],
+    source_path: str,
+    output_format: str
+) -> List[Tuple[int, str, bytes]]:
+    """Open the source by path and convert a block of images."""
+    with fitz.open(source_path) as source:
+        return _convert_images(source, images, output_format)
+
+
+def _convert_images(
+    doc: fitz.Document,
+    images: List[Tuple[int, int]],
+    output_format: str
+) -> List[Tuple[int, str, bytes]]:
+    """Convert (xref, smask) images from an open source document.
+
+    Returns:
+        (xref, extension, bytes) per image, in order; images that cannot be
+        decoded get an empty extension and no bytes
+    """
+    results = []
+    for xref, smask in images:
+        try:
+            ext, data = _convert_image(doc, xref, smask, output_format)
+        except Exception:
+            ext, data = "", b""
+        results.append((xref, ext, data))
+    return results
+
 
 @registry.register("extract_images")
 class ExtractImagesProcessor(BaseProcessor):
-    """Processor for extracting images from PDF."""
+    """Processor for extracting images from PDF.
+
+    Each image xref is extracted once, however many pages show it. Images
+    are written into a ZIP as they are ready, followed by manifest.json
+    mapping pages to image files.
+    """
+
+    FORMATS = ("original", "png", "jpg")
+
+    # Minimum number of images before converting in worker processes
+    PARALLEL_MIN_IMAGES = 8
+
+    # Encodings that are already compressed and are stored in the ZIP as-is
+    COMPRESSED_EXTS = {"jpg", "jpeg", "jpx", "jp2", "png", "jbig2", "webp"}
 
     async def process(
         self,
@@ -207,7 +356,7 @@ class ExtractImagesProcessor(BaseProcessor):
         Args:
             job_id: Job identifier
             files: List with single PDF file path
-            options: Processing options
+            options: Processing options (format: "original", "png" or "jpg")
 
         Returns:
             Output file ID
@@ -220,57 +369,86 @@ class ExtractImagesProcessor(BaseProcessor):
         )
 
         file_path = files[0]
-        output_format = options.get("format", "png")
+        output_format = options.get("format", "original")
+        if output_format not in self.FORMATS:
+            raise ValueError(f"Invalid format: {output_format}")
 
         # Validate PDF
-        doc = self.validate_pdf(file_path)
+        doc = self.open_document(file_path)
         total_pages = len(doc)
 
-        # Create output directory
-        output_dir = Path(settings.RESULT_DIR) / job_id
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        image_count = 0
+        # Collect unique images (first appearance order) and where they appear
+        image_smask: Dict[int, int] = {}
+        page_images: List[List[int]] = []
         for i in range(total_pages):
-            # Update progress
-            progress = int((i / total_pages) * 100)
-            self.update_progress(
-                job_id,
-                progress,
-                f"Extracting images from page {i + 1}"
+            xrefs = []
+            for img in doc[i].get_images(full=True):
+                xref, smask = img[0], img[1]
+                image_smask.setdefault(xref, smask)
+                if xref not in xrefs:
+                    xrefs.append(xref)
+            page_images.append(xrefs)
+
+        self.update_progress(job_id, 10, f"Found {len(image_smask)} unique images")
+
+        images = list(image_smask.items())
+        # Copying original streams is cheap; only conversion is worth workers
+        parallel = output_format != "original" and len(images) >= self.PARALLEL_MIN_IMAGES
+        workers = settings.MAX_WORKERS if parallel else 1
+        blocks = contiguous_blocks(images, workers * 4)
+        if workers > 1:
+            block_results = map_blocks_ordered(
+                _convert_image_block, blocks, workers, str(file_path), output_format
             )
+        else:
+            block_results = (_convert_images(doc, block, output_format) for block in blocks)
 
-            page = doc[i]
-            image_list = page.get_images()
-
-            for img_index, img in enumerate(image_list):
-                xref = img[0]
-                base_image = doc.extract_image(xref)
-
-                # Save image
-                image_ext = base_image["ext"]
-                image_filename = f"page_{i + 1}_img_{img_index + 1}.{image_ext}"
-                image_path = output_dir / image_filename
-
-                with open(image_path, "wb") as f:
-                    f.write(base_image["image"])
-
-                image_count += 1
-
-        doc.close()
-
-        # For now, return a text file with image info
-        # TODO: Return ZIP with all images
-        output_path = self.get_output_path(job_id, "images_info.txt")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(f"Extracted {image_count} images from {total_pages} pages\n")
+        output_filename = "extracted_images.zip"
+        output_path = self.get_output_path(job_id, output_filename)
+        filenames: Dict[int, str] = {}
+        manifest_images = []
+        done = 0
+        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+            for block in block_results:
+                for xref, ext, data in block:
+                    done += 1
+                    if not data:
+                        continue
+                    filename = f"image_{len(filenames) + 1:04d}.{ext}"
+                    compress = (
+                        zipfile.ZIP_STORED if ext in self.COMPRESSED_EXTS else zipfile.ZIP_DEFLATED
+                    )
+                    zipf.writestr(filename, data, compress_type=compress)
+                    filenames[xref] = filename
+                    manifest_images.append({"file": filename, "xref": xref, "size": len(data)})
+                self.update_progress(
+                    job_id,
+                    10 + int((done / max(1, len(images))) * 85),
+                    f"Extracted {done} of {len(images)} images"
+                )
+
+            manifest = {
+                "pages": total_pages,
+                "format": output_format,
+                "images": manifest_images,
+                "page_images": [
+                    {"page": i + 1, "images": [filenames[x] for x in xrefs if x in filenames]}
+                    for i, xrefs in enumerate(page_images)
+                ],
+            }
+            zipf.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2))
 
         # Complete job
         file_size = output_path.stat().st_size
         job_service.complete_job(job_id, {
             "output_file_id": job_id,
-            "filename": "images_info.txt",
+            "filename": output_filename,
             "size": file_size,
+            "pages": total_pages,
+            "image_count": len(filenames),
+            "placements": sum(len(xrefs) for xrefs in page_images),
+            "skipped_images": len(images) - len(filenames),
+            "format": output_format,
             "download_url": f"/api/v1/files/download/{job_id}",
             "expires_at": (datetime.now() + timedelta(hours=settings.FILE_EXPIRE_HOURS)).isoformat()
         })
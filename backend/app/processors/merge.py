@@ -1,16 +1,55 @@
 """PDF merge processor."""
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 from datetime import datetime, timedelta
+import os
+import shutil
+import tempfile
 import fitz
 from app.processors.base import BaseProcessor
+from app.processors.parallel import map_blocks_ordered
 from app.processors.registry import registry
+from app.processors.resource_dedupe import deduplicate_resources
 from app.core.config import settings
 
 
+def _merge_batch(paths: List[str], tmp_dir: str) -> Tuple[str, int]:
+    """Merge a batch of inputs into an intermediate file.
+
+    Inputs are opened by path one at a time and closed right after their
+    pages are copied, so only the batch output and one input are held in
+    memory.
+
+    Returns:
+        (intermediate file path, page count)
+    """
+    batch_doc = fitz.open()
+    for path in paths:
+        with fitz.open(path) as doc:
+            if doc.is_encrypted:
+                raise ValueError(f"PDF file is encrypted and not supported: {Path(path).name}")
+            if len(doc) == 0:
+                raise ValueError(f"PDF file has no pages: {Path(path).name}")
+            batch_doc.insert_pdf(doc)
+
+    fd, output_path = tempfile.mkstemp(suffix=".pdf", dir=tmp_dir)
+    os.close(fd)
+    # Intermediate files are re-read once; skip compression work
+    batch_doc.save(output_path)
+    page_count = len(batch_doc)
+    batch_doc.close()
+    return output_path, page_count
+
+
 @registry.register("merge")
 class MergeProcessor(BaseProcessor):
-    """Processor for merging multiple PDF files."""
+    """Processor for merging multiple PDF files.
+
+    Inputs that fit the memory budget are merged in memory. Larger jobs
+    are merged in batches (in parallel worker processes) into
+    intermediate files, which are then concatenated one at a time with
+    incremental saves so peak memory stays at about one batch.
+    """
 
     async def process(
         self,
@@ -50,31 +89,12 @@ class MergeProcessor(BaseProcessor):
         output_path = self.get_output_path(job_id, output_filename)
 
         try:
-            result_doc = fitz.open()
-            total_files = len(files)
-
-            for i, file_path in enumerate(files):
-                # Update progress
-                progress = int((i / total_files) * 100)
-                self.update_progress(
-                    job_id,
-                    progress,
-                    f"Merging file {i + 1} of {total_files}"
-                )
+            batches = self._plan_batches(files)
 
-                # Validate and open PDF
-                self.validate_pdf(file_path)
-
-                # Insert PDF pages
-                with fitz.open(file_path) as doc:
-                    result_doc.insert_pdf(doc)
-
-            # Get page count before closing
-            page_count = len(result_doc)
-
-            # Save result
-            result_doc.save(output_path)
-            result_doc.close()
+            if len(batches) == 1:
+                page_count = self._merge_in_memory(job_id, files, output_path, options)
+            else:
+                page_count = self._merge_batched(job_id, batches, output_path, options)
 
             # Get the actual filename that was saved
             # output_path is like: /path/to/result/{job_id}_merged.pdf
@@ -99,3 +119,126 @@ class MergeProcessor(BaseProcessor):
                 "message": str(e)
             })
             raise
+
+    def _plan_batches(self, files: List[Path]) -> List[List[str]]:
+        """Group consecutive inputs into batches within the memory budget.
+
+        File size is used as the estimate of a document's memory footprint.
+        Batches run concurrently, so the budget is shared between workers.
+        """
+        budget = settings.MERGE_MEMORY_BUDGET_MB * 1024 * 1024
+        total_size = sum(f.stat().st_size for f in files)
+        if total_size <= budget:
+            return [[str(f) for f in files]]
+
+        batch_budget = budget / max(1, settings.MAX_WORKERS)
+        batches: List[List[str]] = []
+        batch_size = 0
+        for file_path in files:
+            size = file_path.stat().st_size
+            if batches and batch_size + size <= batch_budget:
+                batches[-1].append(str(file_path))
+                batch_size += size
+            else:
+                batches.append([str(file_path)])
+                batch_size = size
+        return batches
+
+    def _merge_in_memory(
+        self,
+        job_id: str,
+        files: List[Path],
+        output_path: Path,
+        options: Dict[str, Any]
+    ) -> int:
+        """Merge all inputs into one in-memory document and save it.
+
+        Returns:
+            Page count of the merged document
+        """
+        result_doc = fitz.open()
+        total_files = len(files)
+
+        for i, file_path in enumerate(files):
+            # Update progress
+            progress = int((i / total_files) * 100)
+            self.update_progress(
+                job_id,
+                progress,
+                f"Merging file {i + 1} of {total_files}"
+            )
+
+            # Open and validate once, then insert pages from the same handle
+            result_doc.insert_pdf(self.open_document(file_path))
+
+        # Get page count before closing
+        page_count = len(result_doc)
+
+        # Save result with shared fonts/images/ICC profiles stored once
+        deduplicated = deduplicate_resources(result_doc)
+        result_doc.save(output_path, **self._merged_save_options(options, deduplicated))
+        result_doc.close()
+        return page_count
+
+    def _merge_batched(
+        self,
+        job_id: str,
+        batches: List[List[str]],
+        output_path: Path,
+        options: Dict[str, Any]
+    ) -> int:
+        """Merge batches into intermediate files, then concatenate them.
+
+        Returns:
+            Page count of the merged document
+        """
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f"{job_id}_merge_", dir=output_path.parent))
+        try:
+            intermediates = []
+            page_count = 0
+            for path, pages in map_blocks_ordered(
+                _merge_batch, batches, settings.MAX_WORKERS, str(tmp_dir)
+            ):
+                intermediates.append(path)
+                page_count += pages
+                self.update_progress(
+                    job_id,
+                    int(len(intermediates) / len(batches) * 70),
+                    f"Merged batch {len(intermediates)} of {len(batches)}"
+                )
+
+            # Cheap concatenation: append each batch to the output with an
+            # incremental save and reopen, so only one batch is in memory
+            shutil.copyfile(intermediates[0], output_path)
+            for i, path in enumerate(intermediates[1:], start=2):
+                self.update_progress(
+                    job_id,
+                    70 + int(i / len(intermediates) * 20),
+                    f"Concatenating batch {i} of {len(intermediates)}"
+                )
+                with fitz.open(output_path) as result_doc, fitz.open(path) as batch_doc:
+                    result_doc.insert_pdf(batch_doc)
+                    result_doc.saveIncr()
+
+            # Final rewrite per save profile (streams are copied one at a time)
+            self.update_progress(job_id, 95, "Compacting merged document")
+            with fitz.open(output_path) as result_doc:
+                deduplicated = deduplicate_resources(result_doc)
+                save_options = self._merged_save_options(options, deduplicated)
+                if save_options:
+                    self.save_document(result_doc, output_path, "rewrite", **save_options)
+
+            return page_count
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _merged_save_options(self, options: Dict[str, Any], deduplicated: int) -> Dict[str, Any]:
+        """Save options for the merged document.
+
+        Deduplicated resources are only dropped by garbage collection, so
+        it is enabled even under the "fast" profile when anything was merged.
+        """
+        save_options = self.get_save_options(options)
+        if deduplicated and not save_options.get("garbage"):
+            save_options["garbage"] = 1
+        return save_options
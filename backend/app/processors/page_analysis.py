@@ -0,0 +1,242 @@
+"""Per-document page analysis shared by watermark detectors.
+
+每页只提取一次文本 span 和图片位置，保存为紧凑的 numpy 数组，
+供重复检测、特征检测和区域删除等策略共同读取。
+完整提取的结果按文档内容哈希持久化（text_cache_service），
+同一文档的后续任务直接加载，不再重新解析页面。
+"""
+from typing import Dict, List, Optional
+import hashlib
+import fitz
+import numpy as np
+from app.services.text_cache_service import pack_strings, text_cache_service, unpack_strings
+
+# 缓存条目类型
+LAYOUT_CACHE_KIND = "layout"
+
+
+# 提取文本时不保留图片数据（TEXT_PRESERVE_IMAGES 会把图片内容读入 dict）
+TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+
+def text_hash(text: str) -> int:
+    """Stable 64-bit hash of a text (identical across processes and runs)."""
+    return int.from_bytes(
+        hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def hash_texts(texts: List[str]) -> np.ndarray:
+    """Hash a list of texts into a uint64 array."""
+    return np.fromiter((text_hash(t) for t in texts), dtype=np.uint64, count=len(texts))
+
+
+class PageLayout:
+    """Text spans and image placements of a single page.
+
+    Attributes:
+        width: Page width
+        height: Page height
+        span_text: Stripped span texts
+        span_bbox: Span bboxes, float32 array of shape (n, 4)
+        span_size: Span font sizes, float32 array of shape (n,)
+        span_hash: Stable 64-bit hashes of span texts, uint64 array of shape (n,)
+        image_xref: Image xrefs, int32 array of shape (m,)
+        image_bbox: Image placement bboxes, float32 array of shape (m, 4)
+        image_transform: Image placement matrices, float32 array of shape (m, 6)
+    """
+
+    __slots__ = (
+        "width", "height",
+        "span_text", "span_bbox", "span_size", "span_hash",
+        "image_xref", "image_bbox", "image_transform",
+    )
+
+    def __init__(
+        self,
+        width: float,
+        height: float,
+        span_text: List[str],
+        span_bbox: np.ndarray,
+        span_size: np.ndarray,
+        span_hash: np.ndarray,
+        image_xref: np.ndarray,
+        image_bbox: np.ndarray,
+        image_transform: np.ndarray
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.span_text = span_text
+        self.span_bbox = span_bbox
+        self.span_size = span_size
+        self.span_hash = span_hash
+        self.image_xref = image_xref
+        self.image_bbox = image_bbox
+        self.image_transform = image_transform
+
+    @property
+    def span_length(self) -> np.ndarray:
+        """Length of each stripped span text."""
+        return np.fromiter(
+            (len(text) for text in self.span_text), dtype=np.int32, count=len(self.span_text)
+        )
+
+
+def pack_layouts(layouts: List[PageLayout]) -> Dict[str, np.ndarray]:
+    """Concatenate page layouts into flat arrays with per-page offsets."""
+    span_counts = [len(layout.span_text) for layout in layouts]
+    image_counts = [len(layout.image_xref) for layout in layouts]
+    text_blob, text_offsets = pack_strings(
+        [text for layout in layouts for text in layout.span_text]
+    )
+
+    def offsets(counts: List[int]) -> np.ndarray:
+        result = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=result[1:])
+        return result
+
+    def concat(name: str, shape: tuple, dtype: type) -> np.ndarray:
+        parts = [getattr(layout, name) for layout in layouts]
+        return np.concatenate(parts).astype(dtype) if parts else np.empty(shape, dtype=dtype)
+
+    return {
+        "page_size": np.array(
+            [(layout.width, layout.height) for layout in layouts], dtype=np.float64
+        ).reshape(-1, 2),
+        "span_offsets": offsets(span_counts),
+        "span_text": text_blob,
+        "span_text_offsets": text_offsets,
+        "span_bbox": concat("span_bbox", (0, 4), np.float32),
+        "span_size": concat("span_size", (0,), np.float32),
+        "span_hash": concat("span_hash", (0,), np.uint64),
+        "image_offsets": offsets(image_counts),
+        "image_xref": concat("image_xref", (0,), np.int32),
+        "image_bbox": concat("image_bbox", (0, 4), np.float32),
+        "image_transform": concat("image_transform", (0, 6), np.float32),
+    }
+
+
+def unpack_layouts(arrays: Dict[str, np.ndarray]) -> List[PageLayout]:
+    """Inverse of pack_layouts."""
+    texts = unpack_strings(arrays["span_text"], arrays["span_text_offsets"])
+    spans = arrays["span_offsets"].tolist()
+    images = arrays["image_offsets"].tolist()
+
+    layouts = []
+    for page_num, (width, height) in enumerate(arrays["page_size"].tolist()):
+        s0, s1 = spans[page_num], spans[page_num + 1]
+        i0, i1 = images[page_num], images[page_num + 1]
+        layouts.append(PageLayout(
+            width=width,
+            height=height,
+            span_text=texts[s0:s1],
+            span_bbox=arrays["span_bbox"][s0:s1],
+            span_size=arrays["span_size"][s0:s1],
+            span_hash=arrays["span_hash"][s0:s1],
+            image_xref=arrays["image_xref"][i0:i1],
+            image_bbox=arrays["image_bbox"][i0:i1],
+            image_transform=arrays["image_transform"][i0:i1],
+        ))
+    return layouts
+
+
+class DocumentAnalysis:
+    """Lazily extracts and caches the layout of each page of a document."""
+
+    def __init__(self, doc: fitz.Document, cache_key: Optional[str] = None) -> None:
+        """Initialize analysis for a document.
+
+        Args:
+            doc: Opened PyMuPDF document
+            cache_key: Content hash of the unmodified document
+                (text_cache_service.document_key); enables the persistent cache
+        """
+        self.doc = doc
+        self.cache_key = cache_key
+        self._pages: Dict[int, PageLayout] = {}
+        self.cached = False
+
+        if cache_key:
+            arrays = text_cache_service.load(cache_key, LAYOUT_CACHE_KIND)
+            if arrays is not None and len(arrays["page_size"]) == len(doc):
+                self._pages = dict(enumerate(unpack_layouts(arrays)))
+                self.cached = True
+
+    def __len__(self) -> int:
+        return len(self.doc)
+
+    def page(self, page_num: int) -> PageLayout:
+        """Get the layout of a page, extracting it on first access.
+
+        Args:
+            page_num: Page index (0-based)
+
+        Returns:
+            Page layout
+        """
+        layout = self._pages.get(page_num)
+        if layout is None:
+            layout = self._extract(self.doc[page_num])
+            self._pages[page_num] = layout
+        return layout
+
+    def extract_all(self) -> None:
+        """Extract every page now and store the result in the persistent cache.
+
+        必须在修改文档之前调用：删除操作可能修改多页共享的资源，
+        之后再提取的页面布局不能代表原始文档内容。文档已被修改
+        （is_dirty）时只提取、不写缓存。
+        """
+        for page_num in range(len(self.doc)):
+            self.page(page_num)
+
+        if self.cache_key and not self.cached and not self.doc.is_dirty:
+            layouts = [self._pages[i] for i in range(len(self.doc))]
+            text_cache_service.save(self.cache_key, LAYOUT_CACHE_KIND, pack_layouts(layouts))
+            self.cached = True
+
+    def _extract(self, page: fitz.Page) -> PageLayout:
+        """Extract text spans and image placements of a page in one pass."""
+        texts: List[str] = []
+        bboxes: List[tuple] = []
+        sizes: List[float] = []
+
+        try:
+            text_dict = page.get_text("dict", flags=TEXT_FLAGS)
+            for block in text_dict.get("blocks", []):
+                if block.get("type") != 0:
+                    continue
+                for line in block.get("lines", []):
+                    for span in line.get("spans", []):
+                        texts.append(span.get("text", "").strip())
+                        bboxes.append(span.get("bbox", (0, 0, 0, 0)))
+                        sizes.append(span.get("size", 0))
+        except Exception:
+            pass
+
+        image_xrefs: List[int] = []
+        image_bboxes: List[tuple] = []
+        image_transforms: List[tuple] = []
+
+        # 一次遍历页面内容流得到所有图片位置（含 bbox 和变换矩阵），
+        # 避免对每个 xref 调用 get_image_rects 反复扫描内容流。
+        # 内联图片的 xref 为 0，同样保留。
+        try:
+            for info in page.get_image_info(xrefs=True):
+                image_xrefs.append(info.get("xref", 0))
+                image_bboxes.append(tuple(info["bbox"]))
+                image_transforms.append(tuple(info["transform"]))
+        except Exception:
+            pass
+
+        return PageLayout(
+            width=page.rect.width,
+            height=page.rect.height,
+            span_text=texts,
+            span_bbox=np.array(bboxes, dtype=np.float32).reshape(-1, 4),
+            span_size=np.array(sizes, dtype=np.float32),
+            span_hash=hash_texts(texts),
+            image_xref=np.array(image_xrefs, dtype=np.int32),
+            image_bbox=np.array(image_bboxes, dtype=np.float32).reshape(-1, 4),
+            image_transform=np.array(image_transforms, dtype=np.float32).reshape(-1, 6),
+        )
@@ -0,0 +1,167 @@
+"""Page selection shared by all processors.
+
+A page spec such as "1-3, 5, 9-" is parsed once into 0-based inclusive
+runs. A PageSelection compiles runs into sorted, coalesced ranges plus a
+bytearray membership mask, so membership checks are O(1) and contiguous
+pages can be copied with one insert_pdf call per run.
+
+Spec syntax (1-based page numbers, comma separated):
+    "5"          a single page
+    "3-7"        pages 3 to 7
+    "9-", "9--", "9--1"
+                 page 9 to the last page
+"""
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import fitz
+
+Run = Tuple[int, int]
+
+
+def parse_page_spec(spec: str, total_pages: int, strict: bool = True) -> List[Run]:
+    """Parse a page spec into 0-based inclusive runs, in spec order.
+
+    Args:
+        spec: Page spec like "1-3, 5, 9-"
+        total_pages: Number of pages in the document
+        strict: Raise on pages outside the document instead of clipping
+
+    Returns:
+        List of (first, last) runs; runs clipped away entirely are dropped
+
+    Raises:
+        ValueError: Malformed spec, or (strict) pages outside the document
+    """
+    runs = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+
+        try:
+            if '-' in part:
+                start, end = part.split('-', 1)
+                first = int(start) - 1
+                end = end.strip()
+                # "N-", "N--" and "N--1" all mean "to the last page"
+                last = total_pages - 1 if end in ("", "-", "-1") else int(end) - 1
+            else:
+                first = last = int(part) - 1
+        except ValueError:
+            raise ValueError(f"Invalid page range: {part}")
+
+        if first > last:
+            raise ValueError(f"Invalid page range: {part}")
+        if strict and (first < 0 or last >= total_pages):
+            raise ValueError(
+                f"Invalid page range: {part} (PDF has {total_pages} pages)"
+            )
+
+        first, last = max(0, first), min(total_pages - 1, last)
+        if first <= last:
+            runs.append((first, last))
+
+    return runs
+
+
+class PageSelection:
+    """Sorted set of 0-based page indices stored as coalesced runs.
+
+    Behaves like a sorted list of indices (len, iteration, indexing) so it
+    can be passed wherever a page index list was used before.
+    """
+
+    def __init__(self, runs: Sequence[Run], total_pages: int) -> None:
+        """Compile runs.
+
+        Args:
+            runs: 0-based inclusive (first, last) runs, in any order, may overlap
+            total_pages: Number of pages in the document
+        """
+        self.total_pages = total_pages
+
+        coalesced: List[Run] = []
+        for first, last in sorted(runs):
+            if coalesced and first <= coalesced[-1][1] + 1:
+                coalesced[-1] = (coalesced[-1][0], max(coalesced[-1][1], last))
+            else:
+                coalesced.append((first, last))
+        self.runs = coalesced
+
+        self._mask = bytearray(total_pages)
+        for first, last in coalesced:
+            self._mask[first:last + 1] = b"\x01" * (last - first + 1)
+        # Position of each run's first page within the selection
+        self._offsets = [0] + list(accumulate(last - first + 1 for first, last in coalesced))
+
+    @classmethod
+    def all(cls, total_pages: int) -> "PageSelection":
+        """Select every page."""
+        return cls([(0, total_pages - 1)] if total_pages else [], total_pages)
+
+    @classmethod
+    def parse(cls, spec: str, total_pages: int, strict: bool = True) -> "PageSelection":
+        """Compile a page spec (see parse_page_spec)."""
+        return cls(parse_page_spec(spec, total_pages, strict), total_pages)
+
+    @classmethod
+    def every(cls, every_n: int, total_pages: int) -> "PageSelection":
+        """Select every n-th page (pages n, 2n, ...)."""
+        if every_n < 1:
+            raise ValueError(f"every_n must be at least 1, got {every_n}")
+        return cls([(i, i) for i in range(every_n - 1, total_pages, every_n)], total_pages)
+
+    @classmethod
+    def single(cls, page: int, total_pages: int) -> "PageSelection":
+        """Select one 1-based page; empty when it is outside the document."""
+        index = page - 1
+        return cls([(index, index)] if 0 <= index < total_pages else [], total_pages)
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any], total_pages: int) -> "PageSelection":
+        """Build the selection from the common processor options.
+
+        Modes: "all" (default), "range" (ranges), "every" (every_n) and
+        "single" (page). Pages outside the document are ignored.
+        """
+        mode = options.get("mode", "all")
+        if mode == "range":
+            return cls.parse(options.get("ranges", ""), total_pages, strict=False)
+        if mode == "every":
+            return cls.every(int(options.get("every_n", 2)), total_pages)
+        if mode == "single":
+            return cls.single(int(options.get("page", 1)), total_pages)
+        return cls.all(total_pages)
+
+    @property
+    def is_all(self) -> bool:
+        """Whether every page of the document is selected."""
+        return len(self) == self.total_pages
+
+    def __contains__(self, index: object) -> bool:
+        return isinstance(index, int) and 0 <= index < self.total_pages and bool(self._mask[index])
+
+    def __len__(self) -> int:
+        return self._offsets[-1]
+
+    def __iter__(self) -> Iterator[int]:
+        for first, last in self.runs:
+            yield from range(first, last + 1)
+
+    def __getitem__(self, position: int) -> int:
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("page selection index out of range")
+        run = bisect_right(self._offsets, position) - 1
+        return self.runs[run][0] + position - self._offsets[run]
+
+    def __repr__(self) -> str:
+        return f"PageSelection(runs={self.runs}, total_pages={self.total_pages})"
+
+    def insert_into(self, target: fitz.Document, source: fitz.Document) -> None:
+        """Append the selected pages to target with one insert_pdf per run."""
+        for first, last in self.runs:
+            target.insert_pdf(source, from_page=first, to_page=last)
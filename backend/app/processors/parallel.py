@@ -0,0 +1,68 @@
+"""Ordered block-parallel execution across worker processes.
+
+PyMuPDF holds the GIL while copying and saving pages, so CPU-bound
+per-part work is spread over processes rather than threads. Work is
+cut into contiguous blocks (one per worker) so each worker opens its
+input once, and results are yielded in block order so consumers can
+stream them.
+
+Document handles cannot cross process boundaries, so worker functions
+take the source path and open their own handle. Processors keep the
+per-block work in a helper that takes an open document: workers call
+it on their own handle, and an in-process run calls it on the job's
+session handle (see DocumentSession) rather than reopening the file.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterator, List, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def contiguous_blocks(items: Sequence[T], count: int) -> List[List[T]]:
+    """Split items into at most `count` contiguous blocks of near-equal size."""
+    count = max(1, min(count, len(items)))
+    size, extra = divmod(len(items), count)
+
+    blocks = []
+    start = 0
+    for index in range(count):
+        end = start + size + (1 if index < extra else 0)
+        if end > start:
+            blocks.append(list(items[start:end]))
+        start = end
+    return blocks
+
+
+def map_blocks_ordered(
+    func: Callable[..., R],
+    blocks: List[List[T]],
+    max_workers: int,
+    *args: Any
+) -> Iterator[R]:
+    """Run func(block, *args) for every block, yielding results in block order.
+
+    Runs in-process when there is a single block or a single worker.
+    func and args must be picklable (module-level function, plain data).
+
+    Args:
+        func: Worker function
+        blocks: Work blocks (see contiguous_blocks)
+        max_workers: Maximum number of worker processes
+        *args: Extra arguments passed to every call
+
+    Yields:
+        Each block's result, as soon as it and all earlier blocks are done
+    """
+    if max_workers <= 1 or len(blocks) <= 1:
+        for block in blocks:
+            yield func(block, *args)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=min(max_workers, len(blocks)))
+    try:
+        futures = [executor.submit(func, block, *args) for block in blocks]
+        for future in futures:
+            yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
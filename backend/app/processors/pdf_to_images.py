@@ -1,12 +1,13 @@
 """PDF to images converter processor."""
 import io
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict
 from datetime import datetime, timedelta
 import zipfile
 import fitz
 from PIL import Image
 from app.processors.base import BaseProcessor
+from app.processors.page_selection import PageSelection
 from app.processors.registry import registry
 from app.core.config import settings
 from app.services.job_service import job_service
@@ -32,7 +33,6 @@ class PdfToImagesProcessor(BaseProcessor):
         file_path = files[0]
 
         # Get options
-        mode = options.get("mode", "all")
         output_format = options.get("format", "png")
         dpi = int(options.get("dpi", 150))
 
@@ -54,20 +54,11 @@ class PdfToImagesProcessor(BaseProcessor):
         }
         file_ext = ext_map[output_format]
 
-        doc = self.validate_pdf(file_path)
+        doc = self.open_document(file_path)
         total_pages = len(doc)
 
         # Determine which pages to convert
-        if mode == "all":
-            page_indices = list(range(total_pages))
-        elif mode == "range":
-            ranges_str = options.get("ranges", "")
-            page_indices = self._parse_ranges(ranges_str, total_pages)
-        elif mode == "single":
-            page_num = int(options.get("page", 1))
-            page_indices = [page_num - 1] if 0 < page_num - 1 < total_pages else []
-        else:
-            page_indices = list(range(total_pages))
+        page_indices = PageSelection.from_options(options, total_pages)
 
         if not page_indices:
             raise ValueError("No valid pages selected")
@@ -109,8 +100,6 @@ class PdfToImagesProcessor(BaseProcessor):
 
             pix = None  # Free memory
 
-        doc.close()
-
         # Create ZIP file
         self.update_progress(job_id, 90, "Creating ZIP archive...")
         zip_path = Path(settings.RESULT_DIR) / f"{job_id}_images.zip"
@@ -139,47 +128,3 @@ class PdfToImagesProcessor(BaseProcessor):
         })
 
         return f"{job_id}_images"
-
-    def _parse_ranges(self, ranges_str: str, total_pages: int) -> list[int]:
-        """Parse page range string.
-
-        Args:
-            ranges_str: Range string like "1-3, 5-7"
-            total_pages: Total number of pages in PDF
-
-        Returns:
-            List of page indices (0-based)
-        """
-        indices = set()
-
-        for part in ranges_str.split(','):
-            part = part.strip()
-            if not part:
-                continue
-
-            if '-' in part:
-                if '--' in part:
-                    # "N--" means from N to end
-                    start = int(part.split('--')[0]) - 1
-                    indices.update(range(max(0, start), total_pages))
-                else:
-                    # "N-M" range
-                    try:
-                        start, end = part.split('-')
-                        start = int(start) - 1
-                        end = int(end) - 1
-                        indices.update(range(max(0, start), min(total_pages, end + 1)))
-                    except ValueError:
-                        # Skip invalid range
-                        continue
-            else:
-                # Single page
-                try:
-                    page = int(part) - 1
-                    if 0 <= page < total_pages:
-                        indices.add(page)
-                except ValueError:
-                    # Skip invalid page number
-                    continue
-
-        return sorted(indices)
@@ -6,14 +6,27 @@
 3. 多策略组合：重复检测 + 特征检测 + 区域删除
 """
 from pathlib import Path
-from typing import Any, Dict, List, Set, Tuple
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict
+import hashlib
+import re
 import fitz
+import numpy as np
 from app.processors.base import BaseProcessor
+from app.processors.content_stream import (
+    MarkedContentPredicate,
+    filter_content,
+    is_watermark_artifact,
+)
+from app.processors.page_analysis import DocumentAnalysis, PageLayout, hash_texts
+from app.processors.page_selection import PageSelection
 from app.processors.registry import registry
+from app.processors.spatial_index import GridIndex, union_bbox
 from app.core.config import settings
 from app.services.job_service import job_service
+from app.services.template_service import template_service
+from app.services.text_cache_service import text_cache_service
 
 
 @registry.register("remove_watermark")
@@ -27,6 +40,18 @@ class RemoveWatermarkProcessor(BaseProcessor):
     4. 区域删除（中心区域清除）
     """
 
+    # 页数不超过该值时使用全部页面检测，否则分层采样
+    SAMPLE_MIN_PAGES = 50
+    # 采样误差（比例估计的置信区间半宽）
+    SAMPLE_MARGIN = 0.1
+    # 删除区域空间索引的网格大小（pt）
+    GRID_CELL_SIZE = 64.0
+    # 删除区域覆盖正文 span 面积超过该比例时视为会截断正文
+    BODY_CLIP_TOLERANCE = 0.1
+    # 应用水印模板时允许的归一化位置偏差和字号偏差（pt）
+    TEMPLATE_POSITION_TOLERANCE = 0.02
+    TEMPLATE_SIZE_TOLERANCE = 0.5
+
     async def process(
         self,
         job_id: str,
@@ -38,7 +63,14 @@ class RemoveWatermarkProcessor(BaseProcessor):
         Args:
             job_id: Job identifier
             files: List with single PDF file path
-            options: Removal options (mode, pages, ranges)
+            options: Removal options (mode, pages, ranges, removal_method:
+                     "auto" | "content" | "redact", save_template: name to
+                     save the detected watermark as, template: name of a
+                     saved template to apply instead of cross-page analysis,
+                     dry_run: only report detected regions, write no PDF,
+                     save_mode: "auto" | "incremental" | "rewrite"; "auto"
+                     rewrites, "incremental" keeps the watermarked revision
+                     in the file)
 
         Returns:
             Output file ID
@@ -51,141 +83,384 @@ class RemoveWatermarkProcessor(BaseProcessor):
 
         file_path = files[0]
         mode = options.get("mode", "all")
+        self._validate_template_options(options)
+
+        if options.get("dry_run"):
+            return await self._detect_only(job_id, file_path, options)
 
         if mode == "all":
             return await self._remove_all_pages(job_id, file_path, options)
         else:
             return await self._remove_selected_pages(job_id, file_path, options)
 
-    def _collect_content_signatures(
-        self, doc: fitz.Document
-    ) -> Dict[str, List[Tuple[int, Any]]]:
-        """收集所有内容的签名用于重复检测。
+    def _validate_template_options(self, options: Dict[str, Any]) -> None:
+        """拒绝无法同时生效的模板选项组合。
+
+        模板描述的是 redaction 目标：指定 template/save_template 时
+        auto 模式总会执行 redaction（结构化删除之后），content 模式不支持模板。
+
+        Raises:
+            ValueError: 选项组合无效
+        """
+        template_name = options.get("template")
+        save_name = options.get("save_template")
+        if template_name and save_name:
+            raise ValueError("template 和 save_template 不能同时指定")
+        if (template_name or save_name) and options.get("removal_method") == "content":
+            raise ValueError("removal_method=content 不使用水印模板，不能指定 template 或 save_template")
+        if save_name and options.get("dry_run"):
+            raise ValueError("dry_run 不能保存水印模板（save_template）")
+
+    def _use_redaction(
+        self,
+        removal_method: str,
+        structural_removed: int,
+        options: Dict[str, Any]
+    ) -> bool:
+        """是否执行 redaction：redact 模式，或 auto 模式下结构化删除未找到水印、
+        或指定了水印模板时。"""
+        if removal_method == "redact":
+            return True
+        return removal_method == "auto" and (
+            structural_removed == 0
+            or bool(options.get("template") or options.get("save_template"))
+        )
+
+    def _sample_pages(self, total_pages: int) -> List[int]:
+        """选择用于水印检测的分层采样页面。
+
+        样本量按比例估计公式（置信度 95%，误差 ±10%）并做有限总体修正；
+        页数较少时直接使用全部页面。每个分层（文档中等长的一段）取中间页，
+        保证样本均匀覆盖整个文档。
+
+        Args:
+            total_pages: 总页数
 
         Returns:
-            字典，键为内容签名，值为 [(页码, 位置信息), ...]
+            采样页码列表（0-based，升序）
         """
-        text_signatures = defaultdict(list)
-        image_signatures = defaultdict(list)
+        if total_pages <= self.SAMPLE_MIN_PAGES:
+            return list(range(total_pages))
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            page_width = page.rect.width
-            page_height = page.rect.height
+        z, p, e = 1.96, 0.5, self.SAMPLE_MARGIN
+        n0 = z * z * p * (1 - p) / (e * e)
+        sample_size = int(np.ceil(n0 / (1 + (n0 - 1) / total_pages)))
+        sample_size = max(self.SAMPLE_MIN_PAGES, min(sample_size, total_pages))
 
-            # 收集文本签名
-            try:
-                text_dict = page.get_text("dict")
-                for block in text_dict.get("blocks", []):
-                    if block.get("type") == 0:  # Text block
-                        for line in block.get("lines", []):
-                            for span in line.get("spans", []):
-                                text = span.get("text", "").strip()
-                                # 过滤：只考虑有意义的水印文本
-                                if len(text) >= 2 and not text.isspace():
-                                    font_size = span.get("size", 0)
-                                    bbox = span.get("bbox", (0, 0, 0, 0))
-
-                                    # 归一化位置（处理微小差异）
-                                    norm_x = round(bbox[0] / 20) * 20
-                                    norm_y = round(bbox[1] / 20) * 20
-
-                                    # 计算是否居中
-                                    center_x = (bbox[0] + bbox[2]) / 2
-                                    center_y = (bbox[1] + bbox[3]) / 2
-                                    is_centered = (
-                                        abs(center_x - page_width / 2) < page_width * 0.15 and
-                                        abs(center_y - page_height / 2) < page_height * 0.15
-                                    )
-
-                                    # 计算是否是大字体
-                                    is_large = font_size > 16
-
-                                    # 创建签名：文本内容 + 归一化位置 + 特征
-                                    signature = f"T:{text}:{norm_x}:{norm_y}:{int(is_large)}:{int(is_centered)}"
-                                    text_signatures[signature].append((page_num, bbox, font_size, is_centered))
-            except Exception:
-                pass
+        edges = np.linspace(0, total_pages, sample_size + 1)
+        return sorted(set(((edges[:-1] + edges[1:]) // 2).astype(int).tolist()))
 
-            # 收集图片签名
-            try:
-                image_list = page.get_images(full=True)
-                for img_info in image_list:
-                    xref = img_info[0]
-                    try:
-                        areas = page.get_image_rects(xref)
-                        for area in areas:
-                            # 计算图片覆盖率
-                            img_area = area.width * area.height
-                            page_area = page_width * page_height
-                            coverage = img_area / page_area if page_area > 0 else 0
-
-                            # 计算是否居中
-                            center_x = (area.x0 + area.x1) / 2
-                            center_y = (area.y0 + area.y1) / 2
-                            is_centered = (
-                                abs(center_x - page_width / 2) < page_width * 0.15 and
-                                abs(center_y - page_height / 2) < page_height * 0.15
-                            )
-
-                            # 归一化
-                            norm_x = round(area.x0 / 20) * 20
-                            norm_y = round(area.y0 / 20) * 20
-                            norm_w = round(area.width / 20) * 20
-
-                            # 创建签名
-                            signature = f"I:{xref}:{norm_x}:{norm_y}:{norm_w}:{int(coverage > 0.1)}:{int(is_centered)}"
-                            image_signatures[signature].append((page_num, area, coverage, is_centered))
-                    except Exception:
-                        pass
-            except Exception:
-                pass
+    def _collect_content_signatures(
+        self,
+        analysis: DocumentAnalysis,
+        page_indices: Optional[List[int]] = None
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """收集内容签名用于重复检测。
+
+        签名以列式数组保存：每个文本 span / 图片位置一个 64 位整数键，
+        避免为每个 span 构造字符串和元组。
+
+        Args:
+            analysis: 文档分析结果
+            page_indices: 参与检测的页面（默认全部页面）
+
+        Returns:
+            {"text": {"key", "page"}, "images": {"key", "page"}} 列式数组
+        """
+        columns = {"text": ([], []), "images": ([], [])}
+
+        if page_indices is None:
+            page_indices = range(len(analysis))
+
+        for page_num in page_indices:
+            text_keys, _, image_keys, _ = self._page_signatures(analysis.page(page_num))
+            for kind, keys in (("text", text_keys), ("images", image_keys)):
+                key_parts, page_parts = columns[kind]
+                key_parts.append(keys[keys != 0])
+                page_parts.append(np.full(np.count_nonzero(keys), page_num, dtype=np.int32))
 
         return {
-            "text": dict(text_signatures),
-            "images": dict(image_signatures)
+            kind: {
+                "key": np.concatenate(key_parts) if key_parts else np.empty(0, dtype=np.uint64),
+                "page": np.concatenate(page_parts) if page_parts else np.empty(0, dtype=np.int32),
+            }
+            for kind, (key_parts, page_parts) in columns.items()
         }
 
+    def _page_signatures(
+        self, layout: PageLayout
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """计算单页所有文本 span 和图片的签名键。
+
+        文本签名 = 文本哈希 + 归一化位置 + 是否大字体 + 是否居中；
+        图片签名 = xref + 归一化位置/宽度 + 是否大面积 + 是否居中。
+        不参与重复检测的文本（少于 2 个字符）键为 0。
+
+        Returns:
+            (文本键, 文本是否具有水印特征, 图片键, 图片是否具有水印特征)
+        """
+        page_width = layout.width
+        page_height = layout.height
+        page_area = page_width * page_height
+
+        # 文本签名
+        x0, y0, x1, y1 = layout.span_bbox.T
+        is_centered = (
+            (np.abs((x0 + x1) / 2 - page_width / 2) < page_width * 0.15) &
+            (np.abs((y0 + y1) / 2 - page_height / 2) < page_height * 0.15)
+        )
+        # 归一化位置（处理微小差异）
+        text_keys = self._combine_keys(
+            layout.span_hash,
+            np.round(x0 / 20),
+            np.round(y0 / 20),
+            (layout.span_size > 16) * 2 + is_centered
+        )
+        # 过滤：只考虑有意义的水印文本
+        text_keys[layout.span_length < 2] = 0
+        # 大字体或居中的重复文本很可能是水印
+        text_like = (layout.span_size > 14) | is_centered
+
+        # 图片签名
+        ix0, iy0, ix1, iy1 = layout.image_bbox.T
+        coverage = (ix1 - ix0) * (iy1 - iy0) / page_area if page_area > 0 else np.zeros_like(ix0)
+        image_centered = (
+            (np.abs((ix0 + ix1) / 2 - page_width / 2) < page_width * 0.15) &
+            (np.abs((iy0 + iy1) / 2 - page_height / 2) < page_height * 0.15)
+        )
+        image_keys = self._combine_keys(
+            layout.image_xref.astype(np.uint64),
+            np.round(ix0 / 20),
+            np.round(iy0 / 20),
+            np.round((ix1 - ix0) / 20),
+            (coverage > 0.1) * 2 + image_centered
+        )
+        # 大面积或居中的重复图片很可能是水印
+        image_like = (coverage > 0.05) | image_centered
+
+        return text_keys, text_like, image_keys, image_like
+
+    def _combine_keys(self, base: np.ndarray, *columns: np.ndarray) -> np.ndarray:
+        """把多列整数特征混合成一个 64 位签名键（FNV 风格）。"""
+        key = base.astype(np.uint64) ^ np.uint64(0xCBF29CE484222325)
+        for column in columns:
+            key = (key ^ column.astype(np.int64).astype(np.uint64)) * np.uint64(0x100000001B3)
+        # 0 保留为"无签名"
+        key[key == 0] = 1
+        return key
+
     def _detect_repeating_watermarks(
         self,
-        signatures: Dict[str, List[Tuple[int, Any]]],
+        signatures: Dict[str, Dict[str, np.ndarray]],
         total_pages: int
-    ) -> Tuple[Set[Any], Set[Any]]:
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """检测重复的水印内容。
 
+        对签名键做向量化分组计数，出现次数达到阈值的键即为重复内容。
+
         Args:
-            signatures: 内容签名字典
-            total_pages: 总页数
+            signatures: 内容签名列式数组
+            total_pages: 参与检测的页数（采样时为样本页数）
 
         Returns:
-            (要删除的文本bbox集合, 要删除的图片bbox集合)
+            (重复文本签名键, 重复图片签名键)
         """
-        text_to_remove = set()
-        images_to_remove = set()
-
         # 阈值：至少出现2页或20%的页面
         threshold = max(2, int(total_pages * 0.2))
 
-        # 检测重复文本
-        for sig, occurrences in signatures.get("text", {}).items():
-            if len(occurrences) >= threshold:
-                # 检查是否是水印特征
-                for page_num, bbox, font_size, is_centered in occurrences:
-                    # 大字体或居中的重复文本很可能是水印
-                    if font_size > 14 or is_centered:
-                        text_to_remove.add((page_num, bbox))
-
-        # 检测重复图片
-        for sig, occurrences in signatures.get("images", {}).items():
-            if len(occurrences) >= threshold:
-                for page_num, area, coverage, is_centered in occurrences:
-                    # 大面积或居中的重复图片很可能是水印
-                    if coverage > 0.05 or is_centered:
-                        images_to_remove.add((page_num, area))
+        repeating = []
+        for kind in ("text", "images"):
+            keys, counts = np.unique(signatures[kind]["key"], return_counts=True)
+            repeating.append(keys[counts >= threshold])
 
-        return text_to_remove, images_to_remove
+        return repeating[0], repeating[1]
+
+    def _resolve_watermarks(
+        self,
+        analysis: DocumentAnalysis,
+        options: Dict[str, Any]
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[Dict[str, Any]], List[int]]:
+        """确定要删除的水印：应用已保存的模板，或做跨页重复检测。
+
+        指定 template 时跳过采样和跨页分析；指定 save_template 时
+        把检测到的重复水印保存为模板。
+
+        Args:
+            analysis: 文档分析结果
+            options: 处理选项
+
+        Returns:
+            (重复文本签名键, 重复图片签名键, 已编译的模板, 采样页面)
+        """
+        template_name = options.get("template")
+        if template_name:
+            template = template_service.get_template(template_name)
+            if template is None:
+                raise ValueError(f"水印模板不存在: {template_name}")
+            empty = np.empty(0, dtype=np.uint64)
+            return empty, empty, self._compile_template(template), []
+
+        sample = self._sample_pages(len(analysis))
+        signatures = self._collect_content_signatures(analysis, sample)
+        repeating_text, repeating_images = self._detect_repeating_watermarks(
+            signatures, len(sample)
+        )
+
+        save_name = options.get("save_template")
+        if save_name:
+            template_service.save_template(
+                save_name,
+                self._build_template(analysis, sample, repeating_text, repeating_images)
+            )
+
+        return repeating_text, repeating_images, None, sample
+
+    def _build_template(
+        self,
+        analysis: DocumentAnalysis,
+        page_indices: List[int],
+        repeating_text: np.ndarray,
+        repeating_images: np.ndarray
+    ) -> Dict[str, Any]:
+        """把检测到的重复水印整理成与文档无关的模板。
+
+        文本记录内容、字号和归一化位置；图片记录原始流的 MD5 和归一化位置
+        （xref 在不同文档间不同，不能直接使用）。
+        """
+        texts: Dict[Tuple, Dict[str, Any]] = {}
+        images: Dict[Tuple, Dict[str, Any]] = {}
+        image_hashes: Dict[int, str] = {}
+
+        for page_num in page_indices:
+            layout = analysis.page(page_num)
+            scale = np.array(
+                [layout.width, layout.height, layout.width, layout.height], dtype=np.float32
+            )
+            text_keys, text_like, image_keys, image_like = self._page_signatures(layout)
+
+            text_mask = np.isin(text_keys, repeating_text) & text_like
+            for i in np.flatnonzero(text_mask).tolist():
+                position = np.round(layout.span_bbox[i] / scale, 4).tolist()
+                size = round(float(layout.span_size[i]), 2)
+                text = layout.span_text[i]
+                texts.setdefault(
+                    (text, size, *np.round(position, 2).tolist()),
+                    {"text": text, "size": size, "position": position}
+                )
+
+            image_mask = np.isin(image_keys, repeating_images) & image_like
+            for i in np.flatnonzero(image_mask).tolist():
+                xref = int(layout.image_xref[i])
+                if xref <= 0:
+                    continue
+                md5 = self._image_md5(analysis.doc, xref, image_hashes)
+                position = np.round(layout.image_bbox[i] / scale, 4).tolist()
+                images.setdefault(
+                    (md5, *np.round(position, 2).tolist()),
+                    {"md5": md5, "position": position}
+                )
+
+        return {"texts": list(texts.values()), "images": list(images.values())}
+
+    def _compile_template(self, template: Dict[str, Any]) -> Dict[str, Any]:
+        """把模板转换为便于向量化匹配的数组。"""
+        texts = template.get("texts", [])
+        images = template.get("images", [])
+
+        return {
+            "name": template.get("name"),
+            "text_hash": hash_texts([t["text"] for t in texts]),
+            "text_size": np.array([t["size"] for t in texts], dtype=np.float32),
+            "text_position": np.array(
+                [t["position"] for t in texts], dtype=np.float32
+            ).reshape(-1, 4),
+            "image_md5": np.array([i["md5"] for i in images], dtype=object),
+            "image_position": np.array(
+                [i["position"] for i in images], dtype=np.float32
+            ).reshape(-1, 4),
+            # xref -> MD5，同一文档内每个图片只计算一次
+            "image_hashes": {},
+        }
+
+    def _match_template(
+        self,
+        doc: fitz.Document,
+        layout: PageLayout,
+        template: Dict[str, Any]
+    ) -> Tuple[List[Any], List[Any]]:
+        """找出单页上与模板匹配的文本和图片。
+
+        Returns:
+            (要删除的文本bbox列表, 要删除的图片area列表)
+        """
+        scale = np.array(
+            [layout.width, layout.height, layout.width, layout.height], dtype=np.float32
+        )
+        tolerance = self.TEMPLATE_POSITION_TOLERANCE
+
+        texts = []
+        if len(template["text_hash"]) and len(layout.span_hash):
+            # (span, 模板文本) 两两比较
+            same_text = layout.span_hash[:, None] == template["text_hash"][None, :]
+            same_size = np.abs(
+                layout.span_size[:, None] - template["text_size"][None, :]
+            ) <= self.TEMPLATE_SIZE_TOLERANCE
+            near = np.all(np.abs(
+                (layout.span_bbox / scale)[:, None, :] - template["text_position"][None, :, :]
+            ) <= tolerance, axis=2)
+            text_mask = np.any(same_text & same_size & near, axis=1)
+            texts = [tuple(b) for b in layout.span_bbox[text_mask].tolist()]
+
+        images = []
+        if len(template["image_md5"]):
+            positions = layout.image_bbox / scale
+            for xref, bbox, position in zip(
+                layout.image_xref.tolist(), layout.image_bbox.tolist(), positions
+            ):
+                if xref <= 0:
+                    continue
+                md5 = self._image_md5(doc, xref, template["image_hashes"])
+                candidates = template["image_md5"] == md5
+                if np.any(candidates & np.all(
+                    np.abs(template["image_position"] - position) <= tolerance, axis=1
+                )):
+                    images.append(fitz.Rect(bbox))
+
+        return texts, images
+
+    def _image_md5(self, doc: fitz.Document, xref: int, cache: Dict[int, str]) -> str:
+        """图片原始（未解码）流的 MD5。"""
+        md5 = cache.get(xref)
+        if md5 is None:
+            try:
+                md5 = hashlib.md5(doc.xref_stream_raw(xref) or b"").hexdigest()
+            except Exception:
+                md5 = ""
+            cache[xref] = md5
+        return md5
 
-    def _detect_feature_watermarks(self, page: fitz.Page, page_num: int) -> Tuple[List[Any], List[Any]]:
+    def _match_repeating_watermarks(
+        self,
+        layout: PageLayout,
+        repeating_text: np.ndarray,
+        repeating_images: np.ndarray
+    ) -> Tuple[List[Any], List[Any]]:
+        """找出单页上属于重复水印的文本和图片。
+
+        Returns:
+            (要删除的文本bbox列表, 要删除的图片area列表)
+        """
+        text_keys, text_like, image_keys, image_like = self._page_signatures(layout)
+
+        text_mask = np.isin(text_keys, repeating_text) & text_like
+        image_mask = np.isin(image_keys, repeating_images) & image_like
+
+        return (
+            [tuple(b) for b in layout.span_bbox[text_mask].tolist()],
+            [fitz.Rect(b) for b in layout.image_bbox[image_mask].tolist()],
+        )
+
+    def _detect_feature_watermarks(self, layout: PageLayout) -> Tuple[List[Any], List[Any]]:
         """基于特征检测单页上的水印。
 
         检测：
@@ -197,206 +472,626 @@ class RemoveWatermarkProcessor(BaseProcessor):
         Returns:
             (要删除的文本bbox列表, 要删除的图片area列表)
         """
-        text_to_remove = []
-        images_to_remove = []
-
-        page_width = page.rect.width
-        page_height = page.rect.height
+        page_width = layout.width
+        page_height = layout.height
         center_x = page_width / 2
         center_y = page_height / 2
 
         # 检测文本水印
-        try:
-            text_dict = page.get_text("dict")
-            for block in text_dict.get("blocks", []):
-                if block.get("type") == 0:  # Text
-                    for line in block.get("lines", []):
-                        for span in line.get("spans", []):
-                            font_size = span.get("size", 0)
-                            bbox = span.get("bbox", (0, 0, 0))
-                            text = span.get("text", "").strip()
-
-                            # 特征1：大字体（很可能是水印）
-                            if font_size > 18:
-                                text_to_remove.append(bbox)
-                                continue
-
-                            # 特征2：居中的大文本
-                            text_center_x = (bbox[0] + bbox[2]) / 2
-                            text_center_y = (bbox[1] + bbox[3]) / 2
-                            is_centered = (
-                                abs(text_center_x - center_x) < 100 and
-                                abs(text_center_y - center_y) < 100
-                            )
-                            if is_centered and font_size > 12 and len(text) > 3:
-                                text_to_remove.append(bbox)
-                                continue
-
-                            # 特征3：对角线上的文本
-                            if abs(bbox[0] - bbox[2]) < 50:  # 窄文本
-                                # 检查是否在对角线附近
-                                diagonal_dist = abs(
-                                    (bbox[1] - page_height * bbox[0] / page_width) -
-                                    (page_height - page_height * bbox[2] / page_width)
-                                )
-                                if diagonal_dist < 100:
-                                    text_to_remove.append(bbox)
-        except Exception:
-            pass
+        x0, y0, x1, y1 = layout.span_bbox.T
+        font_size = layout.span_size
 
-        # 检测图片水印
-        try:
-            image_list = page.get_images(full=True)
-            seen_xrefs = set()
-            for img_info in image_list:
-                xref = img_info[0]
-                if xref in seen_xrefs:
-                    continue
-                seen_xrefs.add(xref)
+        # 特征1：大字体（很可能是水印）
+        is_large = font_size > 18
 
-                try:
-                    areas = page.get_image_rects(xref)
-                    for area in areas:
-                        # 计算覆盖率
-                        img_area = area.width * area.height
-                        page_area = page_width * page_height
-                        coverage = img_area / page_area if page_area > 0 else 0
-
-                        # 特征1：大面积图片
-                        if coverage > 0.1:
-                            images_to_remove.append(area)
-                            continue
-
-                        # 特征2：居中图片
-                        img_center_x = (area.x0 + area.x1) / 2
-                        img_center_y = (area.y0 + area.y1) / 2
-                        is_centered = (
-                            abs(img_center_x - center_x) < page_width * 0.15 and
-                            abs(img_center_y - center_y) < page_height * 0.15
-                        )
-                        if is_centered and coverage > 0.03:
-                            images_to_remove.append(area)
-                except Exception:
-                    pass
-        except Exception:
-            pass
+        # 特征2：居中的大文本
+        is_centered = (
+            (np.abs((x0 + x1) / 2 - center_x) < 100) &
+            (np.abs((y0 + y1) / 2 - center_y) < 100)
+        )
+        is_centered_text = is_centered & (font_size > 12) & (layout.span_length > 3)
+
+        # 特征3：对角线上的窄文本
+        diagonal_dist = np.abs(
+            (y0 - page_height * x0 / page_width) -
+            (page_height - page_height * x1 / page_width)
+        )
+        is_diagonal = (np.abs(x0 - x1) < 50) & (diagonal_dist < 100)
+
+        text_mask = is_large | is_centered_text | is_diagonal
+        text_to_remove = [tuple(b) for b in layout.span_bbox[text_mask].tolist()]
+
+        # 检测图片水印
+        ix0, iy0, ix1, iy1 = layout.image_bbox.T
+        page_area = page_width * page_height
+        coverage = (ix1 - ix0) * (iy1 - iy0) / page_area if page_area > 0 else np.zeros_like(ix0)
+
+        # 特征1：大面积图片；特征2：居中图片
+        is_centered_image = (
+            (np.abs((ix0 + ix1) / 2 - center_x) < page_width * 0.15) &
+            (np.abs((iy0 + iy1) / 2 - center_y) < page_height * 0.15)
+        )
+        image_mask = (coverage > 0.1) | (is_centered_image & (coverage > 0.03))
+        images_to_remove = [fitz.Rect(b) for b in layout.image_bbox[image_mask].tolist()]
 
         return text_to_remove, images_to_remove
 
-    def _remove_center_content(self, page: fitz.Page) -> List[Any]:
+    def _remove_center_content(self, layout: PageLayout) -> Tuple[List[Any], List[Any]]:
         """删除页面中心区域的内容（激进方案）。
 
         适用于：水印明确在页面中心的情况
-        """
-        page_width = page.rect.width
-        page_height = page.rect.height
 
+        Returns:
+            (要删除的文本bbox列表, 要删除的图片area列表)
+        """
         # 定义中心区域（30%宽高的中心矩形）
-        center_rect = fitz.Rect(
-            page_width * 0.35,
-            page_height * 0.35,
-            page_width * 0.65,
-            page_height * 0.65
-        )
+        cx0, cy0 = layout.width * 0.35, layout.height * 0.35
+        cx1, cy1 = layout.width * 0.65, layout.height * 0.65
 
         removed = []
 
-        # 删除中心区域的文本
-        try:
-            text_dict = page.get_text("dict")
-            for block in text_dict.get("blocks", []):
-                if block.get("type") == 0:
-                    for line in block.get("lines", []):
-                        for span in line.get("spans", []):
-                            bbox = span.get("bbox", (0, 0, 0))
-                            text_rect = fitz.Rect(bbox)
-                            # 检查是否在中心区域
-                            if center_rect.intersects(text_rect):
-                                removed.append(bbox)
-        except Exception:
-            pass
-
-        # 删除中心区域的图片
-        try:
-            image_list = page.get_images(full=True)
-            for img_info in image_list:
-                xref = img_info[0]
-                try:
-                    areas = page.get_image_rects(xref)
-                    for area in areas:
-                        if center_rect.intersects(area):
-                            removed.append(area)
-                except Exception:
-                    pass
-        except Exception:
-            pass
+        # 删除中心区域的文本和图片
+        for bboxes in (layout.span_bbox, layout.image_bbox):
+            x0, y0, x1, y1 = bboxes.T
+            intersects = (
+                (x0 < x1) & (y0 < y1) &
+                (x0 < cx1) & (x1 > cx0) & (y0 < cy1) & (y1 > cy0)
+            )
+            removed.append([tuple(b) for b in bboxes[intersects].tolist()])
 
-        return removed
+        return removed[0], removed[1]
 
     def _remove_watermarks_from_page(
         self,
         page: fitz.Page,
         page_num: int,
-        repeating_text: Set[Any],
-        repeating_images: Set[Any],
-        use_center_removal: bool = False
+        layout: PageLayout,
+        repeating_text: np.ndarray,
+        repeating_images: np.ndarray,
+        use_center_removal: bool = False,
+        template: Optional[Dict[str, Any]] = None
     ) -> int:
         """从单页删除水印。
 
         Args:
             page: PyMuPDF页面对象
             page_num: 页码
-            repeating_text: 重复文本集合 [(page_num, bbox), ...]
-            repeating_images: 重复图片集合 [(page_num, area), ...]
+            layout: 页面分析结果
+            repeating_text: 重复文本签名键
+            repeating_images: 重复图片签名键
             use_center_removal: 是否使用中心区域删除
+            template: 已编译的水印模板（见 _compile_template）
 
         Returns:
             删除的数量
         """
-        removed_count = 0
+        redactions, image_only, removed_count = self._plan_page_redactions(
+            page.parent, layout, repeating_text, repeating_images,
+            use_center_removal, template
+        )
+
+        for rect in redactions:
+            page.add_redact_annot(fitz.Rect(rect), fill=(1, 1, 1))
+        if redactions:
+            try:
+                page.apply_redactions()
+            except Exception:
+                pass
 
-        # 策略1：删除重复的文本水印
-        for rp, rbbox in repeating_text:
-            if rp == page_num:
-                rect = fitz.Rect(rbbox)
-                page.add_redact_annot(rect, fill=(1, 1, 1))
-                removed_count += 1
+        if image_only:
+            for rect in image_only:
+                page.add_redact_annot(fitz.Rect(rect))
+            try:
+                page.apply_redactions(
+                    text=fitz.PDF_REDACT_TEXT_NONE,
+                    graphics=fitz.PDF_REDACT_LINE_ART_NONE
+                )
+            except Exception:
+                pass
 
-        # 策略2：删除重复的图片水印
-        for rp, rarea in repeating_images:
-            if rp == page_num:
-                page.add_redact_annot(rarea, fill=(1, 1, 1))
-                removed_count += 1
+        return removed_count
 
-        # 策略3：基于特征检测水印
-        feature_texts, feature_images = self._detect_feature_watermarks(page, page_num)
+    def _plan_page_redactions(
+        self,
+        doc: fitz.Document,
+        layout: PageLayout,
+        repeating_text: np.ndarray,
+        repeating_images: np.ndarray,
+        use_center_removal: bool = False,
+        template: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Tuple], List[Tuple], int]:
+        """计算单页要删除的水印区域（不修改页面）。
+
+        各策略的候选区域放入空间索引：重叠区域合并为一个 redaction，
+        会截断正文文本的文本候选被丢弃，与正文重叠的图片候选只删除图片。
 
-        # 避免重复删除
-        for bbox in feature_texts:
-            rect = fitz.Rect(bbox)
-            page.add_redact_annot(rect, fill=(1, 1, 1))
-            removed_count += 1
+        Returns:
+            (普通 redaction 区域, 只删除图片的区域, 水印数量)
+        """
+        # 策略1 & 2：重复的文本和图片水印
+        matched_texts, matched_images = self._match_repeating_watermarks(
+            layout, repeating_text, repeating_images
+        )
+        if template is not None:
+            template_texts, template_images = self._match_template(doc, layout, template)
+            matched_texts += template_texts
+            matched_images += template_images
 
-        for area in feature_images:
-            page.add_redact_annot(area, fill=(1, 1, 1))
-            removed_count += 1
+        # 策略3：基于特征检测水印
+        feature_texts, feature_images = self._detect_feature_watermarks(layout)
 
         # 策略4：中心区域删除（激进，可选）
-        if use_center_removal:
-            center_items = self._remove_center_content(page)
-            for item in center_items:
-                rect = fitz.Rect(item)
-                page.add_redact_annot(rect, fill=(1, 1, 1))
-                removed_count += 1
-
-        # 应用所有删除操作
-        if removed_count > 0:
+        center_texts, center_images = (
+            self._remove_center_content(layout) if use_center_removal else ([], [])
+        )
+
+        # 各策略的结果可能重复或重叠，先去重
+        text_candidates = list(dict.fromkeys(
+            tuple(bbox) for bbox in matched_texts + feature_texts + center_texts
+        ))
+        image_candidates = list(dict.fromkeys(
+            tuple(area) for area in matched_images + feature_images + center_images
+        ))
+        if not text_candidates and not image_candidates:
+            return [], [], 0
+
+        # 未被任何策略选中的文本即正文
+        candidate_set = set(text_candidates)
+        body_bboxes = np.array(
+            [b for b in map(tuple, layout.span_bbox.tolist()) if b not in candidate_set],
+            dtype=np.float32
+        ).reshape(-1, 4)
+        body_index = GridIndex(body_bboxes, self.GRID_CELL_SIZE)
+
+        # 会截断正文的文本候选直接放弃；图片候选改为只删除图片、不动文本
+        text_candidates = [
+            bbox for bbox in text_candidates
+            if not body_index.clips(bbox, self.BODY_CLIP_TOLERANCE)
+        ]
+        image_only = [area for area in image_candidates if body_index.clips(area, 0)]
+        image_candidates = [area for area in image_candidates if not body_index.clips(area, 0)]
+
+        removed_count = len(text_candidates) + len(image_candidates) + len(image_only)
+
+        redactions = (
+            self._merge_redaction_rects(text_candidates, body_index)
+            + self._merge_redaction_rects(image_candidates, body_index)
+        )
+        return redactions, self._merge_redaction_rects(image_only, None), removed_count
+
+    def _merge_redaction_rects(
+        self,
+        rects: List[Tuple[float, float, float, float]],
+        body_index: Optional[GridIndex]
+    ) -> List[Tuple[float, float, float, float]]:
+        """合并相互重叠的删除区域。
+
+        合并后的外接矩形如果会截断正文，则保留该组原来的各个矩形。
+
+        Args:
+            rects: 删除区域
+            body_index: 正文文本的空间索引，None 表示不检查
+
+        Returns:
+            合并后的删除区域
+        """
+        if len(rects) < 2:
+            return list(rects)
+
+        index = GridIndex(np.array(rects, dtype=np.float32), self.GRID_CELL_SIZE)
+        merged = []
+        for cluster in index.clusters():
+            if len(cluster) == 1:
+                merged.append(rects[cluster[0]])
+                continue
+            bbox = union_bbox(index.bboxes[cluster])
+            if body_index is not None and body_index.clips(bbox, self.BODY_CLIP_TOLERANCE):
+                merged.extend(rects[i] for i in cluster)
+            else:
+                merged.append(bbox)
+        return merged
+
+    def _remove_structural_watermarks(
+        self,
+        doc: fitz.Document,
+        page_indices: Any,
+        whole_document: bool,
+        count_only: bool = False
+    ) -> int:
+        """直接在文档结构层面删除水印，不使用 redaction。
+
+        处理以下几类结构化水印：
+        1. /Watermark 注释，以及属于水印图层的注释：直接删除
+        2. 名称为 "Watermark"/"水印" 的可选内容组（OCG）：删除内容流中
+           `/OC /MCx BDC ... EMC` 序列；处理整个文档时同时关闭该图层
+        3. 标记为 Watermark（PieceInfo）或属于水印图层（/OC）的 Form XObject：
+           处理整个文档时清空该 XObject（每个共享资源只处理一次）；
+           只处理部分页面时删除这些页面（及其 Form XObject）中对它的 Do 引用
+        4. `/Artifact <</Subtype /Watermark>> BDC ... EMC` 标记内容：
+           从页面内容流以及（嵌套的）Form XObject 中删除
+
+        只处理部分页面时，不修改未选中页面也引用的流：共享的页面内容流
+        复制一份删除水印后改由选中页面引用，共享的 Form XObject 跳过。
+
+        Args:
+            doc: PyMuPDF文档
+            page_indices: 要处理的页面
+            whole_document: 是否处理整个文档（允许修改共享资源）
+            count_only: 只统计不修改文档（dry_run）
+
+        Returns:
+            删除（或可删除）的水印数量
+        """
+        watermark_ocgs = self._find_watermark_ocgs(doc)
+        removed = self._remove_annotation_watermarks(
+            doc, page_indices, watermark_ocgs, count_only
+        )
+
+        # 只处理部分页面时，未选中页面也引用的流不能原地修改
+        shared = set() if whole_document else self._streams_outside(doc, page_indices)
+        processed_streams = set()
+        # 与未选中页面共享的内容流 -> 删除水印后的副本 xref
+        copies: Dict[int, int] = {}
+        watermark_xobjects = set()
+        # 实际有内容被删除（或被关闭）的水印图层；未被引用的同名图层不计数
+        used_ocgs: Set[int] = set()
+
+        for page_num in page_indices:
+            page = doc[page_num]
+            # 调用者 xref（0 为页面本身）-> 要删除的水印 XObject 资源名
+            drop_names: Dict[int, Set[bytes]] = {}
+            forms = []
+
             try:
-                page.apply_redactions()
+                xobjects = page.get_xobjects()
+            except Exception:
+                xobjects = []
+
+            # get_xobjects 包含嵌套在 Form XObject 中的 XObject（invoker 为外层 Form）
+            for xref, name, invoker, _ in xobjects:
+                if self._is_watermark_xobject(doc, xref, watermark_ocgs):
+                    watermark_xobjects.add(xref)
+                    if self._ocg_reference(doc, xref) in watermark_ocgs:
+                        used_ocgs.add(self._ocg_reference(doc, xref))
+                    drop_names.setdefault(invoker, set()).add(name.encode())
+                elif (
+                    xref not in processed_streams and xref not in shared
+                    and doc.xref_get_key(xref, "Subtype")[1] == "/Form"
+                ):
+                    processed_streams.add(xref)
+                    forms.append(xref)
+
+            for xref in forms:
+                removed += self._filter_stream(
+                    doc, xref, set() if whole_document else drop_names.get(xref, set()),
+                    self._watermark_predicate(doc, xref, watermark_ocgs, used_ocgs),
+                    count_only
+                )
+
+            predicate = self._watermark_predicate(doc, page.xref, watermark_ocgs, used_ocgs)
+            page_drop = set() if whole_document else drop_names.get(0, set())
+            contents = page.get_contents()
+            for xref in contents:
+                if xref in shared:
+                    if xref not in copies:
+                        copies[xref], count = self._copy_filtered_stream(
+                            doc, xref, page_drop, predicate, count_only
+                        )
+                        removed += count
+                    continue
+                if xref in processed_streams:
+                    continue
+                processed_streams.add(xref)
+                removed += self._filter_stream(doc, xref, page_drop, predicate, count_only)
+
+            replaced = [copies.get(xref, xref) for xref in contents]
+            if replaced != contents:
+                doc.xref_set_key(
+                    page.xref, "Contents", "[" + " ".join(f"{x} 0 R" for x in replaced) + "]"
+                )
+
+        if whole_document:
+            removed += len(watermark_xobjects) + len(used_ocgs)
+            if count_only:
+                return removed
+
+            for xref in watermark_xobjects:
+                doc.update_stream(xref, b"")
+
+            # 关闭水印图层，覆盖未能从内容流中删除的部分
+            if watermark_ocgs:
+                try:
+                    doc.set_layer(-1, off=sorted(watermark_ocgs))
+                except Exception:
+                    pass
+
+        return removed
+
+    def _streams_outside(self, doc: fitz.Document, page_indices: Any) -> Set[int]:
+        """未选中页面引用的内容流和 Form XObject（含嵌套）xref。"""
+        streams = set()
+        for page_num in range(len(doc)):
+            if page_num in page_indices:
+                continue
+            page = doc[page_num]
+            streams.update(page.get_contents())
+            try:
+                streams.update(xref for xref, *_ in page.get_xobjects())
             except Exception:
                 pass
+        return streams
 
-        return removed_count
+    def _copy_filtered_stream(
+        self,
+        doc: fitz.Document,
+        xref: int,
+        drop_names: Set[bytes],
+        predicate: MarkedContentPredicate,
+        count_only: bool = False
+    ) -> Tuple[int, int]:
+        """删除共享内容流中的水印，结果写入新的流对象，原流保持不变。
+
+        Returns:
+            (供选中页面使用的流 xref, 删除数量)；没有删除内容时返回原 xref
+        """
+        try:
+            data = doc.xref_stream(xref)
+        except Exception:
+            return xref, 0
+        if not data:
+            return xref, 0
+
+        filtered, count = filter_content(data, predicate, drop_names)
+        if not count or count_only:
+            return xref, count
+
+        copy_xref = doc.get_new_xref()
+        doc.update_object(copy_xref, "<<>>")
+        doc.update_stream(copy_xref, filtered)
+        return copy_xref, count
+
+    def _find_watermark_ocgs(self, doc: fitz.Document) -> Set[int]:
+        """查找名称表明是水印的可选内容组（OCG）。"""
+        try:
+            ocgs = doc.get_ocgs()
+        except Exception:
+            return set()
+
+        return {
+            xref for xref, info in ocgs.items()
+            if re.search(r"watermark|水印", info.get("name") or "", re.IGNORECASE)
+        }
+
+    def _remove_annotation_watermarks(
+        self,
+        doc: fitz.Document,
+        page_indices: Any,
+        watermark_ocgs: Set[int],
+        count_only: bool = False
+    ) -> int:
+        """删除 /Watermark 注释和属于水印图层的注释。"""
+        removed = 0
+
+        for page_num in page_indices:
+            targets = self._watermark_annotations(doc, page_num, watermark_ocgs)
+            if not targets:
+                continue
+            if count_only:
+                removed += len(targets)
+                continue
+
+            page = doc[page_num]
+            for xref in targets:
+                try:
+                    page.delete_annot(page.load_annot(xref))
+                    removed += 1
+                except Exception:
+                    pass
+
+        return removed
+
+    def _watermark_annotations(
+        self,
+        doc: fitz.Document,
+        page_num: int,
+        watermark_ocgs: Set[int]
+    ) -> List[int]:
+        """单页上的 /Watermark 注释和属于水印图层的注释 xref。
+
+        只读取注释 xref 列表，不加载页面。
+        """
+        return [
+            xref for xref, annot_type, _ in doc.page_annot_xrefs(page_num)
+            if annot_type == fitz.PDF_ANNOT_WATERMARK
+            or (watermark_ocgs and self._ocg_reference(doc, xref) in watermark_ocgs)
+        ]
+
+    def _structural_regions(
+        self,
+        doc: fitz.Document,
+        page_indices: Any
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """定位结构化删除会去掉的水印（dry_run），不修改文档。
+
+        - annotation：注释的 Rect
+        - xobject / ocg：水印 XObject 在页面上的放置区域（嵌套时取最外层）
+        - artifact / ocg：内容流中标记内容的绘制区域；在单独打开的文档副本上
+          依次删除 Artifact 和水印图层序列，对比删除前后的 bboxlog 得到
+
+        Returns:
+            {页码(0起): [{"kind": ..., "bbox": [...]}]}
+        """
+        watermark_ocgs = self._find_watermark_ocgs(doc)
+        regions: Dict[int, List[Dict[str, Any]]] = {}
+
+        def add(page_num: int, kind: str, rect: fitz.Rect) -> None:
+            if rect.is_empty or rect.is_infinite:
+                return
+            bbox = [round(v, 2) for v in rect]
+            entry = {"kind": kind, "bbox": bbox}
+            if entry not in regions.setdefault(page_num, []):
+                regions[page_num].append(entry)
+
+        # 含水印标记内容的页面及其（非水印）内容流 / Form XObject
+        candidates: Dict[int, List[Tuple[int, int]]] = {}
+        for page_num in page_indices:
+            annots = self._watermark_annotations(doc, page_num, watermark_ocgs)
+            page = doc[page_num]
+            for xref in annots:
+                # 直接读取 /Rect（PDF 坐标），不加载注释
+                kind, value = doc.xref_get_key(xref, "Rect")
+                if kind == "array":
+                    coords = [float(v) for v in value.strip("[]").split()]
+                    add(page_num, "annotation", fitz.Rect(coords) * page.transformation_matrix)
+
+            try:
+                xobjects = page.get_xobjects()
+            except Exception:
+                xobjects = []
+            placements = {xref: (invoker, bbox) for xref, _, invoker, bbox in xobjects}
+            # (流 xref, 读取 /Properties 的对象 xref)：页面内容流用页面的资源
+            streams = [(xref, page.xref) for xref in page.get_contents()]
+            for xref, _, invoker, bbox in xobjects:
+                if self._is_watermark_xobject(doc, xref, watermark_ocgs):
+                    # 嵌套 XObject 的 bbox 在外层 Form 的坐标系中，取最外层的放置区域
+                    while invoker in placements and invoker != xref:
+                        invoker, bbox = placements[invoker]
+                    kind = "ocg" if self._ocg_reference(doc, xref) in watermark_ocgs else "xobject"
+                    add(page_num, kind, fitz.Rect(bbox) * page.transformation_matrix)
+                elif doc.xref_get_key(xref, "Subtype")[1] == "/Form":
+                    streams.append((xref, xref))
+
+            if any(
+                self._filter_stream(
+                    doc, xref, set(),
+                    self._watermark_predicate(doc, owner, watermark_ocgs), count_only=True
+                )
+                for xref, owner in streams
+            ):
+                candidates[page_num] = streams
+
+        if candidates and doc.name:
+            scratch = fitz.open(doc.name)
+            try:
+                self._locate_marked_content(scratch, candidates, watermark_ocgs, add)
+            finally:
+                scratch.close()
+
+        return regions
+
+    def _locate_marked_content(
+        self,
+        scratch: fitz.Document,
+        candidates: Dict[int, List[Tuple[int, int]]],
+        watermark_ocgs: Set[int],
+        add: Callable[[int, str, fitz.Rect], None]
+    ) -> None:
+        """在文档副本上删除标记内容，按 bboxlog 差异报告各页被删除的绘制区域。"""
+        def bboxlogs() -> Dict[int, Counter]:
+            return {
+                page_num: Counter(scratch[page_num].get_bboxlog())
+                for page_num in candidates
+            }
+
+        before = bboxlogs()
+        for kind in ("artifact", "ocg"):
+            filtered = set()
+            for page_num, streams in candidates.items():
+                for xref, owner in streams:
+                    if xref in filtered:
+                        continue
+                    filtered.add(xref)
+                    if kind == "artifact":
+                        predicate = is_watermark_artifact
+                    else:
+                        match = self._watermark_predicate(scratch, owner, watermark_ocgs)
+                        predicate = lambda tag, props: tag == b"/OC" and match(tag, props)
+                    self._filter_stream(scratch, xref, set(), predicate)
+
+            after = bboxlogs()
+            for page_num in candidates:
+                removed = before[page_num] - after[page_num]
+                if removed:
+                    rects = np.array([rect for _, rect in removed], dtype=np.float32)
+                    add(page_num, kind, fitz.Rect(union_bbox(rects)))
+            before = after
+
+    def _ocg_reference(self, doc: fitz.Document, xref: int) -> int:
+        """读取对象的 /OC 引用，没有时返回 0。"""
+        kind, value = doc.xref_get_key(xref, "OC")
+        return int(value.split()[0]) if kind == "xref" else 0
+
+    def _watermark_predicate(
+        self,
+        doc: fitz.Document,
+        xref: int,
+        watermark_ocgs: Set[int],
+        used_ocgs: Optional[Set[int]] = None
+    ) -> MarkedContentPredicate:
+        """构建内容流过滤条件：水印 Artifact，或引用水印图层的 /OC 序列。
+
+        Args:
+            doc: PyMuPDF文档
+            xref: 页面或 Form XObject 的 xref（用于读取 /Properties 资源）
+            watermark_ocgs: 水印图层 xref 集合
+            used_ocgs: 记录实际匹配到内容的水印图层
+        """
+        oc_names: Dict[bytes, int] = {}
+        if watermark_ocgs:
+            kind, value = doc.xref_get_key(xref, "Resources/Properties")
+            if kind == "xref":
+                value = doc.xref_object(int(value.split()[0]))
+            for name, ref in re.findall(r"/([^\s/<>\[\]()]+)\s*(\d+)\s+0\s+R", value or ""):
+                if int(ref) in watermark_ocgs:
+                    oc_names[b"/" + name.encode()] = int(ref)
+
+        def predicate(tag: bytes, props: Optional[bytes]) -> bool:
+            if tag == b"/OC":
+                ocg = oc_names.get(props)
+                if ocg is not None and used_ocgs is not None:
+                    used_ocgs.add(ocg)
+                return ocg is not None
+            return is_watermark_artifact(tag, props)
+
+        return predicate
+
+    def _is_watermark_xobject(
+        self,
+        doc: fitz.Document,
+        xref: int,
+        watermark_ocgs: Set[int]
+    ) -> bool:
+        """判断 Form XObject 是否被标记为水印或属于水印图层。"""
+        try:
+            if watermark_ocgs and self._ocg_reference(doc, xref) in watermark_ocgs:
+                return True
+            kind, value = doc.xref_get_key(xref, "PieceInfo")
+            if kind == "xref":
+                value = doc.xref_object(int(value.split()[0]))
+            return kind != "null" and "Watermark" in value
+        except Exception:
+            return False
+
+    def _filter_stream(
+        self,
+        doc: fitz.Document,
+        xref: int,
+        drop_names: Set[bytes],
+        predicate: MarkedContentPredicate = is_watermark_artifact,
+        count_only: bool = False
+    ) -> int:
+        """从单个内容流中删除水印标记内容和 XObject 引用。"""
+        try:
+            data = doc.xref_stream(xref)
+        except Exception:
+            return 0
+        if not data:
+            return 0
+
+        filtered, count = filter_content(data, predicate, drop_names)
+        if count and not count_only:
+            doc.update_stream(xref, filtered)
+        return count
 
     async def _remove_all_pages(
         self,
@@ -414,50 +1109,76 @@ class RemoveWatermarkProcessor(BaseProcessor):
         Returns:
             Output file ID
         """
-        doc = self.validate_pdf(file_path)
+        doc = self.open_document(file_path)
         total_pages = len(doc)
+        removal_method = options.get("removal_method", "auto")
 
-        # 阶段1：收集所有页面的内容签名
-        job_service.update_job(
-            job_id,
-            status="processing",
-            progress=5,
-            message="分析文档结构..."
-        )
-
-        signatures = self._collect_content_signatures(doc)
-
-        # 阶段2：检测重复的水印
-        job_service.update_job(
-            job_id,
-            progress=10,
-            message="检测水印..."
-        )
+        # 默认完整重写；显式指定 incremental 时在输出副本上修改
+        output_path = self.get_output_path(job_id, "cleaned.pdf")
+        save_mode = self.resolve_save_mode(options)
+        if save_mode == "incremental":
+            doc = self.open_output_document(file_path, output_path)
+
+        # 阶段0：只统计结构化水印，按统计结果决定是否需要 redaction
+        structural_found = 0
+        if removal_method in ("auto", "content"):
+            self.update_progress(job_id, 3, "检测结构化水印...")
+            structural_found = self._remove_structural_watermarks(
+                doc, range(total_pages), whole_document=True, count_only=True
+            )
 
-        repeating_text, repeating_images = self._detect_repeating_watermarks(
-            signatures, total_pages
-        )
+        repeating_text = repeating_images = np.empty(0, dtype=np.uint64)
+        sample: List[int] = []
+        use_redaction = self._use_redaction(removal_method, structural_found, options)
+
+        if use_redaction:
+            # 阶段1：同一文档内容的布局只解析一次（持久化缓存）；
+            # 必须在阶段2修改文档之前完整提取，缓存才能反映原始文档
+            self.update_progress(job_id, 5, "分析文档结构...")
+            analysis = DocumentAnalysis(doc, text_cache_service.document_key(file_path))
+            analysis.extract_all()
+
+        # 阶段2：直接从内容流删除结构化水印（共享 XObject / Artifact 标记）
+        structural_removed = 0
+        if removal_method in ("auto", "content"):
+            self.update_progress(job_id, 8, "删除结构化水印...")
+            structural_removed = self._remove_structural_watermarks(
+                doc, range(total_pages), whole_document=True
+            )
 
-        # 阶段3：逐页删除水印
-        for i in range(total_pages):
-            progress = int(15 + (i / total_pages) * 80)
-            self.update_progress(
+        if use_redaction:
+            # 阶段3：检测重复的水印（或直接使用模板）
+            job_service.update_job(
                 job_id,
-                progress,
-                f"处理第 {i + 1}/{total_pages} 页"
+                progress=10,
+                message="检测水印..."
             )
 
-            page = doc[i]
-            self._remove_watermarks_from_page(
-                page, i, repeating_text, repeating_images,
-                use_center_removal=False  # 设为True启用中心删除
+            repeating_text, repeating_images, template, sample = self._resolve_watermarks(
+                analysis, options
             )
 
+            # 阶段4：逐页确认并删除水印
+            for i in range(total_pages):
+                progress = int(15 + (i / total_pages) * 80)
+                self.update_progress(
+                    job_id,
+                    progress,
+                    f"处理第 {i + 1}/{total_pages} 页"
+                )
+
+                page = doc[i]
+                self._remove_watermarks_from_page(
+                    page, i, analysis.page(i), repeating_text, repeating_images,
+                    use_center_removal=False,  # 设为True启用中心删除
+                    template=template
+                )
+
         # 保存
         self.update_progress(job_id, 95, "保存文档...")
-        output_path = self.get_output_path(job_id, "cleaned.pdf")
-        doc.save(output_path, garbage=4, deflate=True, clean=True)
-        doc.close()
+        save_mode = self.save_document(
+            doc, output_path, save_mode, **self.get_save_options(options)
+        )
 
         # 完成
         file_size = output_path.stat().st_size
@@ -467,12 +1188,104 @@ class RemoveWatermarkProcessor(BaseProcessor):
             "size": file_size,
             "pages": total_pages,
             "detected_watermarks": len(repeating_text) + len(repeating_images),
+            "structural_watermarks": structural_removed,
+            "removal_method": "redact" if use_redaction else "content",
+            "save_mode": save_mode,
+            "sampled_pages": len(sample),
+            "template": options.get("template"),
+            "saved_template": options.get("save_template"),
             "download_url": f"/api/v1/files/download/{job_id}",
             "expires_at": (datetime.now() + timedelta(hours=settings.FILE_EXPIRE_HOURS)).isoformat()
         })
 
         return job_id
 
+    async def _detect_only(
+        self,
+        job_id: str,
+        file_path: Path,
+        options: Dict[str, Any]
+    ) -> str:
+        """Detect watermarks without modifying or saving the document.
+
+        Makes the same decisions as a cleanup: finds the structural
+        watermarks first, then (when the cleanup would redact) plans the
+        redactions. The job result lists, page by page, every region that
+        would be removed with its kind ("annotation", "artifact", "ocg",
+        "xobject" or "redact"). Never saves a template.
+
+        Args:
+            job_id: Job identifier
+            file_path: PDF file path
+            options: Removal options (same page selection as a cleanup)
+
+        Returns:
+            Job ID (no output file is written)
+        """
+        doc = self.open_document(file_path)
+        total_pages = len(doc)
+        page_indices = self._select_pages(options, total_pages)
+        whole_document = options.get("mode", "all") == "all"
+        removal_method = options.get("removal_method", "auto")
+
+        # 与实际清理相同：先统计结构化水印，再按同样的规则决定是否 redaction
+        structural_found = 0
+        # 页码(0起) -> 将被删除的区域
+        page_regions: Dict[int, List[Dict[str, Any]]] = {}
+        if removal_method in ("auto", "content"):
+            self.update_progress(job_id, 3, "检测结构化水印...")
+            structural_found = self._remove_structural_watermarks(
+                doc, page_indices, whole_document=whole_document, count_only=True
+            )
+            if structural_found:
+                page_regions = self._structural_regions(doc, page_indices)
+        use_redaction = self._use_redaction(removal_method, structural_found, options)
+
+        repeating_text = repeating_images = np.empty(0, dtype=np.uint64)
+        sample: List[int] = []
+        if use_redaction:
+            self.update_progress(job_id, 5, "分析文档结构...")
+            analysis = DocumentAnalysis(doc, text_cache_service.document_key(file_path))
+            if page_indices.is_all:
+                analysis.extract_all()
+            repeating_text, repeating_images, template, sample = self._resolve_watermarks(
+                analysis, options
+            )
+
+            for idx, i in enumerate(page_indices):
+                progress = int(10 + (idx / len(page_indices)) * 80)
+                self.update_progress(job_id, progress, f"检测第 {i + 1}/{total_pages} 页")
+
+                redactions, image_only, _ = self._plan_page_redactions(
+                    doc, analysis.page(i), repeating_text, repeating_images,
+                    template=template
+                )
+                page_regions.setdefault(i, []).extend(
+                    {"kind": "redact", "bbox": [round(v, 2) for v in rect], "image_only": flag}
+                    for rects, flag in ((redactions, False), (image_only, True))
+                    for rect in rects
+                )
+
+        regions = [
+            {"page": i + 1, "regions": page_regions[i]}
+            for i in sorted(page_regions) if page_regions[i]
+        ]
+
+        job_service.complete_job(job_id, {
+            "dry_run": True,
+            "pages": total_pages,
+            "checked_pages": len(page_indices),
+            "watermarked_pages": len(regions),
+            "detected_watermarks": len(repeating_text) + len(repeating_images),
+            "structural_watermarks": structural_found,
+            "removal_method": "redact" if use_redaction else "content",
+            "sampled_pages": len(sample),
+            "template": options.get("template"),
+            "regions": regions,
+        })
+
+        return job_id
+
     async def _remove_selected_pages(
         self,
         job_id: str,
@@ -489,47 +1302,58 @@ class RemoveWatermarkProcessor(BaseProcessor):
         Returns:
             Output file ID
         """
-        doc = self.validate_pdf(file_path)
+        doc = self.open_document(file_path)
         total_pages = len(doc)
 
         # 获取要处理的页面
-        if options.get("mode") == "range":
-            ranges_str = options.get("ranges", "")
-            page_indices = self._parse_ranges(ranges_str, total_pages)
-        elif options.get("mode") == "every":
-            every_n = int(options.get("every_n", 2))
-            page_indices = [i for i in range(total_pages) if (i + 1) % every_n == 0]
-        else:  # single page
-            page_num = int(options.get("page", 1))
-            page_indices = [page_num - 1] if 0 < page_num - 1 < total_pages else []
+        page_indices = self._select_pages(options, total_pages)
 
-        if not page_indices:
-            raise ValueError("没有选择有效的页面")
+        # 默认完整重写；显式指定 incremental 时在输出副本上修改，只追加变化的对象
+        output_path = self.get_output_path(job_id, "cleaned.pdf")
+        save_mode = self.resolve_save_mode(options)
+        if save_mode == "incremental":
+            doc = self.open_output_document(file_path, output_path)
+
+        removal_method = options.get("removal_method", "auto")
+
+        # 直接从选中页面的内容流删除结构化水印（不修改与其他页面共享的资源）
+        structural_removed = 0
+        if removal_method in ("auto", "content"):
+            job_service.update_job(job_id, status="processing", progress=3, message="删除结构化水印...")
+            structural_removed = self._remove_structural_watermarks(
+                doc, page_indices, whole_document=False
+            )
 
-        # 收集签名
-        job_service.update_job(job_id, status="processing", progress=5, message="分析文档...")
-        signatures = self._collect_content_signatures(doc)
-        repeating_text, repeating_images = self._detect_repeating_watermarks(signatures, total_pages)
+        sample: List[int] = []
+        use_redaction = self._use_redaction(removal_method, structural_removed, options)
 
-        # 处理选中的页面
-        processed_count = 0
-        for i in range(total_pages):
-            progress = int(15 + (i / total_pages) * 80)
-            self.update_progress(job_id, progress, f"处理第 {i + 1}/{total_pages} 页")
+        if use_redaction:
+            # 在采样页上收集签名并检测重复水印
+            job_service.update_job(job_id, status="processing", progress=5, message="分析文档...")
+            # 只处理部分页面时不写缓存，但可以使用已有的缓存
+            analysis = DocumentAnalysis(doc, text_cache_service.document_key(file_path))
+            repeating_text, repeating_images, template, sample = self._resolve_watermarks(
+                analysis, options
+            )
+
+            # 只处理选中的页面（逐页确认重复水印）
+            for idx, i in enumerate(page_indices):
+                progress = int(15 + (idx / len(page_indices)) * 80)
+                self.update_progress(job_id, progress, f"处理第 {i + 1}/{total_pages} 页")
 
-            if i in page_indices:
-                processed_count += 1
                 page = doc[i]
                 self._remove_watermarks_from_page(
-                    page, i, repeating_text, repeating_images,
-                    use_center_removal=False
+                    page, i, analysis.page(i), repeating_text, repeating_images,
+                    use_center_removal=False,
+                    template=template
                 )
+        processed_count = len(page_indices)
 
         # 保存
         self.update_progress(job_id, 95, "保存文档...")
-        output_path = self.get_output_path(job_id, "cleaned.pdf")
-        doc.save(output_path, garbage=4, deflate=True, clean=True)
-        doc.close()
+        save_mode = self.save_document(
+            doc, output_path, save_mode, **self.get_save_options(options)
+        )
 
         # 完成
         file_size = output_path.stat().st_size
@@ -539,41 +1363,26 @@ class RemoveWatermarkProcessor(BaseProcessor):
             "size": file_size,
             "pages": total_pages,
             "cleaned_pages": processed_count,
+            "structural_watermarks": structural_removed,
+            "removal_method": "redact" if use_redaction else "content",
+            "save_mode": save_mode,
+            "sampled_pages": len(sample),
+            "template": options.get("template"),
+            "saved_template": options.get("save_template"),
             "download_url": f"/api/v1/files/download/{job_id}",
             "expires_at": (datetime.now() + timedelta(hours=settings.FILE_EXPIRE_HOURS)).isoformat()
         })
 
         return job_id
 
-    def _parse_ranges(self, ranges_str: str, total_pages: int) -> list[int]:
-        """Parse page ranges string into list of page indices.
-
-        Args:
-            ranges_str: Ranges string (e.g., "1-3, 5, 7-9")
-            total_pages: Total number of pages
+    def _select_pages(self, options: Dict[str, Any], total_pages: int) -> PageSelection:
+        """根据 mode 选项确定要处理的页面。
 
-        Returns:
-            List of page indices (0-based)
+        Raises:
+            ValueError: 没有选择有效的页面
         """
-        indices = set()
-
-        for part in ranges_str.split(','):
-            part = part.strip()
-            if not part:
-                continue
-
-            if '-' in part:
-                if '--' in part:
-                    start = int(part.split('--')[0]) - 1
-                    indices.update(range(start, total_pages))
-                else:
-                    start, end = part.split('-')
-                    start = int(start) - 1
-                    end = int(end) - 1
-                    indices.update(range(max(0, start), min(total_pages, end + 1)))
-            else:
-                page = int(part) - 1
-                if 0 <= page < total_pages:
-                    indices.add(page)
+        page_indices = PageSelection.from_options(options, total_pages)
+        if not page_indices:
+            raise ValueError("没有选择有效的页面")
 
-        return sorted(indices)
+        return page_indices
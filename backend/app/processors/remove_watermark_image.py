@@ -11,15 +11,19 @@ r"""PDF watermark removal using improved image processing algorithm with text pr
 - Canny Edge Detection: https://docs.opencv.org/3.4/da/d22/tutorial_py_canny.html
 """
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
+import base64
 import io
+import time
 import cv2
 import numpy as np
 import fitz
 from PIL import Image
 from app.processors.base import BaseProcessor
+from app.processors.page_selection import PageSelection
 from app.processors.registry import registry
+from app.processors.spatial_index import GridIndex, union_bbox
 from app.core.config import settings
 from app.services.job_service import job_service
 
@@ -28,6 +32,22 @@ from app.services.job_service import job_service
 class RemoveWatermarkImageProcessor(BaseProcessor):
     """Processor for removing watermarks using improved algorithm with text protection."""
 
+    # 预览默认使用低 DPI，保证参数调试的响应速度
+    PREVIEW_DPI = 72
+    PREVIEW_MAX_DPI = 150
+
+    # 未指定 watermark_color 时的默认值（颜色估计失败时回退）
+    DEFAULT_WATERMARK_COLOR = [200, 200, 200]
+    DEFAULT_TOLERANCE = 30
+
+    # 水印颜色估计：采样页数、渲染 DPI
+    ESTIMATE_SAMPLE_PAGES = 5
+    ESTIMATE_DPI = 50
+
+    # dry_run：检测渲染 DPI、忽略的最小区域面积（pt²）
+    DRY_RUN_DPI = 72
+    DRY_RUN_MIN_AREA = 16
+
     async def process(
         self,
         job_id: str,
@@ -43,32 +63,50 @@ class RemoveWatermarkImageProcessor(BaseProcessor):
 
         file_path = files[0]
 
-        watermark_color = options.get("watermark_color", [200, 200, 200])
-        tolerance = options.get("tolerance", 30)
+        watermark_color = options.get("watermark_color")
+        tolerance = options.get("tolerance")
         background_color = options.get("background_color", [255, 255, 255])
         mode = options.get("mode", "all")
         dpi = options.get("dpi", 200)
         use_inpaint = options.get("use_inpaint", True)
         protect_text = options.get("protect_text", True)  # 新增：是否保护文字
 
-        doc = self.validate_pdf(file_path)
+        doc = self.open_document(file_path)
         total_pages = len(doc)
 
-        if mode == "all":
-            page_indices = list(range(total_pages))
-        elif mode == "range":
-            ranges_str = options.get("ranges", "")
-            page_indices = self._parse_ranges(ranges_str, total_pages)
-        elif mode == "every":
-            every_n = int(options.get("every_n", 2))
-            page_indices = [i for i in range(total_pages) if (i + 1) % every_n == 0]
-        else:
-            page_num = int(options.get("page", 1))
-            page_indices = [page_num - 1] if 0 < page_num - 1 < total_pages else []
+        page_indices = PageSelection.from_options(options, total_pages)
 
         if not page_indices:
             raise ValueError("没有选择有效的页面")
 
+        # 未指定水印颜色时，先用低 DPI 采样估计颜色和容差
+        color_estimated = False
+        if self._is_auto_color(watermark_color):
+            self.update_progress(job_id, 5, "估计水印颜色...")
+            watermark_color, tolerance = self._resolve_watermark_color(
+                doc, page_indices, tolerance
+            )
+            color_estimated = True
+        elif tolerance is None:
+            tolerance = self.DEFAULT_TOLERANCE
+
+        if options.get("dry_run"):
+            regions = self._detect_regions(
+                doc, page_indices, watermark_color, tolerance, protect_text, job_id
+            )
+
+            job_service.complete_job(job_id, {
+                "dry_run": True,
+                "pages": total_pages,
+                "checked_pages": len(page_indices),
+                "watermarked_pages": len(regions),
+                "watermark_color": [int(c) for c in watermark_color],
+                "tolerance": int(tolerance),
+                "color_estimated": color_estimated,
+                "regions": regions,
+            })
+            return job_id
+
         self.update_progress(job_id, 10, "渲染PDF为图片...")
         all_images = self._render_pdf_to_images(
             doc, dpi, page_indices, job_id
@@ -100,15 +138,19 @@ class RemoveWatermarkImageProcessor(BaseProcessor):
         self.update_progress(job_id, 80, "重建PDF...")
         output_path = self.get_output_path(job_id, "cleaned.pdf")
 
+        save_mode = None
         if mode != "all":
-            self._rebuild_pdf_with_selected_pages(
-                doc, processed_images, page_indices, output_path
+            # 只替换选中的页面；显式指定 incremental 时在输出副本上替换并增量保存
+            save_mode = self.resolve_save_mode(options)
+            if save_mode == "incremental":
+                doc = self.open_output_document(file_path, output_path)
+            self._replace_pages_with_images(doc, processed_images, page_indices)
+            save_mode = self.save_document(
+                doc, output_path, save_mode, **self.get_save_options(options)
             )
         else:
             self._rebuild_pdf_from_images(processed_images, output_path)
 
-        doc.close()
-
         file_size = output_path.stat().st_size
         job_service.complete_job(job_id, {
             "output_file_id": job_id,
@@ -116,12 +158,276 @@ class RemoveWatermarkImageProcessor(BaseProcessor):
             "size": file_size,
             "pages": total_pages,
             "processed_pages": len(page_indices),
+            "watermark_color": [int(c) for c in watermark_color],
+            "tolerance": int(tolerance),
+            "color_estimated": color_estimated,
+            "save_mode": save_mode or "rewrite",
             "download_url": f"/api/v1/files/download/{job_id}",
             "expires_at": (datetime.now() + timedelta(hours=settings.FILE_EXPIRE_HOURS)).isoformat()
         })
 
         return job_id
 
+    def preview(self, file_path: Path, options: Dict[str, Any]) -> Dict[str, Any]:
+        """同步预览单页去水印效果（低 DPI，不创建任务）。
+
+        用于调试 watermark_color / tolerance / protect_text 参数：
+        只渲染一页，返回处理后的图片和水印 mask 叠加图。
+        打开的文档由调用者通过 close_session() 关闭。
+
+        Args:
+            file_path: PDF file path
+            options: Removal options plus page (1-based) and dpi
+
+        Returns:
+            Preview data with base64 PNG images
+
+        Raises:
+            ValueError: Invalid page number
+        """
+        started = time.perf_counter()
+
+        watermark_color = options.get("watermark_color")
+        tolerance = options.get("tolerance")
+        background_color = options.get("background_color", [255, 255, 255])
+        use_inpaint = options.get("use_inpaint", True)
+        protect_text = options.get("protect_text", True)
+        dpi = min(max(int(options.get("dpi", self.PREVIEW_DPI)), 36), self.PREVIEW_MAX_DPI)
+        page_num = int(options.get("page", 1))
+
+        doc = self.open_document(file_path)
+        total_pages = len(doc)
+        if not 0 < page_num <= total_pages:
+            raise ValueError(f"Page {page_num} does not exist (PDF has {total_pages} pages)")
+
+        color_estimated = self._is_auto_color(watermark_color)
+        if color_estimated:
+            watermark_color, tolerance = self._resolve_watermark_color(
+                doc, [page_num - 1], tolerance
+            )
+        elif tolerance is None:
+            tolerance = self.DEFAULT_TOLERANCE
+
+        img = self._render_page(doc[page_num - 1], dpi)
+
+        # mask 只构建一次，同时用于修复和叠加图
+        if use_inpaint:
+            mask = self._build_removal_mask(img, watermark_color, tolerance, protect_text)
+            processed = self._apply_removal_mask(img, mask, background_color)
+        else:
+            mask = self._create_watermark_mask(img, watermark_color, tolerance)
+            processed = (
+                self._flood_fill_background(img, mask, background_color)
+                if np.any(mask) else img.copy()
+            )
+
+        if mask is None:
+            mask = np.zeros(img.shape[:2], dtype=np.uint8)
+
+        # 叠加图：水印 mask 区域以半透明红色标出
+        overlay = img.copy()
+        tinted = cv2.addWeighted(img, 0.4, np.full_like(img, (0, 0, 255)), 0.6, 0)
+        overlay[mask > 0] = tinted[mask > 0]
+
+        mask_pixels = int(np.count_nonzero(mask))
+        return {
+            "page": page_num,
+            "pages": total_pages,
+            "dpi": dpi,
+            "width": int(img.shape[1]),
+            "height": int(img.shape[0]),
+            "mask_pixels": mask_pixels,
+            "mask_ratio": round(mask_pixels / (img.shape[0] * img.shape[1]), 4),
+            "watermark_color": [int(c) for c in watermark_color],
+            "tolerance": int(tolerance),
+            "color_estimated": color_estimated,
+            "image": self._encode_png(processed),
+            "mask_overlay": self._encode_png(overlay),
+            "elapsed_ms": int((time.perf_counter() - started) * 1000),
+        }
+
+    def _detect_regions(
+        self,
+        doc: fitz.Document,
+        page_indices: List[int],
+        watermark_color: List[int],
+        tolerance: int,
+        protect_text: bool,
+        job_id: str
+    ) -> List[Dict[str, Any]]:
+        """只检测水印区域（dry_run），不做修复和重建。
+
+        以低 DPI 渲染页面并构建水印 mask，对 mask 做连通域分析，
+        合并外接矩形重叠的连通域后换算为 PDF 坐标。
+
+        Returns:
+            [{"page": 页码(1起), "regions": [{"bbox": [...], "pixels": n}]}]
+        """
+        dpi = self.DRY_RUN_DPI
+        scale = 72 / dpi
+        min_pixels = self.DRY_RUN_MIN_AREA / (scale * scale)
+        # 膨胀 mask，把同一水印的笔画合并为一个区域
+        kernel = np.ones((5, 5), np.uint8)
+
+        results = []
+        for idx, page_num in enumerate(page_indices):
+            progress = int(10 + (idx / len(page_indices)) * 85)
+            self.update_progress(job_id, progress, f"检测第 {page_num + 1} 页...")
+
+            img = self._render_page(doc[page_num], dpi)
+            mask = self._build_removal_mask(img, watermark_color, tolerance, protect_text)
+            if mask is None:
+                continue
+
+            grouped = cv2.dilate(mask, kernel)
+            num_labels, labels, stats, _ = cv2.connectedComponentsWithStats(grouped, connectivity=8)
+
+            boxes, pixel_counts = [], []
+            for label in range(1, num_labels):
+                x, y, w, h, _ = stats[label].tolist()
+                # 以原始 mask 像素数过滤噪点
+                component = labels[y:y + h, x:x + w] == label
+                pixels = int(np.count_nonzero(mask[y:y + h, x:x + w][component]))
+                if pixels >= min_pixels:
+                    boxes.append((x, y, x + w, y + h))
+                    pixel_counts.append(pixels)
+
+            # 外接矩形相互重叠的连通域（如斜排水印的各个字符）合并为一个区域
+            regions = []
+            if boxes:
+                index = GridIndex(np.array(boxes, dtype=np.float32), cell_size=dpi)
+                for cluster in index.clusters():
+                    x0, y0, x1, y1 = union_bbox(index.bboxes[cluster])
+                    regions.append({
+                        "bbox": [
+                            round(x0 * scale, 2), round(y0 * scale, 2),
+                            round(x1 * scale, 2), round(y1 * scale, 2),
+                        ],
+                        "pixels": sum(pixel_counts[i] for i in cluster),
+                    })
+
+            if regions:
+                results.append({"page": page_num + 1, "regions": regions})
+
+        return results
+
+    def _is_auto_color(self, watermark_color: Any) -> bool:
+        """判断是否需要自动估计水印颜色（未设置或设置为 "auto"）。"""
+        return watermark_color is None or watermark_color == "auto"
+
+    def _resolve_watermark_color(
+        self,
+        doc: fitz.Document,
+        page_indices: List[int],
+        tolerance: Optional[int]
+    ) -> tuple[List[int], int]:
+        """估计水印颜色（失败时回退默认值）；用户显式指定的容差优先。"""
+        estimate = self._estimate_watermark_color(doc, page_indices)
+        if estimate is None:
+            color = self.DEFAULT_WATERMARK_COLOR
+            estimated_tolerance = self.DEFAULT_TOLERANCE
+        else:
+            color, estimated_tolerance = estimate
+
+        return color, tolerance if tolerance is not None else estimated_tolerance
+
+    def _estimate_watermark_color(
+        self,
+        doc: fitz.Document,
+        page_indices: List[int]
+    ) -> Optional[tuple[List[int], int]]:
+        """从低 DPI 采样页估计水印颜色和容差。
+
+        策略：
+        1. 在所选页面中均匀采样若干页，以低 DPI 渲染
+        2. 排除背景色（页面主色）和文字（深色）像素
+        3. 对剩余像素做量化颜色直方图
+        4. 选择在多数采样页中重复出现、总量最大的颜色
+
+        Returns:
+            (RGB 颜色, 容差)；未找到候选颜色时返回 None
+        """
+        sample_count = min(self.ESTIMATE_SAMPLE_PAGES, len(page_indices))
+        if sample_count == 0:
+            return None
+        positions = np.linspace(0, len(page_indices) - 1, sample_count).round().astype(int)
+        samples = [page_indices[i] for i in sorted(set(positions.tolist()))]
+
+        histograms = []
+        page_sizes = []
+        candidates = []
+        for page_num in samples:
+            pixels = self._render_page(doc[page_num], self.ESTIMATE_DPI).reshape(-1, 3)
+            page_sizes.append(len(pixels))
+            pixels = self._filter_watermark_candidates(pixels)
+            candidates.append(pixels)
+
+            # 16 级量化后的 BGR 颜色直方图（4096 个桶）
+            bins = (
+                (pixels[:, 0].astype(np.int32) >> 4) << 8
+                | (pixels[:, 1].astype(np.int32) >> 4) << 4
+                | (pixels[:, 2].astype(np.int32) >> 4)
+            )
+            histograms.append(np.bincount(bins, minlength=4096))
+
+        histograms = np.vstack(histograms)
+        page_sizes = np.array(page_sizes)[:, None]
+
+        # 只考虑在至少一半采样页中都占到 0.1% 以上像素的颜色
+        min_pages = (len(samples) + 1) // 2
+        present = histograms >= page_sizes * 0.001
+        recurring = present.sum(axis=0) >= min_pages
+        scores = np.where(recurring, histograms.sum(axis=0), 0)
+        if scores.max() <= 0:
+            return None
+
+        best = int(scores.argmax())
+        bin_bgr = np.array([best >> 8, (best >> 4) & 0xF, best & 0xF]) << 4
+
+        # 以该桶为中心，统计邻近像素的均值和离散度
+        pixels = np.vstack(candidates).astype(np.int16)
+        near = np.abs(pixels - (bin_bgr + 8)).max(axis=1) <= 24
+        matched = pixels[near]
+        mean_bgr = matched.mean(axis=0)
+        spread = float(matched.std(axis=0).max())
+        tolerance = int(np.clip(round(spread * 2.5) + 10, 15, 60))
+
+        b, g, r = (int(round(c)) for c in mean_bgr)
+        return [r, g, b], tolerance
+
+    def _filter_watermark_candidates(self, pixels: np.ndarray) -> np.ndarray:
+        """去掉背景像素和文字像素，保留可能属于水印的像素。
+
+        Args:
+            pixels: N x 3 BGR 像素
+
+        Returns:
+            候选像素
+        """
+        # 背景：页面中出现最多的量化颜色
+        quantized = (pixels >> 3).astype(np.int32)
+        keys = quantized[:, 0] << 10 | quantized[:, 1] << 5 | quantized[:, 2]
+        background_key = int(np.bincount(keys).argmax())
+        background = np.array(
+            [background_key >> 10, (background_key >> 5) & 0x1F, background_key & 0x1F]
+        ) << 3
+
+        signed = pixels.astype(np.int16)
+        not_background = np.abs(signed - (background + 4)).max(axis=1) > 16
+
+        # 文字：亮度很低的深色像素
+        luminance = 0.114 * signed[:, 0] + 0.587 * signed[:, 1] + 0.299 * signed[:, 2]
+        not_text = luminance > 110
+
+        return pixels[not_background & not_text]
+
+    def _encode_png(self, img: np.ndarray) -> str:
+        """将 BGR 图片编码为 PNG data URL。"""
+        ok, buffer = cv2.imencode(".png", img)
+        if not ok:
+            raise ValueError("Failed to encode preview image")
+        return "data:image/png;base64," + base64.b64encode(buffer.tobytes()).decode("ascii")
+
     def _render_pdf_to_images(
         self,
         doc: fitz.Document,
@@ -137,30 +443,32 @@ class RemoveWatermarkImageProcessor(BaseProcessor):
             progress = int(10 + (idx / total) * 25)
             self.update_progress(job_id, progress, f"渲染第 {page_num + 1} 页...")
 
-            page = doc[page_num]
-            mat = fitz.Matrix(dpi / 72, dpi / 72)
+            images.append(self._render_page(doc[page_num], dpi))
 
-            try:
-                pix = page.get_pixmap(matrix=mat, alpha=False)
-                img_bytes = pix.tobytes("ppm")
-                img_array = cv2.imdecode(
-                    np.frombuffer(img_bytes, np.uint8),
-                    cv2.IMREAD_COLOR
-                )
+        return images
 
-                if img_array is None:
-                    img_pil = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-                    img_array = cv2.cvtColor(np.array(img_pil), cv2.COLOR_RGB2BGR)
+    def _render_page(self, page: fitz.Page, dpi: int) -> np.ndarray:
+        """渲染单个页面为 OpenCV BGR 图片。"""
+        mat = fitz.Matrix(dpi / 72, dpi / 72)
 
-                images.append(img_array)
+        try:
+            pix = page.get_pixmap(matrix=mat, alpha=False)
+            img_bytes = pix.tobytes("ppm")
+            img_array = cv2.imdecode(
+                np.frombuffer(img_bytes, np.uint8),
+                cv2.IMREAD_COLOR
+            )
 
-            except Exception:
-                height = int(11 * dpi)
-                width = int(8.5 * dpi)
-                blank_img = np.ones((height, width, 3), dtype=np.uint8) * 255
-                images.append(blank_img)
+            if img_array is None:
+                img_pil = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+                img_array = cv2.cvtColor(np.array(img_pil), cv2.COLOR_RGB2BGR)
 
-        return images
+            return img_array
+
+        except Exception:
+            height = int(11 * dpi)
+            width = int(8.5 * dpi)
+            return np.ones((height, width, 3), dtype=np.uint8) * 255
 
     def _detect_text_edges(
         self,
@@ -346,24 +654,19 @@ class RemoveWatermarkImageProcessor(BaseProcessor):
 
         return self._flood_fill_background(img, mask, background_color)
 
-    def _remove_watermark_smart(
+    def _build_removal_mask(
         self,
         img: np.ndarray,
         watermark_color: List[int],
         tolerance: int,
-        background_color: List[int],
         protect_text: bool = True
-    ) -> np.ndarray:
-        """智能模式：结合简单填充和智能修复，保护文字边缘。
+    ) -> Optional[np.ndarray]:
+        """构建最终要处理的水印 mask（智能模式与预览共用）。
 
-        策略：
-        1. 创建精确的水印 mask
-        2. 如果启用文字保护，检测并排除文字边缘区域
-        3. 对于大面积连续区域，使用背景色填充
-        4. 对于小面积和边缘区域，使用 inpainting
+        Returns:
+            水印 mask；没有可处理区域时返回 None
         """
         import sys
-        print(f"[DEBUG] Using smart inpainting mode (text protection: {protect_text})", file=sys.stderr)
 
         # 创建水印 mask
         watermark_mask = self._create_watermark_mask(img, watermark_color, tolerance)
@@ -373,29 +676,71 @@ class RemoveWatermarkImageProcessor(BaseProcessor):
         print(f"[DEBUG] Initial watermark mask: {mask_pixels} pixels ({100*mask_pixels/total_pixels:.2f}%)", file=sys.stderr)
 
         if mask_pixels == 0:
-            return img.copy()
+            return None
 
-        # 文字边缘保护
-        if protect_text:
-            # 检测文字边缘
-            text_edge_mask = self._detect_text_edges(img, threshold1=30, threshold2=100)
+        if not protect_text:
+            return watermark_mask
 
-            edge_pixels = np.sum(text_edge_mask > 0)
-            print(f"[DEBUG] Text edge mask: {edge_pixels} pixels ({100*edge_pixels/total_pixels:.2f}%)", file=sys.stderr)
+        # 文字边缘保护：检测文字边缘
+        text_edge_mask = self._detect_text_edges(img, threshold1=30, threshold2=100)
 
-            # 创建安全的 mask（排除文字边缘）
-            safe_mask = self._create_safe_mask(watermark_mask, text_edge_mask, min_region_size=50)
+        edge_pixels = np.sum(text_edge_mask > 0)
+        print(f"[DEBUG] Text edge mask: {edge_pixels} pixels ({100*edge_pixels/total_pixels:.2f}%)", file=sys.stderr)
 
-            safe_pixels = np.sum(safe_mask > 0)
-            print(f"[DEBUG] Safe mask after text protection: {safe_pixels} pixels ({100*safe_pixels/total_pixels:.2f}%)", file=sys.stderr)
+        # 创建安全的 mask（排除文字边缘）
+        safe_mask = self._create_safe_mask(watermark_mask, text_edge_mask, min_region_size=50)
 
-            if safe_pixels == 0:
-                print(f"[DEBUG] No safe regions to process, returning original", file=sys.stderr)
-                return img.copy()
+        safe_pixels = np.sum(safe_mask > 0)
+        print(f"[DEBUG] Safe mask after text protection: {safe_pixels} pixels ({100*safe_pixels/total_pixels:.2f}%)", file=sys.stderr)
 
-            working_mask = safe_mask
-        else:
-            working_mask = watermark_mask
+        if safe_pixels == 0:
+            print(f"[DEBUG] No safe regions to process, returning original", file=sys.stderr)
+            return None
+
+        return safe_mask
+
+    def _remove_watermark_smart(
+        self,
+        img: np.ndarray,
+        watermark_color: List[int],
+        tolerance: int,
+        background_color: List[int],
+        protect_text: bool = True
+    ) -> np.ndarray:
+        """智能模式：结合简单填充和智能修复，保护文字边缘。
+
+        策略：
+        1. 创建精确的水印 mask
+        2. 如果启用文字保护，检测并排除文字边缘区域
+        3. 对于大面积连续区域，使用背景色填充
+        4. 对于小面积和边缘区域，使用 inpainting
+        """
+        import sys
+        print(f"[DEBUG] Using smart inpainting mode (text protection: {protect_text})", file=sys.stderr)
+
+        working_mask = self._build_removal_mask(img, watermark_color, tolerance, protect_text)
+        return self._apply_removal_mask(img, working_mask, background_color)
+
+    def _apply_removal_mask(
+        self,
+        img: np.ndarray,
+        working_mask: Optional[np.ndarray],
+        background_color: List[int]
+    ) -> np.ndarray:
+        """按已构建的水印 mask 填充图片（见 _build_removal_mask）。
+
+        Args:
+            img: OpenCV BGR 图像
+            working_mask: 水印 mask；None 表示没有可处理区域
+            background_color: 单一区域时使用的填充色
+
+        Returns:
+            处理后的图片
+        """
+        import sys
+
+        if working_mask is None:
+            return img.copy()
 
         # 计算连通区域统计
         num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(
@@ -431,57 +776,21 @@ class RemoveWatermarkImageProcessor(BaseProcessor):
             quality=95
         )
 
-    def _rebuild_pdf_with_selected_pages(
+    def _replace_pages_with_images(
         self,
         doc: fitz.Document,
         processed_images: List[np.ndarray],
-        page_indices: List[int],
-        output_path: Path
+        page_indices: List[int]
     ) -> None:
-        """重建PDF，只替换指定的页面。"""
-        output_doc = fitz.open()
-        img_map = {page_idx: img for page_idx, img in zip(page_indices, processed_images)}
-
-        for page_num in range(len(doc)):
-            if page_num in img_map:
-                img = img_map[page_num]
-                img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                pil_img = Image.fromarray(img_rgb)
-
-                img_bytes = io.BytesIO()
-                pil_img.save(img_bytes, format="PNG")
-                img_bytes.seek(0)
-
-                img_doc = fitz.open(stream=img_bytes.read(), filetype="png")
-                output_doc.insert_pdf(img_doc)
-                img_doc.close()
-            else:
-                output_doc.insert_pdf(doc, from_page=page_num, to_page=page_num)
-
-        output_doc.save(str(output_path), garbage=4, deflate=True)
-        output_doc.close()
-
-    def _parse_ranges(self, ranges_str: str, total_pages: int) -> list[int]:
-        """解析页面范围字符串。"""
-        indices = set()
-
-        for part in ranges_str.split(','):
-            part = part.strip()
-            if not part:
-                continue
-
-            if '-' in part:
-                if '--' in part:
-                    start = int(part.split('--')[0]) - 1
-                    indices.update(range(start, total_pages))
-                else:
-                    start, end = part.split('-')
-                    start = int(start) - 1
-                    end = int(end) - 1
-                    indices.update(range(max(0, start), min(total_pages, end + 1)))
-            else:
-                page = int(part) - 1
-                if 0 <= page < total_pages:
-                    indices.add(page)
-
-        return sorted(indices)
+        """在原文档中原地替换指定页面为处理后的图片，其余页面不变。"""
+        for page_num, img in zip(page_indices, processed_images):
+            rect = doc[page_num].rect
+
+            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            img_bytes = io.BytesIO()
+            Image.fromarray(img_rgb).save(img_bytes, format="PNG")
+
+            # 渲染结果已包含页面旋转，新页面使用渲染时的可见尺寸
+            doc.delete_page(page_num)
+            page = doc.new_page(page_num, width=rect.width, height=rect.height)
+            page.insert_image(page.rect, stream=img_bytes.getvalue())
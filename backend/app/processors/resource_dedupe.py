@@ -0,0 +1,109 @@
+"""Cross-document resource deduplication for merged PDFs.
+
+Documents exported from the same system embed identical fonts, images
+and ICC profiles; insert_pdf copies each of them once per input. This
+module hashes those objects, points every reference at one canonical
+copy, and leaves the duplicates unreferenced for the save's garbage
+collection to drop.
+"""
+import hashlib
+import re
+from typing import Dict, Optional, Tuple
+
+import fitz
+
+# Indirect reference "N 0 R" (objects copied by insert_pdf are generation 0)
+_REFERENCE = re.compile(rb"(?<![\d.])(\d+) 0 R\b")
+
+# Non-stream dictionaries that describe fonts
+_FONT_TYPES = {"/Font", "/FontDescriptor"}
+
+# Font dictionary keys pointing at font-owned streams
+_FONT_STREAM_KEYS = ("FontFile", "FontFile2", "FontFile3", "ToUnicode")
+
+
+def _classify_resources(doc: fitz.Document) -> Dict[int, str]:
+    """Find deduplication candidates.
+
+    Returns:
+        Mapping of xref to kind ("image", "font" or "icc")
+    """
+    kinds: Dict[int, str] = {}
+    for xref in range(1, doc.xref_length()):
+        type_ = doc.xref_get_key(xref, "Type")[1]
+        if not doc.xref_is_stream(xref):
+            if type_ not in _FONT_TYPES:
+                continue
+            kinds[xref] = "font"
+            # Font programs and CMaps are only recognisable from their owner
+            for key in _FONT_STREAM_KEYS:
+                kind, value = doc.xref_get_key(xref, key)
+                if kind == "xref":
+                    kinds[int(value.split()[0])] = "font"
+        elif doc.xref_get_key(xref, "Subtype")[1] == "/Image":
+            kinds[xref] = "image"
+        # ICC profiles are untyped streams carrying the component count /N
+        elif type_ == "null" and doc.xref_get_key(xref, "N")[0] == "int":
+            kinds.setdefault(xref, "icc")
+    return kinds
+
+
+def _rewrite_references(doc: fitz.Document, remap: Dict[int, int]) -> None:
+    """Point every live object's references at the canonical copies."""
+    def replace(match: re.Match) -> bytes:
+        xref = int(match.group(1))
+        return b"%d 0 R" % remap.get(xref, xref)
+
+    for xref in range(1, doc.xref_length()):
+        if xref in remap:
+            continue
+        source = doc.xref_object(xref, compressed=True)
+        if " 0 R" not in source:
+            continue
+        rewritten = _REFERENCE.sub(replace, source.encode()).decode()
+        if rewritten != source:
+            doc.update_object(xref, rewritten)
+
+
+def deduplicate_resources(doc: fitz.Document) -> int:
+    """Collapse identical font, image and ICC objects to a single xref.
+
+    Rewriting references can make parents identical in turn (an image
+    whose soft masks were merged, a font whose font file was merged), so
+    passes repeat until nothing new is merged. Duplicates are left
+    unreferenced; save with garbage >= 1 to drop them.
+
+    Args:
+        doc: Document to deduplicate in place
+
+    Returns:
+        Number of objects that were merged into another
+    """
+    kinds = _classify_resources(doc)
+    # Stream data never changes here, only dictionaries do
+    stream_digests = {
+        xref: hashlib.sha256(doc.xref_stream_raw(xref)).digest()
+        for xref in kinds if doc.xref_is_stream(xref)
+    }
+
+    remap: Dict[int, int] = {}
+    while True:
+        seen: Dict[Tuple[str, str, Optional[bytes]], int] = {}
+        merged: Dict[int, int] = {}
+        for xref, kind in kinds.items():
+            if xref in remap:
+                continue
+            key = (
+                kind,
+                doc.xref_object(xref, compressed=True),
+                stream_digests.get(xref),
+            )
+            canonical = seen.setdefault(key, xref)
+            if canonical != xref:
+                merged[xref] = canonical
+
+        if not merged:
+            return len(remap)
+
+        remap.update(merged)
+        _rewrite_references(doc, merged)
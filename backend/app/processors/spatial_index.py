@@ -0,0 +1,104 @@
+"""Uniform-grid spatial index for page rectangles.
+
+页面上的矩形数量通常只有几十到几千个，均匀网格比 R-tree 更简单，
+且查询代价只和矩形所覆盖的网格数相关。用于合并重叠的删除区域，
+以及检查删除区域是否会误伤正文文本。
+"""
+from typing import Dict, Iterator, List, Sequence, Tuple
+import numpy as np
+
+
+class GridIndex:
+    """Uniform grid over a set of rectangles (x0, y0, x1, y1)."""
+
+    def __init__(self, bboxes: np.ndarray, cell_size: float = 64.0) -> None:
+        """Build the grid.
+
+        Args:
+            bboxes: float array of shape (n, 4)
+            cell_size: Grid cell size in PDF points
+        """
+        self.bboxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4)
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+
+        for index, bbox in enumerate(self.bboxes.tolist()):
+            for cell in self._cells_of(bbox):
+                self._cells.setdefault(cell, []).append(index)
+
+    def __len__(self) -> int:
+        return len(self.bboxes)
+
+    def _cells_of(self, bbox: Sequence[float]) -> Iterator[Tuple[int, int]]:
+        """Grid cells covered by a rectangle."""
+        x0, y0, x1, y1 = bbox
+        size = self.cell_size
+        for cx in range(int(x0 // size), int(x1 // size) + 1):
+            for cy in range(int(y0 // size), int(y1 // size) + 1):
+                yield cx, cy
+
+    def query(self, bbox: Sequence[float]) -> List[int]:
+        """Indices of rectangles whose interior intersects bbox."""
+        candidates = set()
+        for cell in self._cells_of(bbox):
+            candidates.update(self._cells.get(cell, ()))
+        if not candidates:
+            return []
+
+        indices = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        x0, y0, x1, y1 = self.bboxes[indices].T
+        hit = (x0 < bbox[2]) & (x1 > bbox[0]) & (y0 < bbox[3]) & (y1 > bbox[1])
+        return sorted(indices[hit].tolist())
+
+    def clips(self, bbox: Sequence[float], tolerance: float = 0.1) -> bool:
+        """Whether bbox covers more than `tolerance` of any indexed rectangle.
+
+        Args:
+            bbox: Rectangle to test
+            tolerance: Allowed overlap as a fraction of each indexed rectangle's area
+        """
+        indices = self.query(bbox)
+        if not indices:
+            return False
+
+        x0, y0, x1, y1 = self.bboxes[indices].T
+        overlap = (
+            (np.minimum(x1, bbox[2]) - np.maximum(x0, bbox[0])) *
+            (np.minimum(y1, bbox[3]) - np.maximum(y0, bbox[1]))
+        )
+        area = np.maximum((x1 - x0) * (y1 - y0), 1e-6)
+        return bool(np.any(overlap > area * tolerance))
+
+    def clusters(self) -> List[List[int]]:
+        """Group transitively overlapping rectangles (union-find).
+
+        Returns:
+            Lists of rectangle indices, one list per cluster
+        """
+        parent = list(range(len(self.bboxes)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for index, bbox in enumerate(self.bboxes.tolist()):
+            for other in self.query(bbox):
+                if other > index:
+                    root_a, root_b = find(index), find(other)
+                    if root_a != root_b:
+                        parent[root_b] = root_a
+
+        groups: Dict[int, List[int]] = {}
+        for index in range(len(parent)):
+            groups.setdefault(find(index), []).append(index)
+        return list(groups.values())
+
+
+def union_bbox(bboxes: np.ndarray) -> Tuple[float, float, float, float]:
+    """Bounding box of a set of rectangles."""
+    return (
+        float(bboxes[:, 0].min()), float(bboxes[:, 1].min()),
+        float(bboxes[:, 2].max()), float(bboxes[:, 3].max()),
+    )
@@ -1,19 +1,60 @@
 """PDF split processor."""
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 from datetime import datetime, timedelta
 import zipfile
 import fitz
 from app.processors.base import BaseProcessor
+from app.processors.page_selection import parse_page_spec
+from app.processors.parallel import contiguous_blocks, map_blocks_ordered
 from app.processors.registry import registry
 from app.core.config import settings
 from app.services.job_service import job_service
 
 
+def _write_part_block(
+    parts: List[Tuple[int, int, str]],
+    source_path: str,
+    output_dir: str,
+    save_options: Dict[str, Any]
+) -> List[str]:
+    """Open the source by path and write a contiguous block of split parts.
+
+    Returns:
+        Paths of the written parts, in order
+    """
+    with fitz.open(source_path) as source:
+        return _write_parts(source, parts, output_dir, save_options)
+
+
+def _write_parts(
+    source: fitz.Document,
+    parts: List[Tuple[int, int, str]],
+    output_dir: str,
+    save_options: Dict[str, Any]
+) -> List[str]:
+    """Write split parts from an open source document."""
+    output_files = []
+    for first_page, last_page, filename in parts:
+        # Create new document with selected pages
+        new_doc = fitz.open()
+        new_doc.insert_pdf(source, from_page=first_page, to_page=last_page)
+
+        output_path = str(Path(output_dir) / filename)
+        new_doc.save(output_path, **save_options)
+        new_doc.close()
+        output_files.append(output_path)
+
+    return output_files
+
+
 @registry.register("split")
 class SplitProcessor(BaseProcessor):
     """Processor for splitting PDF files."""
 
+    # Minimum number of parts before writing them in worker processes
+    PARALLEL_MIN_PARTS = 16
+
     async def process(
         self,
         job_id: str,
@@ -75,50 +116,26 @@ class SplitProcessor(BaseProcessor):
         Returns:
             Output file ID
         """
-        # Parse ranges string (e.g., "1-3, 5-7, 9-10")
         ranges_str = options.get("ranges", "1-1")
-        ranges = self._parse_ranges(ranges_str)
+        if not ranges_str.strip():
+            raise ValueError("Page ranges are required")
 
         # Validate input file
-        doc = self.validate_pdf(file_path)
-        total_pages = len(doc)
-        doc.close()
-
-        # Create output directory for split files
-        output_dir = Path(settings.RESULT_DIR) / job_id
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        output_files = []
-
-        for i, (start, end) in enumerate(ranges):
-            # Adjust end page if -1
-            if end == -1:
-                end = total_pages
-
-            # Validate range
-            if start < 1 or end > total_pages or start > end:
-                raise ValueError(f"Invalid page range: {start}-{end}")
-
-            # Update progress
-            progress = int((i / len(ranges)) * 100)
-            self.update_progress(
-                job_id,
-                progress,
-                f"Creating part {i + 1} (pages {start}-{end})"
-            )
+        source = self.open_document(file_path)
 
-            # Create new document with selected pages
-            new_doc = fitz.open()
-            with fitz.open(file_path) as original:
-                new_doc.insert_pdf(original, from_page=start - 1, to_page=end - 1)
+        # Parse ranges string (e.g., "1-3, 5-7, 9-"); each range is one part
+        ranges = parse_page_spec(ranges_str, len(source))
+        if not ranges:
+            raise ValueError("At least one valid range is required")
 
-            output_path = output_dir / f"part_{i + 1}.pdf"
-            new_doc.save(output_path)
-            new_doc.close()
-            output_files.append(output_path)
+        parts = [
+            (first, last, f"part_{i + 1}.pdf") for i, (first, last) in enumerate(ranges)
+        ]
 
-        # Create ZIP file with all split files
-        return await self._create_zip_package(job_id, output_files, "split_pages.zip")
+        # Write parts and package them into a ZIP file
+        return await self._write_parts_package(
+            job_id, file_path, parts, options, "split_pages.zip"
+        )
 
     async def _split_by_every(
         self,
@@ -138,44 +155,18 @@ class SplitProcessor(BaseProcessor):
         """
         every_n = options.get("every_n", 2)
 
-        doc = self.validate_pdf(file_path)
-        total_pages = len(doc)
-        doc.close()
+        source = self.open_document(file_path)
+        total_pages = len(source)
 
-        # Create output directory for split files
-        output_dir = Path(settings.RESULT_DIR) / job_id
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        output_files = []
-        part_num = 1
-        start_page = 0
-
-        while start_page < total_pages:
+        parts = []
+        for part_num, start_page in enumerate(range(0, total_pages, every_n), start=1):
             end_page = min(start_page + every_n, total_pages)
+            parts.append((start_page, end_page - 1, f"part_{part_num}.pdf"))
 
-            # Update progress
-            progress = int((start_page / total_pages) * 100)
-            self.update_progress(
-                job_id,
-                progress,
-                f"Creating part {part_num} (pages {start_page + 1}-{end_page})"
-            )
-
-            # Create new document
-            new_doc = fitz.open()
-            with fitz.open(file_path) as original:
-                new_doc.insert_pdf(original, from_page=start_page, to_page=end_page - 1)
-
-            output_path = output_dir / f"part_{part_num}.pdf"
-            new_doc.save(output_path)
-            new_doc.close()
-            output_files.append(output_path)
-
-            start_page = end_page
-            part_num += 1
-
-        # Create ZIP file with all split files
-        return await self._create_zip_package(job_id, output_files, f"split_every_{every_n}.zip")
+        # Write parts and package them into a ZIP file
+        return await self._write_parts_package(
+            job_id, file_path, parts, options, f"split_every_{every_n}.zip"
+        )
 
     async def _split_into_singles(
         self,
@@ -195,83 +186,84 @@ class SplitProcessor(BaseProcessor):
         """
         print(f"[DEBUG] _split_into_singles called with job_id: {job_id}, file_path: {file_path}")
 
-        doc = self.validate_pdf(file_path)
-        total_pages = len(doc)
-        doc.close()
+        source = self.open_document(file_path)
+        total_pages = len(source)
 
         print(f"[DEBUG] Total pages in PDF: {total_pages}")
 
         if total_pages <= 1:
             raise ValueError(f"PDF file has only {total_pages} page(s). Cannot split into single pages. Please use a multi-page PDF file.")
 
-        # Create output directory for split files
-        output_dir = Path(settings.RESULT_DIR) / job_id
-        output_dir.mkdir(parents=True, exist_ok=True)
+        parts = [(i, i, f"page_{i + 1}.pdf") for i in range(total_pages)]
 
-        print(f"[DEBUG] Output directory: {output_dir}")
-
-        output_files = []
-
-        for i in range(total_pages):
-            # Update progress
-            progress = int((i / total_pages) * 100)
-            self.update_progress(
-                job_id,
-                progress,
-                f"Creating page {i + 1}"
-            )
-
-            # Create new document with single page
-            new_doc = fitz.open()
-            with fitz.open(file_path) as original:
-                new_doc.insert_pdf(original, from_page=i, to_page=i)
-
-            output_path = output_dir / f"page_{i + 1}.pdf"
-            new_doc.save(output_path)
-            new_doc.close()
-            output_files.append(output_path)
-            print(f"[DEBUG] Created: {output_path}")
-
-        print(f"[DEBUG] Total files created: {len(output_files)}")
-        print(f"[DEBUG] Calling _create_zip_package...")
-
-        # Create ZIP file with all single pages
-        result = await self._create_zip_package(job_id, output_files, "single_pages.zip")
+        # Write single pages and package them into a ZIP file
+        result = await self._write_parts_package(
+            job_id, file_path, parts, options, "single_pages.zip"
+        )
 
-        print(f"[DEBUG] _create_zip_package returned: {result}")
+        print(f"[DEBUG] _write_parts_package returned: {result}")
         return result
 
-    async def _create_zip_package(
+    async def _write_parts_package(
         self,
         job_id: str,
-        file_paths: list[Path],
+        file_path: Path,
+        parts: List[Tuple[int, int, str]],
+        options: Dict[str, Any],
         zip_filename: str
     ) -> str:
-        """Create a ZIP package from multiple PDF files.
+        """Write split parts in parallel and stream them into a ZIP package.
+
+        Parts are cut into contiguous blocks, one per worker process; each
+        worker opens the source once and writes its block of parts. Blocks
+        come back in order and are added to the archive as they finish.
 
         Args:
             job_id: Job identifier
-            file_paths: List of PDF file paths to include
+            file_path: Source PDF path
+            parts: (first page, last page, filename) per part, 0-based inclusive
+            options: Processing options (save_profile)
             zip_filename: Name for the ZIP file
 
         Returns:
             Output file ID (job_id)
         """
-        # Create ZIP file path
+        # Create output directory for split files
+        output_dir = Path(settings.RESULT_DIR) / job_id
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Small jobs are not worth the process startup cost
+        workers = settings.MAX_WORKERS if len(parts) >= self.PARALLEL_MIN_PARTS else 1
+        blocks = contiguous_blocks(parts, workers)
+
         zip_path = self.get_output_path(job_id, zip_filename)
+        print(f"[DEBUG] Creating ZIP: {zip_path} ({len(parts)} parts, {len(blocks)} blocks)")
 
-        print(f"[DEBUG] Creating ZIP: {zip_path}")
-        print(f"[DEBUG] Input files: {file_paths}")
+        save_options = self.get_save_options(options)
+        if workers > 1:
+            block_results = map_blocks_ordered(
+                _write_part_block, blocks, workers,
+                str(file_path), str(output_dir), save_options
+            )
+        else:
+            source = self.open_document(file_path)
+            block_results = (
+                _write_parts(source, block, str(output_dir), save_options) for block in blocks
+            )
 
-        # Create ZIP file
+        written = 0
         with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in file_paths:
-                if file_path.exists():
-                    print(f"[DEBUG] Adding to ZIP: {file_path}")
+            for block_files in block_results:
+                for output_path in block_files:
                     # Add file to ZIP with just the filename (not full path)
-                    zipf.write(file_path, file_path.name)
-                else:
-                    print(f"[DEBUG] File not found: {file_path}")
+                    zipf.write(output_path, Path(output_path).name)
+
+                written += len(block_files)
+                self.update_progress(
+                    job_id,
+                    int((written / len(parts)) * 100),
+                    f"Created {written} of {len(parts)} parts"
+                )
 
         # Verify ZIP was created
         if not zip_path.exists():
@@ -286,45 +278,9 @@ class SplitProcessor(BaseProcessor):
             "output_file_id": job_id,
             "filename": zip_filename,
             "size": file_size,
-            "file_count": len(file_paths),
+            "file_count": len(parts),
             "download_url": f"/api/v1/files/download/{job_id}",
             "expires_at": (datetime.now() + timedelta(hours=settings.FILE_EXPIRE_HOURS)).isoformat()
         })
 
         return job_id
-
-    def _parse_ranges(self, ranges_str: str) -> list[tuple[int, int]]:
-        """Parse ranges string into list of tuples.
-
-        Args:
-            ranges_str: Ranges string like "1-3, 5-7, 9-10" or "1-3,5--1"
-
-        Returns:
-            List of (start, end) tuples. -1 means last page.
-
-        Raises:
-            ValueError: Invalid range format
-        """
-        if not ranges_str:
-            raise ValueError("Page ranges are required")
-
-        ranges = []
-        parts = ranges_str.split(',')
-
-        for part in parts:
-            part = part.strip()
-            if '-' in part:
-                start, end = part.split('-', 1)
-                start = int(start.strip())
-                end = int(end.strip())
-                ranges.append((start, end))
-            else:
-                # Single page
-                page = int(part)
-                ranges.append((page, page))
-
-        if not ranges:
-            raise ValueError("At least one valid range is required")
-
-        return ranges
-
@@ -1,10 +1,11 @@
 """PDF watermark processors."""
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterator, Tuple
 from datetime import datetime, timedelta
 import zipfile
 import base64
 import io
+import math
 import fitz
 from app.processors.base import BaseProcessor
 from app.processors.registry import registry
@@ -16,6 +17,9 @@ from app.services.job_service import job_service
 class AddWatermarkProcessor(BaseProcessor):
     """Processor for adding watermarks to PDF."""
 
+    # 服务端文字水印可用的内置字体（china-s 等为 CJK 字体）
+    FONTS = ("helv", "tiro", "cour", "china-s", "china-t", "japan", "korea")
+
     async def process(
         self,
         job_id: str,
@@ -53,13 +57,17 @@ class AddWatermarkProcessor(BaseProcessor):
         file_path: Path,
         options: Dict[str, Any]
     ) -> str:
-        """Add text watermark using frontend-generated image.
+        """Add text watermark, tiled over every page.
+
+        Uses the frontend-generated image when watermark_image is given,
+        otherwise draws the text as vector text on the server.
 
         Args:
             job_id: Job identifier
             file_path: PDF file path
-            options: Watermark options (may include watermark_image base64,
-                     watermark_width, watermark_height)
+            options: Watermark options (watermark_image base64 or text,
+                     font, font_size, color, opacity, rotation,
+                     watermark_width, watermark_height, watermark_spacing)
 
         Returns:
             Output file ID
@@ -67,31 +75,27 @@ class AddWatermarkProcessor(BaseProcessor):
         # Check if frontend provided watermark image
         watermark_image_data = options.get("watermark_image")
 
-        if not watermark_image_data:
-            raise ValueError("Watermark image is required. Please ensure frontend sends watermark_image parameter.")
-
-        # Decode base64 image
-        if watermark_image_data.startswith("data:image/png;base64,"):
-            watermark_image_data = watermark_image_data.split(",", 1)[1]
-
-        image_bytes = base64.b64decode(watermark_image_data)
-
-        # Load watermark image to get dimensions
-        img = fitz.Pixmap(io.BytesIO(image_bytes))
-
-        # 使用前端指定的水印尺寸（如果提供），否则使用图像实际尺寸
-        # 这确保后端使用与前端预览相同的尺寸进行平铺
-        watermark_width = options.get("watermark_width", img.width)
-        watermark_height = options.get("watermark_height", img.height)
-        # 水印间距（像素）
-        watermark_spacing = options.get("watermark_spacing", 50)
+        if watermark_image_data:
+            build_stamp = self._image_stamp_builder(watermark_image_data, options)
+        elif options.get("text"):
+            build_stamp = self._text_stamp_builder(options)
+        else:
+            raise ValueError("Watermark text or watermark_image is required")
 
-        # Validate PDF
-        doc = self.validate_pdf(file_path)
+        # Validate PDF; pages are stamped in place on the job's document
+        # (owned by the session) and the result is written once
+        doc = self.open_document(file_path)
         total_pages = len(doc)
 
-        # Create output document
-        output_doc = fitz.open()
+        # 平铺网格按页面尺寸只构建一次（图片或字体只嵌入一次），
+        # 作为共享的 Form XObject 被每页引用一次。
+        # 必须先建好所有网格再盖章：盖章后 stamp_doc 不能再添加对象
+        stamp_doc = fitz.open()
+        stamps: Dict[Tuple[float, float], int] = {}
+        for page in doc:
+            size = (round(page.rect.width, 2), round(page.rect.height, 2))
+            if size not in stamps:
+                stamps[size] = build_stamp(stamp_doc, page.rect)
 
         for i in range(total_pages):
             # Update progress
@@ -102,43 +106,17 @@ class AddWatermarkProcessor(BaseProcessor):
                 f"Adding watermark to page {i + 1}"
             )
 
-            # Copy the page content
+            # Stamp the page with the shared tile grid
             page = doc[i]
-            output_doc.insert_pdf(doc, from_page=i, to_page=i)
-
-            # Add watermark to the copied page
-            out_page = output_doc[i]
-            rect = out_page.rect
-
-            # 使用前端配置的水印尺寸和间距进行平铺
-            # 计算水印单元的实际占位尺寸（包含间距）
-            cell_width = watermark_width + watermark_spacing
-            cell_height = watermark_height + watermark_spacing
-
-            # 计算需要在页面放置的水印行列数
-            columns = max(1, int((rect.width + watermark_spacing) / cell_width) + 1)
-            rows = max(1, int((rect.height + watermark_spacing) / cell_height) + 1)
-
-            # Tile watermark across the page with spacing
-            for row in range(rows):
-                for col in range(columns):
-                    x = col * cell_width
-                    y = row * cell_height
-
-                    # 只在页面范围内插入水印
-                    if x < rect.width and y < rect.height:
-                        # 使用前端指定的尺寸插入图像
-                        out_page.insert_image(
-                            fitz.Rect(x, y, x + watermark_width, y + watermark_height),
-                            pixmap=img,
-                            overlay=True
-                        )
+            rect = page.rect
+            size = (round(rect.width, 2), round(rect.height, 2))
+            page.show_pdf_page(rect, stamp_doc, stamps[size], overlay=True)
+
+        stamp_doc.close()
 
         # Save output
         output_path = self.get_output_path(job_id, "watermarked.pdf")
-        output_doc.save(output_path)
-        output_doc.close()
-        doc.close()
+        doc.save(output_path, **self.get_save_options(options))
 
         # Complete job
         file_size = output_path.stat().st_size
@@ -153,6 +131,149 @@ class AddWatermarkProcessor(BaseProcessor):
 
         return job_id
 
+    def _image_stamp_builder(
+        self,
+        watermark_image_data: str,
+        options: Dict[str, Any]
+    ) -> Callable[[fitz.Document, fitz.Rect], int]:
+        """Get a stamp builder tiling the frontend-generated watermark image.
+
+        Args:
+            watermark_image_data: Base64 PNG, optionally as a data URL
+            options: Watermark options (watermark_width, watermark_height,
+                     watermark_spacing)
+
+        Returns:
+            Function adding a stamp page for a page rect, see _build_tile_stamp
+        """
+        # Decode base64 image
+        if watermark_image_data.startswith("data:image/png;base64,"):
+            watermark_image_data = watermark_image_data.split(",", 1)[1]
+
+        image_bytes = base64.b64decode(watermark_image_data)
+
+        # Load watermark image to get dimensions
+        img = fitz.Pixmap(io.BytesIO(image_bytes))
+
+        # 使用前端指定的水印尺寸（如果提供），否则使用图像实际尺寸
+        # 这确保后端使用与前端预览相同的尺寸进行平铺
+        watermark_width = options.get("watermark_width", img.width)
+        watermark_height = options.get("watermark_height", img.height)
+        # 水印间距（像素）
+        watermark_spacing = options.get("watermark_spacing", 50)
+
+        def build_stamp(stamp_doc: fitz.Document, rect: fitz.Rect) -> int:
+            page = stamp_doc.new_page(width=rect.width, height=rect.height)
+            image_xref = 0
+            for cell in self._tile_cells(rect, watermark_width, watermark_height, watermark_spacing):
+                # 使用前端指定的尺寸插入图像（第一次之后复用同一图片对象）
+                image_xref = page.insert_image(cell, pixmap=img, xref=image_xref, overlay=True)
+            return page.number
+
+        return build_stamp
+
+    def _text_stamp_builder(
+        self,
+        options: Dict[str, Any]
+    ) -> Callable[[fitz.Document, fitz.Rect], int]:
+        """Get a stamp builder drawing the watermark text as vector text.
+
+        Args:
+            options: Watermark options (text, font, font_size, color,
+                     opacity, rotation, watermark_width, watermark_height,
+                     watermark_spacing)
+
+        Returns:
+            Function adding a stamp page for a page rect
+
+        Raises:
+            ValueError: Invalid font or color
+        """
+        text = str(options["text"])
+        font_size = float(options.get("font_size", options.get("fontSize", 48)))
+        color = self._parse_color(options.get("color", "#808080"))
+        opacity = max(0, min(100, float(options.get("opacity", 30)))) / 100
+        rotation = float(options.get("rotation", 45))
+
+        # 默认字体：含非 Latin-1 字符（如中文）时使用内置 CJK 字体
+        font = options.get("font") or ("china-s" if any(ord(c) > 0xFF for c in text) else "helv")
+        if font not in self.FONTS:
+            raise ValueError(f"Invalid font: {font}. Supported: {', '.join(self.FONTS)}")
+
+        # 水印单元默认为旋转后文字的外接矩形
+        text_width = fitz.Font(font).text_length(text, font_size)
+        angle = math.radians(rotation)
+        cos, sin = abs(math.cos(angle)), abs(math.sin(angle))
+        watermark_width = options.get("watermark_width", text_width * cos + font_size * sin)
+        watermark_height = options.get("watermark_height", text_width * sin + font_size * cos)
+        watermark_spacing = options.get("watermark_spacing", 50)
+
+        # 与前端 CSS rotate() 一致：正角度为顺时针
+        matrix = fitz.Matrix(-rotation)
+
+        def build_stamp(stamp_doc: fitz.Document, rect: fitz.Rect) -> int:
+            page = stamp_doc.new_page(width=rect.width, height=rect.height)
+            for cell in self._tile_cells(rect, watermark_width, watermark_height, watermark_spacing):
+                # 文字以单元中心为基准居中，并绕中心旋转
+                center = (cell.tl + cell.br) / 2
+                page.insert_text(
+                    center + (-text_width / 2, font_size * 0.35),
+                    text,
+                    fontsize=font_size,
+                    fontname=font,
+                    color=color,
+                    fill_opacity=opacity,
+                    morph=(center, matrix),
+                    overlay=True
+                )
+            return page.number
+
+        return build_stamp
+
+    @staticmethod
+    def _tile_cells(
+        rect: fitz.Rect,
+        watermark_width: float,
+        watermark_height: float,
+        watermark_spacing: float
+    ) -> Iterator[fitz.Rect]:
+        """Yield the watermark rects tiling a page, row by row."""
+        # 使用前端配置的水印尺寸和间距进行平铺
+        # 计算水印单元的实际占位尺寸（包含间距）
+        cell_width = watermark_width + watermark_spacing
+        cell_height = watermark_height + watermark_spacing
+
+        # 计算需要在页面放置的水印行列数
+        columns = max(1, int((rect.width + watermark_spacing) / cell_width) + 1)
+        rows = max(1, int((rect.height + watermark_spacing) / cell_height) + 1)
+
+        # Tile watermark across the page with spacing
+        for row in range(rows):
+            for col in range(columns):
+                x = col * cell_width
+                y = row * cell_height
+
+                # 只在页面范围内插入水印
+                if x < rect.width and y < rect.height:
+                    yield fitz.Rect(x, y, x + watermark_width, y + watermark_height)
+
+    @staticmethod
+    def _parse_color(color: Any) -> Tuple[float, float, float]:
+        """Parse "#RRGGBB" (or an RGB list of 0-255 values) into PDF RGB floats."""
+        if isinstance(color, str):
+            value = color.strip().lstrip("#")
+            if len(value) == 3:
+                value = "".join(c * 2 for c in value)
+            try:
+                if len(value) != 6:
+                    raise ValueError
+                return tuple(int(value[i:i + 2], 16) / 255 for i in (0, 2, 4))
+            except ValueError:
+                raise ValueError(f"Invalid color: {color}")
+        if isinstance(color, (list, tuple)) and len(color) == 3:
+            return tuple(max(0, min(255, float(c))) / 255 for c in color)
+        raise ValueError(f"Invalid color: {color}")
+
 
 @registry.register("pdf_to_images")
 class PDFToImagesProcessor(BaseProcessor):
@@ -186,7 +307,7 @@ class PDFToImagesProcessor(BaseProcessor):
         dpi = int(options.get("dpi", 150))
 
         # Validate PDF
-        doc = self.validate_pdf(file_path)
+        doc = self.open_document(file_path)
         total_pages = len(doc)
 
         # Create output directory
@@ -216,8 +337,6 @@ class PDFToImagesProcessor(BaseProcessor):
             pix.save(output_path)
             output_files.append(output_path)
 
-        doc.close()
-
         # Create ZIP file with all images
         zip_filename = f"images_{output_format}.zip"
         zip_path = self.get_output_path(job_id, zip_filename)
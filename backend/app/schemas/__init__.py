@@ -1,8 +1,12 @@
 """Schemas module."""
-from app.schemas.tool import ToolResponse, ToolDetailResponse, Tool, ToolOption
+from app.schemas.tool import (
+    ToolResponse, ToolDetailResponse, Tool, ToolOption,
+    WatermarkPreviewRequest, WatermarkPreviewResponse,
+    WatermarkTemplateListResponse
+)
 from app.schemas.file import (
     UploadResponse, UploadData, FileInfo, FileMetadata,
-    ErrorResponse, ErrorDetail
+    ErrorResponse, ErrorDetail, SearchResponse
 )
 from app.schemas.job import (
     JobCreate, JobResponse, JobStatusResponse, JobCreateResponse
@@ -11,9 +15,11 @@ from app.schemas.job import (
 __all__ = [
     # Tool schemas
     'Tool', 'ToolOption', 'ToolResponse', 'ToolDetailResponse',
+    'WatermarkPreviewRequest', 'WatermarkPreviewResponse',
+    'WatermarkTemplateListResponse',
     # File schemas
     'UploadResponse', 'UploadData', 'FileInfo', 'FileMetadata',
-    'ErrorResponse', 'ErrorDetail',
+    'ErrorResponse', 'ErrorDetail', 'SearchResponse',
     # Job schemas
     'JobCreate', 'JobResponse', 'JobStatusResponse', 'JobCreateResponse',
 ]
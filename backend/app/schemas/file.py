@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Optional
 from datetime import datetime
 
 
@@ -30,6 +30,11 @@ class UploadData(BaseModel):
     expires_at: datetime
 
 
+class SearchResponse(BaseModel):
+    success: bool = True
+    data: dict[str, Any]
+
+
 class ErrorResponse(BaseModel):
     success: bool = False
     error: "ErrorDetail"
@@ -39,3 +39,18 @@ class ToolResponse(BaseModel):
 class ToolDetailResponse(BaseModel):
     success: bool = True
     data: Tool
+
+
+class WatermarkPreviewRequest(BaseModel):
+    upload_id: str
+    options: dict[str, Any] = {}
+
+
+class WatermarkPreviewResponse(BaseModel):
+    success: bool = True
+    data: dict[str, Any]
+
+
+class WatermarkTemplateListResponse(BaseModel):
+    success: bool = True
+    data: list[dict[str, Any]]
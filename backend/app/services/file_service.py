@@ -2,6 +2,7 @@ import os
 import uuid
 import fitz
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Optional
 from fastapi import UploadFile, HTTPException
 from app.core.config import settings
@@ -28,6 +29,25 @@ class FileService:
         """Get file path from file ID."""
         return os.path.join(settings.UPLOAD_DIR, f"{file_id}.pdf")
 
+    def get_uploaded_files(self, upload_id: str) -> list[Path]:
+        """Get uploaded file paths for an upload, in upload order.
+
+        Raises:
+            ValueError: No files found for the upload
+        """
+        upload_dir = Path(settings.UPLOAD_DIR)
+
+        # Find all files matching the upload_id prefix: {upload_id}_*.pdf
+        files = []
+        if upload_dir.exists():
+            for file_path in sorted(upload_dir.glob(f"{upload_id}_*.pdf")):
+                files.append(file_path)
+
+        if not files:
+            raise ValueError(f"No files found for upload: {upload_id}")
+
+        return files
+
     def get_expires_at(self) -> datetime:
         """Get file expiration time."""
         return datetime.now() + timedelta(hours=settings.FILE_EXPIRE_HOURS)
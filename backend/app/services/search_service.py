@@ -0,0 +1,283 @@
+"""Per-upload full-text search over page text (SQLite FTS5)."""
+import asyncio
+import html
+import os
+import re
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+import fitz
+from app.core.config import settings
+from app.services.text_cache_service import (
+    PAGE_TEXT_KIND,
+    pack_strings,
+    text_cache_service,
+    unpack_strings,
+)
+
+
+UPLOAD_ID_PATTERN = re.compile(r"^[A-Za-z0-9_\-]{1,64}$")
+
+# The trigram tokenizer matches substrings in any script (including CJK),
+# but only for terms of at least this many characters
+TRIGRAM_MIN_LENGTH = 3
+
+# Characters of context on each side of a match in fallback snippets
+SNIPPET_CONTEXT = 32
+
+# Match markers passed to FTS5 snippet(); stripped from indexed text so they
+# can be told apart from page content, then replaced after HTML-escaping
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+_STRIP_MARKERS = str.maketrans("", "", MATCH_START + MATCH_END)
+
+
+def _find_term(text: str, term: str) -> Optional[re.Match]:
+    """Case-insensitive (Unicode) substring search shared by SQL and snippets."""
+    return re.search(re.escape(term), text, re.IGNORECASE)
+
+
+def _highlight(snippet: str) -> str:
+    """HTML-escape a marked snippet, then turn the markers into <b> tags."""
+    return (
+        html.escape(snippet)
+        .replace(MATCH_START, "<b>")
+        .replace(MATCH_END, "</b>")
+    )
+
+
+class SearchService:
+    """Builds and queries one FTS5 index file per upload under SEARCH_INDEX_DIR."""
+
+    def __init__(self) -> None:
+        """Initialize index build tracking."""
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._failed: Set[str] = set()
+
+    def _index_path(self, upload_id: str) -> Path:
+        """Get index file path, validating the upload ID."""
+        if not UPLOAD_ID_PATTERN.match(upload_id or ""):
+            raise ValueError(f"Invalid upload ID: {upload_id}")
+        return Path(settings.SEARCH_INDEX_DIR) / f"{upload_id}.sqlite"
+
+    def _pending_build(self, upload_id: str) -> Optional[asyncio.Task]:
+        """Scheduled build that can still complete, if any."""
+        task = self._tasks.get(upload_id)
+        if task is None or task.done() or task.get_loop().is_closed():
+            return None
+        return task
+
+    def get_status(self, upload_id: str) -> str:
+        """Index status: "ready", "building", "failed" or "missing"."""
+        if self._pending_build(upload_id) is not None:
+            return "building"
+        if self._index_path(upload_id).exists():
+            return "ready"
+        return "failed" if upload_id in self._failed else "missing"
+
+    def _page_texts(self, file_path: Path) -> List[str]:
+        """Plain text of every page, from the persistent text cache when possible."""
+        cache_key = text_cache_service.document_key(file_path)
+        cached = text_cache_service.load(cache_key, PAGE_TEXT_KIND)
+        if cached is not None:
+            return unpack_strings(cached["text"], cached["offsets"])
+
+        with fitz.open(file_path) as doc:
+            if doc.needs_pass:
+                return []
+            texts = [page.get_text() for page in doc]
+
+        text_blob, offsets = pack_strings(texts)
+        text_cache_service.save(cache_key, PAGE_TEXT_KIND, {"text": text_blob, "offsets": offsets})
+        return texts
+
+    def build_index(self, upload_id: str, files: List[Path]) -> int:
+        """Index every page of an upload's files (blocking).
+
+        Encrypted files are skipped. The index is written to a temp file
+        and moved into place, so searches never see a partial index.
+
+        Returns:
+            Number of indexed pages
+        """
+        path = self._index_path(upload_id)
+        os.makedirs(path.parent, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=path.parent)
+        os.close(fd)
+
+        pages = 0
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE pages USING fts5("
+                "text, file_index UNINDEXED, file_id UNINDEXED, page UNINDEXED, "
+                "tokenize='trigram')"
+            )
+            for file_index, file_path in enumerate(files):
+                # Upload file names are {upload_id}_{index:04d}_{file_id}.pdf
+                file_id = file_path.stem.split("_", 3)[-1]
+                rows = [
+                    (text.translate(_STRIP_MARKERS), file_index, file_id, page_num + 1)
+                    for page_num, text in enumerate(self._page_texts(file_path))
+                ]
+                conn.executemany("INSERT INTO pages VALUES (?, ?, ?, ?)", rows)
+                pages += len(rows)
+            conn.execute("INSERT INTO pages(pages) VALUES ('optimize')")
+            conn.commit()
+        except Exception:
+            conn.close()
+            os.remove(tmp_path)
+            raise
+        conn.close()
+
+        os.replace(tmp_path, path)
+        return pages
+
+    def schedule_index(self, upload_id: str, files: List[Path]) -> None:
+        """Build an upload's index in a background thread.
+
+        Indexes of expired uploads are pruned first.
+        """
+        self.prune_expired()
+        self._failed.discard(upload_id)
+        loop = asyncio.get_event_loop()
+        self._tasks[upload_id] = loop.create_task(self._build_in_background(upload_id, files))
+
+    async def _build_in_background(self, upload_id: str, files: List[Path]) -> None:
+        try:
+            await asyncio.to_thread(self.build_index, upload_id, files)
+        except Exception as e:
+            print(f"[DEBUG] Search index build failed for {upload_id}: {type(e).__name__}: {e}")
+            self._failed.add(upload_id)
+        finally:
+            self._tasks.pop(upload_id, None)
+
+    async def wait_for_index(self, upload_id: str) -> None:
+        """Wait for a scheduled build of the upload's index, if any."""
+        task = self._pending_build(upload_id)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            await asyncio.shield(task)
+
+    def search(self, upload_id: str, query: str, limit: int = 50) -> Optional[Dict[str, Any]]:
+        """Find pages containing every whitespace-separated term of the query.
+
+        Terms are matched as case-insensitive substrings. Snippets are
+        HTML-escaped page text with matches wrapped in <b> tags.
+
+        Args:
+            upload_id: Upload identifier
+            query: Search terms
+            limit: Maximum number of results
+
+        Returns:
+            {"query", "total", "results": [{file_index, file_id, page, snippet}]}
+            ordered by relevance, or None when the upload has no index
+        """
+        path = self._index_path(upload_id)
+        if not path.exists():
+            return None
+
+        terms = query.split()
+        if not terms:
+            raise ValueError("Search query is required")
+
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        conn.create_function(
+            "contains_term", 2, lambda text, term: _find_term(text, term) is not None,
+            deterministic=True
+        )
+        try:
+            if all(len(term) >= TRIGRAM_MIN_LENGTH for term in terms):
+                # Each term as a quoted phrase, so FTS5 syntax in user input is inert
+                match = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+                total = conn.execute(
+                    "SELECT count(*) FROM pages WHERE pages MATCH ?", (match,)
+                ).fetchone()[0]
+                rows = [
+                    (file_index, file_id, page, _highlight(snippet))
+                    for file_index, file_id, page, snippet in conn.execute(
+                        "SELECT file_index, file_id, page, "
+                        "snippet(pages, 0, ?, ?, '…', 24) "
+                        "FROM pages WHERE pages MATCH ? ORDER BY rank LIMIT ?",
+                        (MATCH_START, MATCH_END, match, limit),
+                    )
+                ]
+            else:
+                # Short terms cannot use the trigram index; scan the page texts
+                where = " AND ".join(["contains_term(text, ?)"] * len(terms))
+                params = list(terms)
+                total = conn.execute(
+                    f"SELECT count(*) FROM pages WHERE {where}", params
+                ).fetchone()[0]
+                rows = [
+                    (file_index, file_id, page, self._snippet(text, terms[0]))
+                    for file_index, file_id, page, text in conn.execute(
+                        f"SELECT file_index, file_id, page, text FROM pages WHERE {where} "
+                        "ORDER BY file_index, page LIMIT ?",
+                        params + [limit],
+                    )
+                ]
+        finally:
+            conn.close()
+
+        return {
+            "query": query,
+            "total": total,
+            "results": [
+                {"file_index": file_index, "file_id": file_id, "page": page, "snippet": snippet}
+                for file_index, file_id, page, snippet in rows
+            ],
+        }
+
+    def _snippet(self, text: str, term: str) -> str:
+        """Context around the first occurrence of term, formatted like FTS5 snippets."""
+        found = _find_term(text, term)
+        if found is None:
+            return _highlight(text[:2 * SNIPPET_CONTEXT])
+        start, end = found.span()
+        left = max(0, start - SNIPPET_CONTEXT)
+        right = min(len(text), end + SNIPPET_CONTEXT)
+        return _highlight(
+            ("…" if left > 0 else "")
+            + text[left:start] + MATCH_START + text[start:end] + MATCH_END + text[end:right]
+            + ("…" if right < len(text) else "")
+        )
+
+    def delete_index(self, upload_id: str) -> bool:
+        """Delete an upload's index."""
+        path = self._index_path(upload_id)
+        if path.exists():
+            os.remove(path)
+            return True
+        return False
+
+    def prune_expired(self) -> int:
+        """Delete indexes older than FILE_EXPIRE_HOURS, when their uploads expire.
+
+        Returns:
+            Number of deleted indexes
+        """
+        index_dir = Path(settings.SEARCH_INDEX_DIR)
+        if not index_dir.exists():
+            return 0
+
+        cutoff = time.time() - settings.FILE_EXPIRE_HOURS * 3600
+        deleted = 0
+        for path in index_dir.glob("*.sqlite"):
+            upload_id = path.stem
+            try:
+                expired = path.stat().st_mtime < cutoff
+            except OSError:
+                continue
+            if not expired or self._pending_build(upload_id) is not None:
+                continue
+            try:
+                deleted += self.delete_index(upload_id)
+            except (OSError, ValueError):
+                continue
+        return deleted
+
+
+search_service = SearchService()
@@ -3,8 +3,8 @@ import asyncio
 from pathlib import Path
 from typing import Dict, Any
 from app.services.job_service import job_service
+from app.services.file_service import file_service
 from app.processors.registry import registry
-from app.core.config import settings
 
 
 class TaskProcessor:
@@ -29,6 +29,7 @@ class TaskProcessor:
             upload_id: Upload identifier
             options: Processing options
         """
+        processor = None
         try:
             print(f"[DEBUG] process_job called: job_id={job_id}, tool_id={tool_id}, upload_id={upload_id}, options={options}")
 
@@ -56,6 +57,10 @@ class TaskProcessor:
                 "code": "ERR_PROCESSING_FAILED",
                 "message": str(e)
             })
+        finally:
+            # Close input documents opened during the job
+            if processor is not None:
+                processor.close_session()
 
     def _get_uploaded_files(self, upload_id: str) -> list[Path]:
         """Get list of uploaded file paths.
@@ -69,20 +74,7 @@ class TaskProcessor:
         Raises:
             ValueError: Upload directory not found
         """
-        import os
-
-        upload_dir = Path(settings.UPLOAD_DIR)
-
-        # Find all files matching the upload_id prefix: {upload_id}_*.pdf
-        files = []
-        if upload_dir.exists():
-            for file_path in sorted(upload_dir.glob(f"{upload_id}_*.pdf")):
-                files.append(file_path)
-
-        if not files:
-            raise ValueError(f"No files found for upload: {upload_id}")
-
-        return files
+        return file_service.get_uploaded_files(upload_id)
 
     def create_task(
         self,
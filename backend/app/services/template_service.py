@@ -0,0 +1,77 @@
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+
+
+TEMPLATE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_\-]{1,64}$")
+
+
+class TemplateService:
+    """Named watermark templates stored as JSON files under TEMPLATE_DIR."""
+
+    def _template_path(self, name: str) -> Path:
+        """Get template file path, validating the name."""
+        if not TEMPLATE_NAME_PATTERN.match(name or ""):
+            raise ValueError(f"Invalid template name: {name}")
+        return Path(settings.TEMPLATE_DIR) / f"{name}.json"
+
+    def save_template(self, name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Save (or overwrite) a template and return the stored document."""
+        path = self._template_path(name)
+        os.makedirs(path.parent, exist_ok=True)
+
+        template = {
+            **data,
+            "name": name,
+            "created_at": datetime.now().isoformat(),
+        }
+
+        # Write to a temp file first so concurrent readers never see partial JSON
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(template, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+        return template
+
+    def get_template(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get template by name."""
+        path = self._template_path(name)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def list_templates(self) -> List[Dict[str, Any]]:
+        """List template summaries, newest first."""
+        template_dir = Path(settings.TEMPLATE_DIR)
+        if not template_dir.exists():
+            return []
+
+        templates = []
+        for path in template_dir.glob("*.json"):
+            try:
+                template = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            templates.append({
+                "name": template.get("name", path.stem),
+                "created_at": template.get("created_at"),
+                "texts": len(template.get("texts", [])),
+                "images": len(template.get("images", [])),
+            })
+
+        return sorted(templates, key=lambda t: t["created_at"] or "", reverse=True)
+
+    def delete_template(self, name: str) -> bool:
+        """Delete template by name."""
+        path = self._template_path(name)
+        if path.exists():
+            os.remove(path)
+            return True
+        return False
+
+
+template_service = TemplateService()
@@ -0,0 +1,105 @@
+import hashlib
+import io
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+
+
+# Bump when the layout of cached arrays changes so stale entries are ignored
+CACHE_VERSION = 1
+
+# Entry kind for plain page text ({"text": blob, "offsets": offsets}),
+# shared by extract_text and the search index
+PAGE_TEXT_KIND = "text"
+
+
+def pack_strings(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack strings into a UTF-8 byte blob and an offsets array of length n + 1."""
+    encoded = [text.encode("utf-8") for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def unpack_strings(blob: np.ndarray, offsets: np.ndarray) -> List[str]:
+    """Inverse of pack_strings."""
+    data = blob.tobytes()
+    bounds = offsets.tolist()
+    return [data[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])]
+
+
+class TextCacheService:
+    """Text layers extracted from documents, cached on disk by content hash.
+
+    Each entry is a compressed .npz file of named arrays under
+    TEXT_CACHE_DIR, one per (document content, kind of extraction). The
+    least recently used entries are pruned beyond TEXT_CACHE_MAX_MB.
+    """
+
+    def document_key(self, file_path: Path) -> str:
+        """SHA-256 of the document's bytes."""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str, kind: str) -> Path:
+        return Path(settings.TEXT_CACHE_DIR) / f"{key}.{kind}.v{CACHE_VERSION}.npz"
+
+    def load(self, key: str, kind: str) -> Optional[Dict[str, np.ndarray]]:
+        """Load a cached entry, or None when it is missing or unreadable."""
+        path = self._entry_path(key, kind)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+            # Mark as recently used for pruning
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return arrays
+
+    def save(self, key: str, kind: str, arrays: Dict[str, np.ndarray]) -> None:
+        """Store an entry (atomically), then prune the cache to its size limit."""
+        path = self._entry_path(key, kind)
+        os.makedirs(path.parent, exist_ok=True)
+
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+
+        # Write to a temp file first so concurrent readers never see a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(buffer.getvalue())
+        os.replace(tmp_path, path)
+
+        self.prune()
+
+    def prune(self) -> None:
+        """Delete least recently used entries beyond TEXT_CACHE_MAX_MB."""
+        cache_dir = Path(settings.TEXT_CACHE_DIR)
+        if not cache_dir.exists():
+            return
+
+        entries = []
+        for path in cache_dir.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        budget = settings.TEXT_CACHE_MAX_MB * 1024 * 1024
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= budget:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+text_cache_service = TextCacheService()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""Benchmark remove_watermark detection on a large text-heavy document.
+
+Usage:
+    python benchmarks/bench_remove_watermark.py --pages 1000 --lines 40
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.processors.page_analysis import DocumentAnalysis  # noqa: E402
+from app.processors.remove_watermark import RemoveWatermarkProcessor  # noqa: E402
+
+
+def build_document(path: Path, pages: int, lines: int) -> None:
+    """Create a text-heavy PDF with a repeated diagonal watermark."""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        for j in range(lines):
+            page.insert_text((72, 60 + j * 17), f"Page {i + 1} line {j + 1}: body text", fontsize=10)
+        page.insert_text(
+            (150, 500), "CONFIDENTIAL", fontsize=60, color=(0.8, 0.8, 0.8),
+            morph=(fitz.Point(300, 400), fitz.Matrix(30))
+        )
+    doc.save(path, garbage=1, deflate=True)
+    doc.close()
+
+
+def timed(label: str, func):
+    """Run func and print its wall time."""
+    started = time.perf_counter()
+    result = func()
+    print(f"{label:<28} {time.perf_counter() - started:8.3f}s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=40)
+    args = parser.parse_args()
+
+    processor = RemoveWatermarkProcessor(None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.pdf"
+        timed("build document", lambda: build_document(path, args.pages, args.lines))
+
+        doc = fitz.open(path)
+        analysis = DocumentAnalysis(doc)
+        print(f"pages={len(doc)} spans/page~{args.lines + 1}")
+
+        timed("extract page layouts", lambda: [analysis.page(i) for i in range(len(doc))])
+        signatures = timed(
+            "collect signatures", lambda: processor._collect_content_signatures(analysis)
+        )
+        repeating_text, repeating_images = timed(
+            "detect repeating", lambda: processor._detect_repeating_watermarks(signatures, len(doc))
+        )
+        matched = timed("match on every page", lambda: sum(
+            len(processor._match_repeating_watermarks(
+                analysis.page(i), repeating_text, repeating_images
+            )[0])
+            for i in range(len(doc))
+        ))
+        print(f"signatures={len(signatures['text']['key'])} matched_spans={matched}")
+        doc.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""Benchmark output save profiles: save time against output size.
+
+Usage:
+    python benchmarks/bench_save_profiles.py --pages 300 --images 20
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.processors.base import BaseProcessor  # noqa: E402
+
+
+def build_document(pages: int, images: int) -> fitz.Document:
+    """Create a document with text on every page and a few raster images.
+
+    Pages are copied in from a source document (as merge/split do), so
+    the result carries the same unused objects real outputs do.
+    """
+    source = fitz.open()
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 400, 300), False)
+    pix.set_rect(pix.irect, (120, 160, 200))
+    for i in range(pages):
+        page = source.new_page()
+        for j in range(30):
+            page.insert_text((72, 60 + j * 22), f"Page {i + 1} line {j + 1}: body text", fontsize=10)
+        if images and i % max(1, pages // images) == 0:
+            page.insert_image(fitz.Rect(72, 600, 472, 750), pixmap=pix)
+
+    doc = fitz.open()
+    doc.insert_pdf(source)
+    source.close()
+    return doc
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--images", type=int, default=20)
+    args = parser.parse_args()
+
+    doc = build_document(args.pages, args.images)
+    print(f"pages={len(doc)} images={args.images}")
+    print(f"{'profile':<10} {'time':>9} {'size':>12}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile, options in BaseProcessor.SAVE_PROFILES.items():
+            path = Path(tmp) / f"{profile}.pdf"
+            started = time.perf_counter()
+            doc.save(path, **options)
+            elapsed = time.perf_counter() - started
+            print(f"{profile:<10} {elapsed:8.3f}s {path.stat().st_size / 1024:10.1f}KB")
+
+    doc.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,15 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Keep the text cache and search indexes per test, out of the storage directory."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "TEXT_CACHE_DIR", str(tmp_path / "text_cache"))
+    monkeypatch.setattr(settings, "SEARCH_INDEX_DIR", str(tmp_path / "search"))
+
+
 @pytest.fixture
 def sample_pdf_path():
     """Get path to sample PDF file for testing.
@@ -96,3 +105,41 @@ def temp_pdf_file(sample_pdf_content, tmp_path):
     pdf_path = tmp_path / "test.pdf"
     pdf_path.write_bytes(sample_pdf_content)
     return pdf_path
+
+
+@pytest.fixture(params=[1, 2], ids=["serial", "workers"])
+def max_workers(request, monkeypatch):
+    """Run the test once in-process and once through worker processes.
+
+    Returns:
+        MAX_WORKERS value in effect for the test
+    """
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "MAX_WORKERS", request.param)
+    return request.param
+
+
+@pytest.fixture
+def run_job(tmp_path, monkeypatch):
+    """Run one processor job on an input file, writing results under tmp_path.
+
+    Returns:
+        Async function (processor_class, tool_id, path, options) ->
+        (processor, job_id); the processor's session is closed afterwards
+    """
+    from app.core.config import settings
+    from app.services.job_service import job_service
+
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+
+    async def run(processor_class, tool_id, path, options):
+        processor = processor_class(job_service)
+        job = job_service.create_job(tool_id, "ul_test", {})
+        try:
+            await processor.process(job["job_id"], [path], options)
+        finally:
+            processor.close_session()
+        return processor, job["job_id"]
+
+    return run
@@ -93,12 +93,106 @@ class TestToolsAPI:
         assert data["success"] is True
         assert data["data"]["id"] == "merge"
 
+    def test_watermark_removers_list_save_options(self):
+        """Test the removers are registered tools with their output options."""
+        response = client.get("/api/v1/tools/remove_watermark")
+        assert response.status_code == 200
+
+        options = {o["name"]: o for o in response.json()["data"]["options"]}
+        assert options["save_mode"]["default"] == "auto"
+        assert {"removal_method", "save_profile"} <= set(options)
+
+    def test_extract_images_is_registered(self):
+        """Test the image extractor is a tool with the formats it accepts."""
+        from app.processors.extract import ExtractImagesProcessor
+
+        response = client.get("/api/v1/tools/extract_images")
+        assert response.status_code == 200
+
+        [option] = response.json()["data"]["options"]
+        assert option["name"] == "format"
+        assert tuple(o["value"] for o in option["options"]) == ExtractImagesProcessor.FORMATS
+
     def test_get_nonexistent_tool(self):
         """Test getting non-existent tool."""
         response = client.get("/api/v1/tools/nonexistent")
         assert response.status_code == 404
 
 
+class TestWatermarkPreviewAPI:
+    """Tests for the remove_watermark_image preview endpoint."""
+
+    def _upload(self, pdf_path):
+        with open(pdf_path, "rb") as f:
+            response = client.post(
+                "/api/v1/files/upload",
+                files={"files": ("test.pdf", f, "application/pdf")},
+                data={"tool_id": "remove_watermark_image"}
+            )
+        return response.json()["data"]["upload_id"]
+
+    def test_preview_single_page(self, sample_pdf_file):
+        """Test previewing one page returns cleaned image and mask overlay."""
+        upload_id = self._upload(sample_pdf_file)
+
+        response = client.post("/api/v1/tools/remove_watermark_image/preview", json={
+            "upload_id": upload_id,
+            "options": {"page": 1, "watermark_color": [255, 255, 255], "tolerance": 10}
+        })
+        assert response.status_code == 200
+
+        data = response.json()["data"]
+        assert data["page"] == 1
+        assert data["dpi"] == 72
+        assert data["image"].startswith("data:image/png;base64,")
+        assert data["mask_overlay"].startswith("data:image/png;base64,")
+        assert data["mask_pixels"] > 0
+
+    def test_preview_invalid_page(self, sample_pdf_file):
+        """Test previewing a page outside the document."""
+        upload_id = self._upload(sample_pdf_file)
+
+        response = client.post("/api/v1/tools/remove_watermark_image/preview", json={
+            "upload_id": upload_id,
+            "options": {"page": 5}
+        })
+        assert response.status_code == 400
+
+    def test_preview_unknown_upload(self):
+        """Test previewing a non-existent upload."""
+        response = client.post("/api/v1/tools/remove_watermark_image/preview", json={
+            "upload_id": "ul_nonexistent",
+            "options": {}
+        })
+        assert response.status_code == 404
+
+
+class TestWatermarkTemplatesAPI:
+    """Tests for the remove_watermark template endpoints."""
+
+    def test_list_and_delete_template(self, tmp_path, monkeypatch):
+        """Test a saved template is listed, deleted once, then gone."""
+        from app.core.config import settings
+        from app.services.template_service import template_service
+        monkeypatch.setattr(settings, "TEMPLATE_DIR", str(tmp_path))
+        template_service.save_template("acme", {"texts": [], "images": []})
+
+        response = client.get("/api/v1/tools/remove_watermark/templates")
+        assert [t["name"] for t in response.json()["data"]] == ["acme"]
+
+        response = client.delete("/api/v1/tools/remove_watermark/templates/acme")
+        assert response.status_code == 200
+        assert client.get("/api/v1/tools/remove_watermark/templates").json()["data"] == []
+
+        response = client.delete("/api/v1/tools/remove_watermark/templates/acme")
+        assert response.status_code == 404
+
+    def test_delete_invalid_template_name(self):
+        """Test template names are validated."""
+        response = client.delete("/api/v1/tools/remove_watermark/templates/bad.name")
+        assert response.status_code == 400
+
+
 class TestFilesAPI:
     """Tests for files API endpoints."""
 
@@ -140,6 +234,40 @@ class TestFilesAPI:
 
         assert response.status_code == 415
 
+    def test_search_upload(self, tmp_path):
+        """Test searching an upload's pages returns page numbers and snippets."""
+        import fitz
+
+        pdf_path = tmp_path / "report.pdf"
+        doc = fitz.open()
+        for text in ("Introduction", "Quarterly budget summary", "Appendix on budget risks"):
+            doc.new_page().insert_text((72, 72), text, fontsize=12)
+        doc.save(pdf_path)
+        doc.close()
+
+        with open(pdf_path, "rb") as f:
+            response = client.post(
+                "/api/v1/files/upload",
+                files={"files": ("report.pdf", f, "application/pdf")},
+                data={"tool_id": "split"}
+            )
+        upload_id = response.json()["data"]["upload_id"]
+
+        response = client.get(f"/api/v1/files/{upload_id}/search", params={"q": "BUDGET"})
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["total"] == 2
+        assert sorted(r["page"] for r in data["results"]) == [2, 3]
+        assert "<b>budget</b>" in data["results"][0]["snippet"]
+
+        response = client.get(f"/api/v1/files/{upload_id}/search", params={"q": "on"})
+        assert [r["page"] for r in response.json()["data"]["results"]] == [1, 3]
+
+    def test_search_unknown_upload(self):
+        """Test searching a non-existent upload."""
+        response = client.get("/api/v1/files/ul_nonexistent/search", params={"q": "budget"})
+        assert response.status_code == 404
+
     def test_download_nonexistent_file(self):
         """Test downloading non-existent file."""
         response = client.get("/api/v1/files/download/nonexistent")
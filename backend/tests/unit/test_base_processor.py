@@ -0,0 +1,85 @@
+"""Unit tests for shared BaseProcessor save helpers."""
+import fitz
+import pytest
+from app.core.config import settings
+from app.processors.extract import ExtractPagesProcessor
+
+
+def _make_pdf(path, pages: int = 3):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1}", fontsize=12)
+    doc.save(path)
+    doc.close()
+
+
+def test_save_profiles(monkeypatch):
+    """Test profile lookup, default profile and encryption-safe options."""
+    processor = ExtractPagesProcessor(None)
+
+    assert processor.get_save_options({"save_profile": "fast"}) == {}
+    assert processor.get_save_options({"save_profile": "smallest"})["use_objstms"] == 1
+
+    monkeypatch.setattr(settings, "DEFAULT_SAVE_PROFILE", "smallest")
+    assert processor.get_save_options({})["garbage"] == 4
+
+    encrypted = processor.get_save_options({}, encryption=fitz.PDF_ENCRYPT_AES_256)
+    assert "use_objstms" not in encrypted
+
+    with pytest.raises(ValueError):
+        processor.get_save_options({"save_profile": "tiny"})
+
+
+def test_document_session_opens_each_file_once(tmp_path):
+    """Test the session returns one shared handle per file and closes it."""
+    path = tmp_path / "in.pdf"
+    _make_pdf(path)
+    processor = ExtractPagesProcessor(None)
+
+    doc = processor.open_document(path)
+    assert processor.open_document(path) is doc
+    assert processor.get_page_count(path) == 3
+
+    processor.close_session()
+    assert doc.is_closed
+
+
+def test_document_session_authenticates_encrypted_input(tmp_path):
+    """Test encrypted inputs need the right password."""
+    path = tmp_path / "enc.pdf"
+    doc = fitz.open()
+    doc.new_page()
+    doc.save(path, encryption=fitz.PDF_ENCRYPT_AES_256, owner_pw="secret", user_pw="secret")
+    doc.close()
+    processor = ExtractPagesProcessor(None)
+
+    with pytest.raises(ValueError, match="encrypted"):
+        processor.open_document(path)
+    with pytest.raises(ValueError, match="Incorrect password"):
+        processor.open_document(path, password="wrong")
+    assert len(processor.open_document(path, password="secret")) == 1
+    processor.close_session()
+
+
+@pytest.mark.asyncio
+async def test_split_parses_source_once(tmp_path, monkeypatch):
+    """Test a many-part split reuses the session handle instead of reopening."""
+    from app.processors.split import SplitProcessor
+    from app.services.job_service import job_service
+
+    path = tmp_path / "in.pdf"
+    _make_pdf(path, pages=12)
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+
+    opened = []
+    original_open = fitz.open
+    monkeypatch.setattr(
+        fitz, "open", lambda *args, **kw: opened.append(args) or original_open(*args, **kw)
+    )
+
+    processor = SplitProcessor(job_service)
+    job = job_service.create_job("split", "ul_test", {})
+    await processor.process(job["job_id"], [path], {"mode": "single"})
+    processor.close_session()
+
+    assert [args for args in opened if args] == [(path,)]
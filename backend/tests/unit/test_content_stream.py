@@ -0,0 +1,52 @@
+"""Unit tests for content stream filtering."""
+from app.processors.content_stream import (
+    filter_content, is_watermark_artifact, iter_tokens
+)
+
+
+def test_iter_tokens_handles_strings_dicts_and_inline_images():
+    """Test composite operands and inline image data are single tokens."""
+    data = (
+        b"BT (a (nested) \\) string) Tj ET "
+        b"/P <</MCID 3 /Alt (x>>y)>> BDC EMC "
+        b"BI /W 1 /H 1 ID \x00EMC\xff EI Q"
+    )
+    tokens = [token for _, _, token in iter_tokens(data)]
+
+    assert tokens == [
+        b"BT", b"(a (nested) \\) string)", b"Tj", b"ET",
+        b"/P", b"<</MCID 3 /Alt (x>>y)>>", b"BDC", b"EMC",
+        b"BI", b"/W", b"1", b"/H", b"1", b"EI", b"Q",
+    ]
+
+
+def test_filter_content_removes_watermark_artifact():
+    """Test only the watermark artifact sequence is removed."""
+    data = (
+        b"q BT (Body) Tj ET Q\n"
+        b"/Artifact <</Subtype /Watermark /Type /Pagination>> BDC "
+        b"q /Span <</ActualText (x)>> BDC BT (WM) Tj ET EMC Q EMC\n"
+        b"/Artifact <</Type /Layout>> BDC (keep) Tj EMC"
+    )
+    filtered, count = filter_content(data, is_watermark_artifact)
+
+    assert count == 1
+    assert b"WM" not in filtered
+    assert b"(Body)" in filtered
+    assert b"(keep)" in filtered
+
+
+def test_filter_content_removes_xobject_invocations():
+    """Test Do operators for dropped XObject names are removed."""
+    data = b"q 1 0 0 1 0 0 cm /Fm0 Do Q /Fm1 Do"
+    filtered, count = filter_content(data, drop_xobjects={b"Fm0"})
+
+    assert count == 1
+    assert b"/Fm0" not in filtered
+    assert b"/Fm1 Do" in filtered
+
+
+def test_filter_content_keeps_unbalanced_stream():
+    """Test streams with unbalanced marked content are left untouched."""
+    data = b"/Artifact <</Subtype /Watermark>> BDC (WM) Tj"
+    assert filter_content(data, is_watermark_artifact) == (data, 0)
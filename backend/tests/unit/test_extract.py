@@ -0,0 +1,87 @@
+"""Unit tests for text and image extraction processors."""
+import json
+import zipfile
+import fitz
+import pytest
+from app.processors.extract import ExtractImagesProcessor, ExtractTextProcessor
+from app.services.job_service import job_service
+
+
+def _make_text_pdf(path, pages: int = 40):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f'Page {i + 1} "quoted"', fontsize=12)
+    doc.save(path)
+    doc.close()
+
+
+@pytest.mark.asyncio
+async def test_extract_text_streams_ndjson_in_page_order(tmp_path, max_workers, run_job):
+    """Test worker-extracted words come back as one NDJSON line per page, in order."""
+    path = tmp_path / "in.pdf"
+    _make_text_pdf(path)
+
+    processor, job_id = await run_job(
+        ExtractTextProcessor, "extract_text", path, {"format": "ndjson", "detail": "words"}
+    )
+
+    output = processor.get_output_path(job_id, "extracted_text.ndjson")
+    lines = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [line["page"] for line in lines] == list(range(1, 41))
+    assert [w["text"] for w in lines[39]["words"]] == ["Page", "40", '"quoted"']
+    assert len(lines[0]["words"][0]["bbox"]) == 4
+
+
+@pytest.mark.asyncio
+async def test_extract_text_json_shape(tmp_path, max_workers, run_job):
+    """Test format=json is one valid document of page texts, extracted or cached."""
+    path = tmp_path / "in.pdf"
+    _make_text_pdf(path)
+
+    # The second run reads the text cache filled by the first
+    for _ in range(2):
+        processor, job_id = await run_job(
+            ExtractTextProcessor, "extract_text", path, {"format": "json"}
+        )
+
+        output = processor.get_output_path(job_id, "extracted_text.json")
+        data = json.loads(output.read_text(encoding="utf-8"))
+        assert set(data) == {"pages", "text"}
+        assert data["pages"] == 40 and len(data["text"]) == 40
+        assert data["text"][39].strip() == 'Page 40 "quoted"'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("output_format", ["original", "png"])
+async def test_extract_images_dedupes_by_xref(tmp_path, max_workers, run_job, output_format):
+    """Test a logo repeated on every page is extracted once and mapped in the manifest."""
+    path = tmp_path / "in.pdf"
+    logo = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 32, 32), True)
+    logo.set_rect(logo.irect, (200, 30, 30, 255))
+    doc = fitz.open()
+    for i in range(12):
+        page = doc.new_page()
+        xref = page.insert_image(fitz.Rect(20, 20, 60, 60), pixmap=logo, xref=xref if i else 0)
+        photo = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 16, 16), False)
+        photo.set_rect(photo.irect, (i * 20, 100, 50))
+        page.insert_image(fitz.Rect(100, 100, 200, 200), pixmap=photo)
+    doc.save(path)
+    doc.close()
+
+    processor, job_id = await run_job(
+        ExtractImagesProcessor, "extract_images", path, {"format": output_format}
+    )
+
+    result = job_service.get_job(job_id)["result"]
+    assert result["image_count"] == 13
+    assert result["placements"] == 24
+
+    with zipfile.ZipFile(processor.get_output_path(job_id, "extracted_images.zip")) as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+        assert len(zf.namelist()) == 14
+        pages = manifest["page_images"]
+        assert pages[0]["images"][0] == pages[11]["images"][0]
+        assert len({p["images"][1] for p in pages}) == 12
+        if output_format == "png":
+            pix = fitz.Pixmap(zf.read(pages[0]["images"][0]))
+            assert (pix.width, pix.alpha) == (32, 1)
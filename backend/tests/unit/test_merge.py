@@ -0,0 +1,78 @@
+"""Unit tests for the merge processor."""
+import fitz
+import pytest
+from app.core.config import settings
+from app.processors.merge import MergeProcessor
+from app.services.job_service import job_service
+
+
+def _make_pdf(path, label: str, pages: int = 2):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"{label} page {i + 1}", fontsize=12)
+    doc.save(path)
+    doc.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("budget_mb", [256, 0])
+async def test_merge_keeps_page_order(tmp_path, monkeypatch, budget_mb):
+    """Test in-memory and batched merges produce the same page order."""
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+    monkeypatch.setattr(settings, "MERGE_MEMORY_BUDGET_MB", budget_mb)
+    monkeypatch.setattr(settings, "MAX_WORKERS", 2)
+    (tmp_path / "results").mkdir()
+
+    files = []
+    for label in ("a", "b", "c", "d", "e"):
+        path = tmp_path / f"{label}.pdf"
+        _make_pdf(path, label)
+        files.append(path)
+
+    processor = MergeProcessor(job_service)
+    if budget_mb == 0:
+        assert len(processor._plan_batches(files)) == len(files)
+
+    job = job_service.create_job("merge", "ul_test", {})
+    await processor.process(job["job_id"], files, {"save_profile": "balanced"})
+    processor.close_session()
+
+    result = job_service.get_job(job["job_id"])["result"]
+    assert result["pages"] == 10
+    output_path = processor.get_output_path(job["job_id"], "a_merged.pdf")
+    with fitz.open(output_path) as merged:
+        texts = [page.get_text().strip() for page in merged]
+    assert texts == [f"{label} page {i}" for label in "abcde" for i in (1, 2)]
+    # Intermediate files are cleaned up
+    assert [p.name for p in (tmp_path / "results").iterdir()] == [output_path.name]
+
+
+@pytest.mark.asyncio
+async def test_merge_deduplicates_shared_resources(tmp_path, monkeypatch):
+    """Test images (with soft masks) repeated across inputs are stored once."""
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 64, 64), True)
+    pix.set_rect(pix.irect, (30, 90, 160, 200))
+
+    files = []
+    for label in ("a", "b", "c"):
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_image(fitz.Rect(72, 72, 272, 272), pixmap=pix)
+        page.insert_text((72, 320), f"{label} logo", fontsize=12)
+        path = tmp_path / f"{label}.pdf"
+        doc.save(path)
+        doc.close()
+        files.append(path)
+
+    processor = MergeProcessor(job_service)
+    job = job_service.create_job("merge", "ul_test", {})
+    await processor.process(job["job_id"], files, {"save_profile": "fast"})
+    processor.close_session()
+
+    with fitz.open(processor.get_output_path(job["job_id"], "a_merged.pdf")) as merged:
+        images = {img[0] for page in merged for img in page.get_images(full=True)}
+        fonts = {font[0] for page in merged for font in page.get_fonts()}
+        assert len(images) == 1
+        assert len(fonts) == 1
+        assert [page.get_text().strip() for page in merged] == ["a logo", "b logo", "c logo"]
@@ -0,0 +1,52 @@
+"""Unit tests for page selection."""
+import fitz
+import pytest
+from app.processors.page_selection import PageSelection, parse_page_spec
+
+
+def test_parse_page_spec():
+    """Test spec syntax, spec order and open-ended ranges."""
+    assert parse_page_spec("5-7, 1, 9-", 10) == [(4, 6), (0, 0), (8, 9)]
+    assert parse_page_spec("3--1, 8--", 10) == [(2, 9), (7, 9)]
+    assert parse_page_spec("8-20, 30", 10, strict=False) == [(7, 9)]
+
+    with pytest.raises(ValueError):
+        parse_page_spec("8-20", 10)
+    with pytest.raises(ValueError):
+        parse_page_spec("5-3", 10)
+    with pytest.raises(ValueError):
+        parse_page_spec("a-b", 10)
+
+
+def test_selection_coalesces_runs():
+    """Test runs are sorted and merged, and the selection acts like a sorted list."""
+    selection = PageSelection.parse("7-9, 1-3, 4, 2", 12)
+
+    assert selection.runs == [(0, 3), (6, 8)]
+    assert list(selection) == [0, 1, 2, 3, 6, 7, 8]
+    assert len(selection) == 7
+    assert selection[4] == 6 and selection[-1] == 8
+    assert 3 in selection and 5 not in selection and 20 not in selection
+    assert not selection.is_all
+    assert PageSelection.all(12).is_all
+
+
+def test_from_options():
+    """Test processor modes, including the first page in single mode."""
+    assert list(PageSelection.from_options({}, 3)) == [0, 1, 2]
+    assert list(PageSelection.from_options({"mode": "single", "page": 1}, 3)) == [0]
+    assert list(PageSelection.from_options({"mode": "single", "page": 4}, 3)) == []
+    assert list(PageSelection.from_options({"mode": "every", "every_n": 2}, 5)) == [1, 3]
+    assert list(PageSelection.from_options({"mode": "range", "ranges": "2-"}, 3)) == [1, 2]
+
+
+def test_insert_into_copies_runs_in_order():
+    """Test selected pages are copied run by run."""
+    source = fitz.open()
+    for i in range(6):
+        source.new_page().insert_text((72, 72), f"Page {i + 1}", fontsize=12)
+
+    target = fitz.open()
+    PageSelection.parse("5-6, 1-2", 6).insert_into(target, source)
+
+    assert [page.get_text().strip() for page in target] == ["Page 1", "Page 2", "Page 5", "Page 6"]
@@ -0,0 +1,52 @@
+"""Unit tests for ordered block-parallel helpers."""
+import os
+import zipfile
+import fitz
+import pytest
+from app.core.config import settings
+from app.processors.parallel import contiguous_blocks, map_blocks_ordered
+from app.processors.split import SplitProcessor
+from app.services.job_service import job_service
+
+
+def _block_sum(block, offset):
+    return sum(block) + offset, os.getpid()
+
+
+def test_contiguous_blocks():
+    """Test blocks are contiguous, ordered and near-equal."""
+    assert contiguous_blocks(list(range(7)), 3) == [[0, 1, 2], [3, 4], [5, 6]]
+    assert contiguous_blocks([1, 2], 5) == [[1], [2]]
+    assert contiguous_blocks([], 4) == []
+
+
+def test_map_blocks_ordered_in_processes():
+    """Test results come back in block order from worker processes."""
+    blocks = contiguous_blocks(list(range(100)), 4)
+
+    results = list(map_blocks_ordered(_block_sum, blocks, 4, 1000))
+
+    assert [total for total, _ in results] == [sum(b) + 1000 for b in blocks]
+    assert all(pid != os.getpid() for _, pid in results)
+
+
+@pytest.mark.asyncio
+async def test_parallel_split_keeps_part_order(tmp_path, monkeypatch, run_job):
+    """Test single-page split through worker processes yields ordered parts."""
+    path = tmp_path / "in.pdf"
+    doc = fitz.open()
+    for i in range(40):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1}", fontsize=12)
+    doc.save(path)
+    doc.close()
+    monkeypatch.setattr(settings, "MAX_WORKERS", 3)
+
+    processor, job_id = await run_job(SplitProcessor, "split", path, {"mode": "single"})
+
+    zip_path = processor.get_output_path(job_id, "single_pages.zip")
+    with zipfile.ZipFile(zip_path) as zf:
+        names = zf.namelist()
+        assert names == [f"page_{i + 1}.pdf" for i in range(40)]
+        with fitz.open(stream=zf.read("page_17.pdf"), filetype="pdf") as part:
+            assert part[0].get_text().strip() == "Page 17"
+    assert job_service.get_job(job_id)["result"]["file_count"] == 40
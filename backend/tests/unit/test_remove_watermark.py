@@ -0,0 +1,557 @@
+"""Unit tests for heuristic watermark removal processor."""
+import fitz
+import numpy as np
+import pytest
+from app.core.config import settings
+from app.processors.page_analysis import DocumentAnalysis
+from app.processors.remove_watermark import RemoveWatermarkProcessor
+from app.services.job_service import job_service
+from app.services.template_service import template_service
+
+
+def _make_watermarked_pdf(path, pages: int = 5):
+    """Create a PDF with body text and a large repeated watermark."""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 100), f"Body text on page {i + 1}", fontsize=11)
+        page.insert_text((72, 120), "Second line of regular content", fontsize=11)
+        page.insert_text((150, 420), "CONFIDENTIAL", fontsize=40)
+    doc.save(path)
+    doc.close()
+
+
+def test_document_analysis_extracts_page_once(tmp_path):
+    """Test page layouts are extracted once and cached."""
+    path = tmp_path / "in.pdf"
+    _make_watermarked_pdf(path, pages=2)
+
+    with fitz.open(path) as doc:
+        analysis = DocumentAnalysis(doc)
+        layout = analysis.page(0)
+
+        assert analysis.page(0) is layout
+        assert "CONFIDENTIAL" in layout.span_text
+        assert layout.span_bbox.shape == (len(layout.span_text), 4)
+        assert layout.image_bbox.shape == (0, 4)
+
+
+def test_document_analysis_image_placements(tmp_path):
+    """Test image placements match get_image_rects for every xref."""
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), False)
+    pix.clear_with(200)
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_image(fitz.Rect(200, 300, 400, 500), pixmap=pix)
+    xref = page.get_images()[0][0]
+    page.insert_image(fitz.Rect(50, 50, 100, 100), xref=xref)
+
+    layout = DocumentAnalysis(doc).page(0)
+    expected = sorted(tuple(r) for r in page.get_image_rects(xref))
+
+    assert layout.image_xref.tolist() == [xref, xref]
+    assert sorted(tuple(b) for b in layout.image_bbox.tolist()) == expected
+    assert layout.image_transform.shape == (2, 6)
+    doc.close()
+
+
+def test_detect_repeating_and_feature_watermarks(tmp_path):
+    """Test repeat and feature detectors flag the watermark but not body text."""
+    path = tmp_path / "in.pdf"
+    _make_watermarked_pdf(path)
+    processor = RemoveWatermarkProcessor(None)
+
+    with fitz.open(path) as doc:
+        analysis = DocumentAnalysis(doc)
+        signatures = processor._collect_content_signatures(analysis)
+        repeating_text, _ = processor._detect_repeating_watermarks(signatures, len(doc))
+        matched = [
+            processor._match_repeating_watermarks(analysis.page(i), repeating_text, [])[0]
+            for i in range(len(doc))
+        ]
+        feature_text, _ = processor._detect_feature_watermarks(analysis.page(0))
+
+    assert all(len(page_matches) == 1 for page_matches in matched)
+    assert len(feature_text) == 1
+
+
+@pytest.mark.asyncio
+async def test_remove_watermark_all_pages(tmp_path, monkeypatch):
+    """Test the watermark text is gone from the output and body text kept."""
+    path = tmp_path / "in.pdf"
+    _make_watermarked_pdf(path)
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+
+    processor = RemoveWatermarkProcessor(job_service)
+    await processor.process("job_test", [path], {"mode": "all"})
+
+    with fitz.open(tmp_path / "results" / "job_test_cleaned.pdf") as out:
+        for page in out:
+            text = page.get_text()
+            assert "CONFIDENTIAL" not in text
+            assert "Second line of regular content" in text
+
+
+def test_sample_pages_is_stratified():
+    """Test large documents are sampled evenly instead of fully scanned."""
+    processor = RemoveWatermarkProcessor(None)
+
+    assert processor._sample_pages(30) == list(range(30))
+
+    sample = processor._sample_pages(5000)
+    assert len(sample) < 100
+    assert sample == sorted(set(sample))
+    # 每个分层各取一页，相邻样本间隔基本一致
+    gaps = [b - a for a, b in zip(sample, sample[1:])]
+    assert max(gaps) - min(gaps) <= 1
+
+
+@pytest.mark.asyncio
+async def test_remove_selected_pages_uses_sample(tmp_path, monkeypatch):
+    """Test selected-page cleanup only analyses sampled and cleaned pages."""
+    path = tmp_path / "in.pdf"
+    _make_watermarked_pdf(path, pages=120)
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+
+    processor = RemoveWatermarkProcessor(job_service)
+    job = job_service.create_job("remove_watermark", "ul_test", {})
+    await processor.process(job["job_id"], [path], {"mode": "range", "ranges": "2-4"})
+
+    result = job_service.get_job(job["job_id"])["result"]
+    assert result["cleaned_pages"] == 3
+    assert result["sampled_pages"] < 120
+    assert result["save_mode"] == "rewrite"
+
+    output_path = tmp_path / "results" / f"{job['job_id']}_cleaned.pdf"
+    with fitz.open(output_path) as out:
+        assert "CONFIDENTIAL" not in out[2].get_text()
+        assert "CONFIDENTIAL" in out[10].get_text()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("options", [
+    {"mode": "single", "page": 1},
+    {"mode": "all"},
+])
+async def test_default_save_drops_watermarked_revision(tmp_path, monkeypatch, options):
+    """Test the default output has no earlier revision that still holds the watermark."""
+    path = tmp_path / "in.pdf"
+    _make_watermarked_pdf(path, pages=1 if options["mode"] == "all" else 5)
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+
+    processor = RemoveWatermarkProcessor(job_service)
+    job = job_service.create_job("remove_watermark", "ul_test", {})
+    await processor.process(job["job_id"], [path], options)
+
+    assert job_service.get_job(job["job_id"])["result"]["save_mode"] == "rewrite"
+    data = (tmp_path / "results" / f"{job['job_id']}_cleaned.pdf").read_bytes()
+    # 截断到第一个 %%EOF 得到的版本也不能含有水印
+    first_revision = data[:data.index(b"%%EOF") + len(b"%%EOF")]
+    with fitz.open(stream=first_revision, filetype="pdf") as out:
+        assert "CONFIDENTIAL" not in out[0].get_text()
+
+
+@pytest.mark.asyncio
+async def test_remove_selected_pages_incremental_opt_in(tmp_path, monkeypatch):
+    """Test save_mode=incremental appends to the input and keeps its revision."""
+    path = tmp_path / "in.pdf"
+    _make_watermarked_pdf(path, pages=5)
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+
+    processor = RemoveWatermarkProcessor(job_service)
+    job = job_service.create_job("remove_watermark", "ul_test", {})
+    await processor.process(
+        job["job_id"], [path], {"mode": "range", "ranges": "1", "save_mode": "incremental"}
+    )
+
+    assert job_service.get_job(job["job_id"])["result"]["save_mode"] == "incremental"
+    output_path = tmp_path / "results" / f"{job['job_id']}_cleaned.pdf"
+    # 增量保存：输出以原文件内容开头，只追加变化的对象
+    assert output_path.read_bytes().startswith(path.read_bytes())
+    with fitz.open(output_path) as out:
+        assert "CONFIDENTIAL" not in out[0].get_text()
+
+
+def _wrap_in_artifact(doc, page):
+    """Wrap the current page content in a watermark artifact sequence."""
+    xref = page.get_contents()[0]
+    doc.update_stream(
+        xref,
+        b"/Artifact <</Subtype /Watermark /Type /Pagination>> BDC\n"
+        + doc.xref_stream(xref) + b"\nEMC\n"
+    )
+
+
+def test_remove_structural_watermarks_without_redaction():
+    """Test artifact watermarks and watermark XObjects are removed in the content stream."""
+    stamp = fitz.open()
+    stamp.new_page().insert_text((150, 600), "STAMP", fontsize=40)
+
+    doc = fitz.open()
+    for _ in range(3):
+        page = doc.new_page()
+        page.insert_text((150, 420), "WATERMARK", fontsize=40)
+        _wrap_in_artifact(doc, page)
+        page.insert_text((72, 100), "Body text", fontsize=11)
+        page.show_pdf_page(page.rect, stamp, 0)
+    for xref, *_ in doc[0].get_xobjects():
+        if xref not in [x for x, *_ in doc[1].get_xobjects()]:
+            continue
+        doc.xref_set_key(xref, "PieceInfo", "<</ADBE_CompoundType<</Private/Watermark>>>>")
+
+    processor = RemoveWatermarkProcessor(None)
+    removed = processor._remove_structural_watermarks(doc, range(3), whole_document=True)
+
+    assert removed == 4
+    for page in doc:
+        assert page.get_text().strip() == "Body text"
+        assert not page.first_annot
+    doc.close()
+
+
+def test_selected_pages_leave_shared_streams_untouched():
+    """Test a selection never edits streams other pages use, and reaches nested forms."""
+    def artifact_stamp():
+        stamp = fitz.open()
+        page = stamp.new_page()
+        page.insert_text((150, 420), "WATERMARK", fontsize=40)
+        _wrap_in_artifact(stamp, page)
+        page.insert_text((150, 600), "Stamp body", fontsize=11)
+        return stamp
+
+    doc = fitz.open()
+    for _ in range(3):
+        doc.new_page()
+    doc[0].insert_text((150, 420), "WATERMARK", fontsize=40)
+    _wrap_in_artifact(doc, doc[0])
+    # 第 2 页与第 1 页共享同一个内容流
+    doc.xref_set_key(doc[1].xref, "Contents", f"{doc[0].get_contents()[0]} 0 R")
+    # 第 3 页的水印在两层嵌套的 Form XObject 中
+    nested = fitz.open()
+    nested.new_page().show_pdf_page(fitz.Rect(0, 0, 595, 842), artifact_stamp(), 0)
+    doc[2].show_pdf_page(doc[2].rect, nested, 0)
+
+    processor = RemoveWatermarkProcessor(None)
+    removed = processor._remove_structural_watermarks(doc, [1, 2], whole_document=False)
+
+    assert removed == 2
+    assert "WATERMARK" in doc[0].get_text()
+    assert "WATERMARK" not in doc[1].get_text()
+    assert doc[2].get_text().strip() == "Stamp body"
+    doc.close()
+
+
+def test_remove_layer_and_annotation_watermarks():
+    """Test watermark layers and /Watermark annotations are removed structurally."""
+    doc = fitz.open()
+    ocg = doc.add_ocg("Watermark")
+    for _ in range(2):
+        page = doc.new_page()
+        page.insert_text((150, 420), "WATERMARK", fontsize=40, oc=ocg)
+        page.insert_text((72, 100), "Body text", fontsize=11)
+        page.add_text_annot((72, 200), "note")
+    annot_xref = doc.get_new_xref()
+    doc.update_object(
+        annot_xref, "<</Type/Annot/Subtype/Watermark/Rect[0 0 100 100]>>"
+    )
+    doc.xref_set_key(doc[0].xref, "Annots", f"[{doc.page_annot_xrefs(0)[0][0]} 0 R {annot_xref} 0 R]")
+
+    processor = RemoveWatermarkProcessor(None)
+    removed = processor._remove_structural_watermarks(doc, range(2), whole_document=True)
+
+    # 2 个 /OC 序列 + 1 个水印注释 + 关闭 1 个图层
+    assert removed == 4
+    for page in doc:
+        assert page.get_text().strip() == "Body text"
+        annot_types = [t for _, t, _ in doc.page_annot_xrefs(page.number)]
+        assert fitz.PDF_ANNOT_WATERMARK not in annot_types
+        assert fitz.PDF_ANNOT_TEXT in annot_types
+    doc.close()
+
+
+@pytest.mark.asyncio
+async def test_unused_watermark_layer_does_not_skip_redaction(tmp_path, monkeypatch):
+    """Test a watermark-named layer with no content does not count as removed."""
+    path = tmp_path / "in.pdf"
+    _make_watermarked_pdf(path, pages=4)
+    with fitz.open(path) as doc:
+        doc.add_ocg("Watermark")
+        assert RemoveWatermarkProcessor(None)._remove_structural_watermarks(
+            doc, range(4), whole_document=True, count_only=True
+        ) == 0
+        doc.saveIncr()
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+
+    processor = RemoveWatermarkProcessor(job_service)
+    job = job_service.create_job("remove_watermark", "ul_test", {})
+    await processor.process(job["job_id"], [path], {"mode": "all"})
+
+    result = job_service.get_job(job["job_id"])["result"]
+    assert result["structural_watermarks"] == 0
+    assert result["removal_method"] == "redact"
+    with fitz.open(tmp_path / "results" / f"{job['job_id']}_cleaned.pdf") as out:
+        assert "CONFIDENTIAL" not in out[0].get_text()
+
+
+def test_redaction_candidates_merged_without_clipping_body():
+    """Test overlapping candidates merge into one redaction and body text survives."""
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 100), "Body text", fontsize=11)
+    page.insert_text((150, 420), "DRAFT", fontsize=40)
+    page.insert_text((150, 440), "COPY", fontsize=40)
+    # 覆盖正文的大字号文本：删除它会截断正文，应当保留
+    page.insert_text((60, 104), "OVERLAP", fontsize=30)
+
+    processor = RemoveWatermarkProcessor(None)
+    layout = DocumentAnalysis(doc).page(0)
+    empty = np.array([], dtype=np.uint64)
+
+    added = []
+    original = page.add_redact_annot
+    page.add_redact_annot = lambda *a, **kw: added.append(a[0]) or original(*a, **kw)
+    removed = processor._remove_watermarks_from_page(page, 0, layout, empty, empty)
+
+    text = page.get_text()
+    assert removed == 2
+    assert len(added) == 1
+    assert "Body text" in text and "OVERLAP" in text
+    assert "DRAFT" not in text and "COPY" not in text
+    doc.close()
+
+
+@pytest.mark.asyncio
+async def test_save_and_apply_watermark_template(tmp_path, monkeypatch):
+    """Test a template saved from one document removes the watermark from another."""
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+    monkeypatch.setattr(settings, "TEMPLATE_DIR", str(tmp_path / "templates"))
+
+    def make_pdf(path, pages):
+        doc = fitz.open()
+        for i in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 100), f"Body text on page {i + 1}", fontsize=11)
+            page.insert_text((400, 750), "ACME Corp", fontsize=16)
+        doc.save(path)
+        doc.close()
+
+    make_pdf(tmp_path / "a.pdf", pages=4)
+    make_pdf(tmp_path / "b.pdf", pages=1)
+    processor = RemoveWatermarkProcessor(job_service)
+
+    job = job_service.create_job("remove_watermark", "ul_test", {})
+    await processor.process(
+        job["job_id"], [tmp_path / "a.pdf"], {"mode": "all", "save_template": "acme"}
+    )
+    assert job_service.get_job(job["job_id"])["result"]["saved_template"] == "acme"
+
+    template = template_service.get_template("acme")
+    assert [t["text"] for t in template["texts"]] == ["ACME Corp"]
+
+    # 单页文档无法做跨页检测，只有模板能识别水印
+    job = job_service.create_job("remove_watermark", "ul_test", {})
+    await processor.process(
+        job["job_id"], [tmp_path / "b.pdf"], {"mode": "all", "template": "acme"}
+    )
+    result = job_service.get_job(job["job_id"])["result"]
+    assert result["template"] == "acme" and result["sampled_pages"] == 0
+
+    with fitz.open(tmp_path / "results" / f"{job['job_id']}_cleaned.pdf") as out:
+        text = out[0].get_text()
+        assert "ACME Corp" not in text
+        assert "Body text on page 1" in text
+
+
+@pytest.mark.asyncio
+async def test_dry_run_reports_regions_without_output(tmp_path, monkeypatch):
+    """Test dry_run lists detected regions per page and writes no PDF."""
+    path = tmp_path / "in.pdf"
+    _make_watermarked_pdf(path, pages=3)
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+
+    job = job_service.create_job("remove_watermark", "ul_test", {})
+    processor = RemoveWatermarkProcessor(job_service)
+    await processor.process(job["job_id"], [path], {"mode": "all", "dry_run": True})
+
+    result = job_service.get_job(job["job_id"])["result"]
+    assert result["dry_run"] and result["watermarked_pages"] == 3
+    assert [r["page"] for r in result["regions"]] == [1, 2, 3]
+    x0, y0, x1, y1 = result["regions"][0]["regions"][0]["bbox"]
+    assert x0 == pytest.approx(150, abs=1) and y1 > 400
+    assert "download_url" not in result
+    assert not (tmp_path / "results").exists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("options", [
+    {"template": "acme", "save_template": "other"},
+    {"template": "acme", "removal_method": "content"},
+    {"save_template": "acme", "removal_method": "content"},
+])
+async def test_incompatible_template_options_rejected(tmp_path, monkeypatch, options):
+    """Test template options that could not take effect fail instead of being ignored."""
+    path = tmp_path / "in.pdf"
+    _make_watermarked_pdf(path, pages=2)
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+
+    processor = RemoveWatermarkProcessor(job_service)
+    job = job_service.create_job("remove_watermark", "ul_test", {})
+    with pytest.raises(ValueError):
+        await processor.process(job["job_id"], [path], {"mode": "all", **options})
+
+
+@pytest.mark.asyncio
+async def test_template_applied_after_structural_removal(tmp_path, monkeypatch):
+    """Test auto mode still applies a template when the structural pass found watermarks."""
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+    monkeypatch.setattr(settings, "TEMPLATE_DIR", str(tmp_path / "templates"))
+
+    path = tmp_path / "in.pdf"
+    doc = fitz.open()
+    for i in range(3):
+        page = doc.new_page()
+        page.insert_text((150, 420), "WATERMARK", fontsize=40)
+        _wrap_in_artifact(doc, page)
+        page.insert_text((72, 100), f"Body text on page {i + 1}", fontsize=11)
+        page.insert_text((400, 750), "ACME Corp", fontsize=16)
+    doc.save(path)
+    doc.close()
+
+    processor = RemoveWatermarkProcessor(job_service)
+    job = job_service.create_job("remove_watermark", "ul_test", {})
+    await processor.process(job["job_id"], [path], {"mode": "all", "save_template": "acme"})
+
+    result = job_service.get_job(job["job_id"])["result"]
+    assert result["structural_watermarks"] > 0
+    assert result["removal_method"] == "redact"
+    assert result["saved_template"] == "acme"
+    # 模板来自未修改的文档，也包含已结构化删除的水印
+    assert {t["text"] for t in template_service.get_template("acme")["texts"]} == {
+        "WATERMARK", "ACME Corp"
+    }
+    with fitz.open(tmp_path / "results" / f"{job['job_id']}_cleaned.pdf") as out:
+        text = out[0].get_text()
+        assert "WATERMARK" not in text and "ACME Corp" not in text
+        assert "Body text on page 1" in text
+
+
+@pytest.mark.asyncio
+async def test_layout_cache_reflects_unmodified_document(tmp_path, monkeypatch):
+    """Test structural removal before redaction does not cache the cleaned layout."""
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+    monkeypatch.setattr(settings, "TEMPLATE_DIR", str(tmp_path / "templates"))
+
+    path = tmp_path / "in.pdf"
+    doc = fitz.open()
+    for i in range(3):
+        page = doc.new_page()
+        page.insert_text((150, 420), "CONFIDENTIAL", fontsize=40)
+        _wrap_in_artifact(doc, page)
+        page.insert_text((72, 100), f"Body text on page {i + 1}", fontsize=11)
+    doc.save(path)
+    doc.close()
+
+    processor = RemoveWatermarkProcessor(job_service)
+    outputs = []
+    for options in ({"save_template": "acme"}, {"removal_method": "redact"}):
+        job = job_service.create_job("remove_watermark", "ul_test", {})
+        await processor.process(job["job_id"], [path], {"mode": "all", **options})
+        processor.close_session()
+        outputs.append(tmp_path / "results" / f"{job['job_id']}_cleaned.pdf")
+
+    # 第二次只用 redaction，依赖第一次写入的布局缓存
+    with fitz.open(outputs[1]) as out:
+        assert "CONFIDENTIAL" not in out[0].get_text()
+        assert "Body text on page 1" in out[0].get_text()
+
+
+@pytest.mark.asyncio
+async def test_dry_run_follows_removal_method(tmp_path, monkeypatch):
+    """Test dry_run makes the same structural-vs-redaction decision as a cleanup."""
+    path = tmp_path / "in.pdf"
+    doc = fitz.open()
+    for i in range(3):
+        page = doc.new_page()
+        page.insert_text((150, 420), "WATERMARK", fontsize=40)
+        _wrap_in_artifact(doc, page)
+        page.insert_text((72, 100), f"Body text on page {i + 1}", fontsize=11)
+    doc.save(path)
+    doc.close()
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+    processor = RemoveWatermarkProcessor(job_service)
+
+    reports = {}
+    for method in ("auto", "redact"):
+        job = job_service.create_job("remove_watermark", "ul_test", {})
+        await processor.process(
+            job["job_id"], [path], {"dry_run": True, "removal_method": method}
+        )
+        reports[method] = job_service.get_job(job["job_id"])["result"]
+
+    # auto：结构化删除已找到水印，实际清理不会 redaction，报告 Artifact 的位置
+    assert reports["auto"]["removal_method"] == "content"
+    assert reports["auto"]["structural_watermarks"] == 3
+    assert reports["auto"]["watermarked_pages"] == 3
+    for page in reports["auto"]["regions"]:
+        [region] = page["regions"]
+        assert region["kind"] == "artifact"
+        x0, y0, x1, y1 = region["bbox"]
+        assert x0 < 200 < x1 and y0 < 410 < y1
+    assert reports["redact"]["removal_method"] == "redact"
+    assert reports["redact"]["structural_watermarks"] == 0
+    assert reports["redact"]["watermarked_pages"] == 3
+    assert {r["kind"] for p in reports["redact"]["regions"] for r in p["regions"]} == {"redact"}
+
+
+@pytest.mark.asyncio
+async def test_dry_run_locates_structural_watermarks(tmp_path, monkeypatch):
+    """Test dry_run reports the kind and position of each structural watermark."""
+    stamp = fitz.open()
+    stamp.new_page().insert_text((150, 600), "STAMP", fontsize=40)
+
+    path = tmp_path / "in.pdf"
+    doc = fitz.open()
+    ocg = doc.add_ocg("Watermark")
+    page = doc.new_page()
+    page.insert_text((72, 100), "Body text", fontsize=11)
+    page.insert_text((150, 420), "LAYER", fontsize=40, oc=ocg)
+    page.show_pdf_page(fitz.Rect(0, 421, 298, 842), stamp, 0)
+    for xref, *_ in page.get_xobjects():
+        doc.xref_set_key(xref, "PieceInfo", "<</ADBE_CompoundType<</Private/Watermark>>>>")
+    annot_xref = doc.get_new_xref()
+    doc.update_object(annot_xref, "<</Type/Annot/Subtype/Watermark/Rect[10 10 110 60]>>")
+    doc.xref_set_key(page.xref, "Annots", f"[{annot_xref} 0 R]")
+    doc.save(path)
+    doc.close()
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+
+    processor = RemoveWatermarkProcessor(job_service)
+    job = job_service.create_job("remove_watermark", "ul_test", {})
+    await processor.process(job["job_id"], [path], {"dry_run": True})
+
+    result = job_service.get_job(job["job_id"])["result"]
+    assert result["removal_method"] == "content"
+    assert result["watermarked_pages"] == 1
+    regions = {r["kind"]: r["bbox"] for r in result["regions"][0]["regions"]}
+    assert set(regions) == {"annotation", "ocg", "xobject"}
+    # PDF 坐标 (10, 10)-(110, 60) 在页面坐标中位于底部
+    assert regions["annotation"] == [10, 782, 110, 832]
+    assert regions["xobject"] == pytest.approx([0, 421, 298, 842], abs=0.5)
+    x0, y0, x1, y1 = regions["ocg"]
+    assert x0 < 200 < x1 and y0 < 410 < y1
+
+
+@pytest.mark.asyncio
+async def test_dry_run_rejects_save_template(tmp_path, monkeypatch):
+    """Test dry_run has no side effects: save_template is rejected, nothing is written."""
+    path = tmp_path / "in.pdf"
+    _make_watermarked_pdf(path, pages=3)
+    monkeypatch.setattr(settings, "TEMPLATE_DIR", str(tmp_path / "templates"))
+
+    processor = RemoveWatermarkProcessor(job_service)
+    job = job_service.create_job("remove_watermark", "ul_test", {})
+    with pytest.raises(ValueError, match="dry_run"):
+        await processor.process(
+            job["job_id"], [path], {"dry_run": True, "save_template": "acme"}
+        )
+    assert not (tmp_path / "templates").exists()
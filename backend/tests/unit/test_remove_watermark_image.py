@@ -0,0 +1,114 @@
+"""Unit tests for image-based watermark removal processor."""
+import fitz
+import pytest
+from app.core.config import settings
+from app.processors.remove_watermark_image import RemoveWatermarkImageProcessor
+from app.services.job_service import job_service
+
+
+def _make_watermarked_pdf(pages: int = 4) -> fitz.Document:
+    """Create a document with body text and a tinted diagonal watermark."""
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        for y in range(80, 700, 20):
+            page.insert_text((72, y), "Body text line with some words", fontsize=10)
+        page.insert_text(
+            (150, 500), "CONFIDENTIAL", fontsize=60, color=(0.8, 0.6, 0.6),
+            morph=(fitz.Point(300, 400), fitz.Matrix(30))
+        )
+    return doc
+
+
+def test_estimate_watermark_color():
+    """Test the estimator finds the recurring watermark colour."""
+    processor = RemoveWatermarkImageProcessor(None)
+    doc = _make_watermarked_pdf()
+
+    color, tolerance = processor._estimate_watermark_color(doc, list(range(len(doc))))
+    doc.close()
+
+    expected = [204, 153, 153]
+    assert all(abs(c - e) <= 10 for c, e in zip(color, expected))
+    assert 15 <= tolerance <= 60
+
+
+def test_resolve_watermark_color_keeps_explicit_tolerance():
+    """Test an explicit tolerance is not overridden by the estimate."""
+    processor = RemoveWatermarkImageProcessor(None)
+    doc = _make_watermarked_pdf(pages=2)
+
+    _, tolerance = processor._resolve_watermark_color(doc, [0, 1], 42)
+    doc.close()
+
+    assert tolerance == 42
+
+
+def test_preview_builds_mask_once(tmp_path, monkeypatch):
+    """Test preview reuses its removal mask for the cleaned image."""
+    doc = _make_watermarked_pdf(pages=1)
+    doc.save(tmp_path / "in.pdf")
+    doc.close()
+
+    processor = RemoveWatermarkImageProcessor(None)
+    calls = []
+    build = processor._build_removal_mask
+    monkeypatch.setattr(
+        processor, "_build_removal_mask", lambda *args: calls.append(1) or build(*args)
+    )
+    data = processor.preview(
+        tmp_path / "in.pdf", {"watermark_color": [204, 153, 153], "tolerance": 30}
+    )
+    processor.close_session()
+
+    assert len(calls) == 1
+    assert data["mask_pixels"] > 0
+
+
+@pytest.mark.asyncio
+async def test_dry_run_reports_regions_without_output(tmp_path, monkeypatch):
+    """Test dry_run returns watermark regions in PDF coordinates and writes no file."""
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+    doc = _make_watermarked_pdf(pages=2)
+    doc.save(tmp_path / "in.pdf")
+    doc.close()
+
+    job = job_service.create_job("remove_watermark_image", "ul_test", {})
+    processor = RemoveWatermarkImageProcessor(job_service)
+    await processor.process(
+        job["job_id"], [tmp_path / "in.pdf"],
+        {"dry_run": True, "watermark_color": [204, 153, 153], "tolerance": 30}
+    )
+
+    result = job_service.get_job(job["job_id"])["result"]
+    assert result["dry_run"] and result["watermarked_pages"] == 2
+    regions = result["regions"][0]["regions"]
+    assert len(regions) == 1
+    x0, y0, x1, y1 = regions[0]["bbox"]
+    # 斜排水印的各个字符合并为一个区域，覆盖水印中部
+    assert x0 < 400 < x1 and y0 < 430 < y1
+    assert not (tmp_path / "results" / f"{job['job_id']}_cleaned.pdf").exists()
+
+
+@pytest.mark.asyncio
+async def test_selected_pages_replaced_in_place(tmp_path, monkeypatch):
+    """Test selected pages are replaced in the original document, others untouched."""
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path / "results"))
+    doc = _make_watermarked_pdf(pages=4)
+    doc.save(tmp_path / "in.pdf")
+    doc.close()
+
+    job = job_service.create_job("remove_watermark_image", "ul_test", {})
+    processor = RemoveWatermarkImageProcessor(job_service)
+    await processor.process(
+        job["job_id"], [tmp_path / "in.pdf"],
+        {"mode": "range", "ranges": "2", "dpi": 50,
+         "watermark_color": [204, 153, 153], "tolerance": 30}
+    )
+
+    assert job_service.get_job(job["job_id"])["result"]["save_mode"] == "rewrite"
+    with fitz.open(tmp_path / "results" / f"{job['job_id']}_cleaned.pdf") as out:
+        assert len(out) == 4
+        assert out[1].get_text() == "" and out[1].get_images()
+        assert "Body text line" in out[0].get_text()
+        assert out[1].rect == out[0].rect
@@ -0,0 +1,45 @@
+"""Unit tests for incremental vs. rewrite saving."""
+import fitz
+import pytest
+from app.processors.extract import ExtractPagesProcessor
+from app.processors.remove_watermark import RemoveWatermarkProcessor
+from app.processors.remove_watermark_image import RemoveWatermarkImageProcessor
+
+
+def _make_pdf(path, pages: int = 3):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1}", fontsize=12)
+    doc.save(path)
+    doc.close()
+
+
+def test_resolve_save_mode():
+    """Test only an explicit save_mode="incremental" saves incrementally."""
+    for processor in (RemoveWatermarkProcessor(None), RemoveWatermarkImageProcessor(None)):
+        assert processor.resolve_save_mode({}) == "rewrite"
+        assert processor.resolve_save_mode({"save_mode": "auto"}) == "rewrite"
+        assert processor.resolve_save_mode({"save_mode": "incremental"}) == "incremental"
+        with pytest.raises(ValueError, match="save_mode"):
+            processor.resolve_save_mode({"save_mode": "append"})
+
+
+def test_save_document_incremental_and_rewrite(tmp_path):
+    """Test incremental saves append to the copied input and rewrites replace it."""
+    source = tmp_path / "in.pdf"
+    output = tmp_path / "out.pdf"
+    _make_pdf(source)
+    processor = ExtractPagesProcessor(None)
+
+    doc = processor.open_output_document(source, output)
+    doc[0].insert_text((72, 200), "Changed", fontsize=12)
+    assert processor.save_document(doc, output, "incremental") == "incremental"
+    doc.close()
+    assert output.read_bytes().startswith(source.read_bytes())
+
+    doc = processor.open_output_document(source, output)
+    doc[0].insert_text((72, 200), "Changed", fontsize=12)
+    assert processor.save_document(doc, output, "rewrite", garbage=1) == "rewrite"
+    doc.close()
+    with fitz.open(output) as out:
+        assert "Changed" in out[0].get_text()
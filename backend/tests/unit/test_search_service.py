@@ -0,0 +1,92 @@
+"""Unit tests for the per-upload search index."""
+import fitz
+import pytest
+from app.services.search_service import search_service
+
+
+def _make_upload(tmp_path, pages_per_file):
+    files = []
+    for index, pages in enumerate(pages_per_file):
+        path = tmp_path / f"ul_test_{index:04d}_f_file{index}.pdf"
+        doc = fitz.open()
+        for text in pages:
+            doc.new_page().insert_text((72, 72), text, fontsize=12)
+        doc.save(path)
+        doc.close()
+        files.append(path)
+    return files
+
+
+def test_build_and_search(tmp_path):
+    """Test all terms must match and results carry file, page and snippet."""
+    files = _make_upload(tmp_path, [
+        ["Alpha contract terms", "Payment schedule"],
+        ["Contract renewal and payment terms"],
+    ])
+    assert search_service.build_index("ul_test", files) == 3
+    assert search_service.get_status("ul_test") == "ready"
+
+    result = search_service.search("ul_test", "payment contract")
+    assert result["total"] == 1
+    assert result["results"][0]["file_index"] == 1
+    assert result["results"][0]["file_id"] == "f_file1"
+    assert result["results"][0]["page"] == 1
+
+    result = search_service.search("ul_test", "terms")
+    assert {(r["file_index"], r["page"]) for r in result["results"]} == {(0, 1), (1, 1)}
+
+
+def test_short_terms_and_query_syntax(tmp_path):
+    """Test terms below trigram length and FTS5 operators in user input."""
+    files = _make_upload(tmp_path, [["Plan A", "Plan B", 'He said "NEAR" OR not']])
+    search_service.build_index("ul_test", files)
+
+    result = search_service.search("ul_test", "b")
+    assert [r["page"] for r in result["results"]] == [2]
+    assert result["results"][0]["snippet"] == "Plan <b>B</b>\n"
+
+    assert [r["page"] for r in search_service.search("ul_test", '"near" OR')["results"]] == [3]
+    assert search_service.search("ul_missing", "plan") is None
+    with pytest.raises(ValueError):
+        search_service.search("../etc", "plan")
+
+
+def test_snippets_are_html_escaped(tmp_path):
+    """Test page text is escaped and only the match markers are markup."""
+    files = _make_upload(tmp_path, [["<script>alert(1)</script> payload", "x<y"]])
+    search_service.build_index("ul_test", files)
+
+    snippet = search_service.search("ul_test", "payload")["results"][0]["snippet"]
+    assert "script>" not in snippet
+    assert "&lt;/script&gt;" in snippet and "<b>payload</b>" in snippet
+
+    # Short-term fallback escapes too
+    snippet = search_service.search("ul_test", "<y")["results"][0]["snippet"]
+    assert snippet.startswith("x<b>&lt;y</b>")
+
+
+def test_short_terms_fold_non_ascii_case(tmp_path):
+    """Test the short-term fallback folds non-ASCII case like the query."""
+    files = _make_upload(tmp_path, [["ÉTÉ report", "other"]])
+    search_service.build_index("ul_test", files)
+
+    result = search_service.search("ul_test", "é")
+    assert [r["page"] for r in result["results"]] == [1]
+    assert result["results"][0]["snippet"].startswith("<b>É</b>")
+
+
+def test_prune_expired_indexes(tmp_path):
+    """Test indexes older than the upload lifetime are deleted."""
+    import os
+    from app.core.config import settings
+
+    files = _make_upload(tmp_path, [["Alpha"]])
+    search_service.build_index("ul_old", files)
+    search_service.build_index("ul_new", files)
+    old_path = search_service._index_path("ul_old")
+    expired = os.path.getmtime(old_path) - settings.FILE_EXPIRE_HOURS * 3600 - 60
+    os.utime(old_path, (expired, expired))
+
+    assert search_service.prune_expired() == 1
+    assert search_service.get_status("ul_old") == "missing"
+    assert search_service.get_status("ul_new") == "ready"
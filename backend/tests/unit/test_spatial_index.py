@@ -0,0 +1,28 @@
+"""Tests for the uniform-grid spatial index."""
+import numpy as np
+from app.processors.spatial_index import GridIndex, union_bbox
+
+
+def test_grid_index_query_and_clusters():
+    """Test overlapping rects are clustered and queries only return hits."""
+    bboxes = np.array([
+        (10, 10, 50, 50),
+        (40, 40, 100, 100),
+        (90, 90, 200, 120),
+        (300, 300, 320, 320),
+    ], dtype=np.float32)
+    index = GridIndex(bboxes, cell_size=32)
+
+    assert index.query((0, 0, 20, 20)) == [0]
+    assert index.query((250, 0, 290, 50)) == []
+    assert sorted(map(sorted, index.clusters())) == [[0, 1, 2], [3]]
+    assert union_bbox(bboxes[[0, 1, 2]]) == (10, 10, 200, 120)
+
+
+def test_grid_index_clips_with_tolerance():
+    """Test clipping only counts overlaps above the area tolerance."""
+    index = GridIndex(np.array([(0, 0, 100, 10)], dtype=np.float32))
+
+    assert not index.clips((95, 0, 200, 10), tolerance=0.1)
+    assert index.clips((50, 0, 200, 10), tolerance=0.1)
+    assert not index.clips((0, 10, 100, 20))
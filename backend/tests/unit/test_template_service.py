@@ -0,0 +1,29 @@
+"""Unit tests for watermark template storage."""
+import pytest
+from app.core.config import settings
+from app.services.template_service import template_service
+
+
+def test_save_get_and_list_templates(tmp_path, monkeypatch):
+    """Test templates round-trip through JSON storage."""
+    monkeypatch.setattr(settings, "TEMPLATE_DIR", str(tmp_path / "templates"))
+
+    assert template_service.list_templates() == []
+    template_service.save_template("acme", {"texts": [{"text": "ACME"}], "images": []})
+
+    template = template_service.get_template("acme")
+    assert template["name"] == "acme"
+    assert template["texts"] == [{"text": "ACME"}]
+    assert template_service.list_templates()[0]["texts"] == 1
+    assert template_service.get_template("missing") is None
+
+    assert template_service.delete_template("acme")
+    assert template_service.list_templates() == []
+
+
+def test_template_name_is_validated(tmp_path, monkeypatch):
+    """Test path-like names are rejected."""
+    monkeypatch.setattr(settings, "TEMPLATE_DIR", str(tmp_path / "templates"))
+
+    with pytest.raises(ValueError):
+        template_service.save_template("../etc", {})
@@ -0,0 +1,87 @@
+"""Unit tests for the persistent text-layer cache."""
+import asyncio
+import fitz
+import numpy as np
+from app.core.config import settings
+from app.processors import extract
+from app.processors.extract import ExtractTextProcessor
+from app.processors.page_analysis import DocumentAnalysis
+from app.services.job_service import job_service
+from app.services.text_cache_service import (
+    pack_strings,
+    text_cache_service,
+    unpack_strings,
+)
+
+
+def _make_pdf(path, pages: int = 3):
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i + 1} body", fontsize=12)
+        page.insert_text((200, 400), "CONFIDENTIAL", fontsize=40)
+    doc.save(path)
+    doc.close()
+
+
+def test_pack_strings_roundtrip():
+    """Test packed strings (including empty and non-ASCII) unpack unchanged."""
+    texts = ["", "水印", "plain", ""]
+    assert unpack_strings(*pack_strings(texts)) == texts
+    assert unpack_strings(*pack_strings([])) == []
+
+
+def test_save_load_and_prune(monkeypatch):
+    """Test entries round-trip and the least recently used entry is pruned."""
+    monkeypatch.setattr(settings, "TEXT_CACHE_MAX_MB", 0)
+
+    text_cache_service.save("a" * 64, "text", {"values": np.arange(5)})
+    assert text_cache_service.load("a" * 64, "text") is None  # pruned at once
+
+    monkeypatch.setattr(settings, "TEXT_CACHE_MAX_MB", 1)
+    text_cache_service.save("b" * 64, "text", {"values": np.arange(5)})
+    assert text_cache_service.load("b" * 64, "text")["values"].tolist() == [0, 1, 2, 3, 4]
+    assert text_cache_service.load("c" * 64, "text") is None
+
+
+def test_document_analysis_loads_cached_layouts(tmp_path, monkeypatch):
+    """Test a full extraction is stored and reused without parsing pages."""
+    path = tmp_path / "in.pdf"
+    _make_pdf(path)
+    key = text_cache_service.document_key(path)
+
+    with fitz.open(path) as doc:
+        analysis = DocumentAnalysis(doc, key)
+        assert not analysis.cached
+        analysis.extract_all()
+        expected = [analysis.page(i) for i in range(len(doc))]
+
+    monkeypatch.setattr(DocumentAnalysis, "_extract", lambda self, page: 1 / 0)
+    with fitz.open(path) as doc:
+        analysis = DocumentAnalysis(doc, key)
+        assert analysis.cached
+        for i, layout in enumerate(expected):
+            cached = analysis.page(i)
+            assert cached.span_text == layout.span_text
+            assert np.array_equal(cached.span_bbox, layout.span_bbox)
+            assert np.array_equal(cached.span_hash, layout.span_hash)
+            assert (cached.width, cached.height) == (layout.width, layout.height)
+
+
+def test_extract_text_reuses_cached_text(tmp_path, monkeypatch):
+    """Test a second extraction of the same content is served from the cache."""
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path))
+    path = tmp_path / "in.pdf"
+    _make_pdf(path)
+
+    def run() -> str:
+        processor = ExtractTextProcessor(job_service)
+        job = job_service.create_job("extract_text", "ul_test", {})
+        asyncio.run(processor.process(job["job_id"], [path], {"format": "txt"}))
+        processor.close_session()
+        return processor.get_output_path(job["job_id"], "extracted_text.txt").read_text(encoding="utf-8")
+
+    first = run()
+    monkeypatch.setattr(extract, "_page_text_record", lambda page, detail: 1 / 0)
+    assert run() == first
+    assert "Page 3 body" in first
@@ -0,0 +1,125 @@
+"""Unit tests for the add-watermark processor."""
+import base64
+import fitz
+import pytest
+from app.core.config import settings
+from app.processors.watermark import AddWatermarkProcessor
+from app.services.job_service import job_service
+
+
+def _make_pdf(path, pages: int = 20):
+    doc = fitz.open()
+    for i in range(pages):
+        # Mixed page sizes need one tile grid each
+        width, height = (595, 842) if i % 2 == 0 else (842, 595)
+        doc.new_page(width=width, height=height).insert_text((72, 72), f"Page {i + 1}")
+    doc.save(path)
+    doc.close()
+
+
+def _watermark_png() -> str:
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 120, 40), False)
+    pix.set_rect(pix.irect, (255, 0, 0))
+    return "data:image/png;base64," + base64.b64encode(pix.tobytes("png")).decode()
+
+
+async def _run(tmp_path, monkeypatch, options):
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path))
+    path = tmp_path / "in.pdf"
+    _make_pdf(path)
+
+    processor = AddWatermarkProcessor(job_service)
+    job = job_service.create_job("add_watermark", "ul_test", {})
+    await processor.process(job["job_id"], [path], options)
+    processor.close_session()
+    return processor.get_output_path(job["job_id"], "watermarked.pdf")
+
+
+@pytest.mark.asyncio
+async def test_image_tiles_embedded_once(tmp_path, monkeypatch):
+    """Test the tile grid is shared: one image object, one stamp per page."""
+    output = await _run(tmp_path, monkeypatch, {
+        "type": "text", "watermark_image": _watermark_png(), "watermark_spacing": 50,
+    })
+
+    with fitz.open(output) as doc:
+        images = {img[0] for page in doc for img in page.get_images(full=True)}
+        assert len(images) == 1
+        grids = {xobj[0] for page in doc for xobj in page.get_xobjects() if xobj[2] != 0}
+        assert len(grids) == 2  # one per page size
+
+        assert doc[0].get_text().strip() == "Page 1"
+        assert doc[0].get_pixmap().pixel(5, 5) == (255, 0, 0)
+        assert doc[1].get_pixmap().pixel(5, 5) == (255, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_vector_text_watermark(tmp_path, monkeypatch):
+    """Test text without watermark_image is drawn as vector text, no images."""
+    output = await _run(tmp_path, monkeypatch, {
+        "type": "text", "text": "CONFIDENTIAL", "font_size": 40,
+        "color": "#FF0000", "opacity": 100, "rotation": 0,
+    })
+
+    with fitz.open(output) as doc:
+        assert not any(page.get_images() for page in doc)
+        fonts = {font[0] for page in doc for font in page.get_fonts(full=True)}
+        assert len(fonts) == 2  # the page text's font and one shared watermark font
+        for page in doc:
+            assert "CONFIDENTIAL" in page.get_text()
+        spans = [
+            span for block in doc[0].get_text("dict")["blocks"]
+            for line in block.get("lines", []) for span in line["spans"]
+            if span["text"] == "CONFIDENTIAL"
+        ]
+        assert spans[0]["color"] == 0xFF0000
+        assert round(spans[0]["size"]) == 40
+
+
+@pytest.mark.asyncio
+async def test_vector_text_watermark_rotation(tmp_path, monkeypatch):
+    """Test positive rotation turns the text clockwise, like the frontend preview."""
+    output = await _run(tmp_path, monkeypatch, {"type": "text", "text": "DRAFT", "rotation": 45})
+
+    with fitz.open(output) as doc:
+        directions = [
+            line["dir"] for block in doc[0].get_text("dict")["blocks"]
+            for line in block.get("lines", []) if "DRAFT" in "".join(s["text"] for s in line["spans"])
+        ]
+        assert directions
+        dx, dy = directions[0]
+        assert dx == pytest.approx(0.7071, abs=1e-3)
+        assert dy == pytest.approx(0.7071, abs=1e-3)
+
+
+@pytest.mark.asyncio
+async def test_vector_text_watermark_invalid_options(tmp_path, monkeypatch):
+    """Test missing text and invalid styles are rejected."""
+    with pytest.raises(ValueError, match="required"):
+        await _run(tmp_path, monkeypatch, {"type": "text"})
+    with pytest.raises(ValueError, match="Invalid color"):
+        await _run(tmp_path, monkeypatch, {"type": "text", "text": "X", "color": "red"})
+    with pytest.raises(ValueError, match="Invalid font"):
+        await _run(tmp_path, monkeypatch, {"type": "text", "text": "X", "font": "comic"})
+
+
+@pytest.mark.asyncio
+async def test_watermark_keeps_document_structure(tmp_path, monkeypatch):
+    """Test pages are stamped in place, keeping metadata and bookmarks."""
+    monkeypatch.setattr(settings, "RESULT_DIR", str(tmp_path))
+    path = tmp_path / "in.pdf"
+    _make_pdf(path)
+    with fitz.open(path) as doc:
+        doc.set_metadata({"title": "Quarterly report"})
+        doc.set_toc([[1, "Intro", 1], [1, "Appendix", 3]])
+        doc.saveIncr()
+
+    processor = AddWatermarkProcessor(job_service)
+    job = job_service.create_job("add_watermark", "ul_test", {})
+    await processor.process(job["job_id"], [path], {"type": "text", "text": "DRAFT"})
+    processor.close_session()
+
+    with fitz.open(processor.get_output_path(job["job_id"], "watermarked.pdf")) as doc:
+        assert doc.metadata["title"] == "Quarterly report"
+        assert [entry[1] for entry in doc.get_toc()] == ["Intro", "Appendix"]
+        assert "DRAFT" in doc[2].get_text()